@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Benchmark /api/models/ list pages before and after the values() fast path.
+
+Run from the dl_tools directory:
+
+    python benchmarks/bench_api.py [--rows 2000] [--page-size 500] [--repeat 5]
+
+A throwaway test database is filled with synthetic rows. Each variant is
+timed both on its own (query, serialization and rendering) and end to end
+through the test client with the response cache disabled.
+"""
+
+import os
+import sys
+import timeit
+import logging
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'dl_tools.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.test import Client  # noqa: E402
+from django.test.utils import (  # noqa: E402
+    override_settings, setup_test_environment, teardown_test_environment,
+)
+from django.db import connection  # noqa: E402
+from rest_framework.renderers import JSONRenderer  # noqa: E402
+
+from main import renderers  # noqa: E402
+from main.models import ModelInfo  # noqa: E402
+from main.serializers import MODEL_INFO_FIELDS, ModelInfoSerializer, ModelInfoValuesSerializer  # noqa: E402
+
+SPARSE_FIELDS = ('name', 'organization', 'severity')
+
+
+def create_rows(count):
+    paragraph = 'Collects conversation logs and usage metadata for model training. ' * 8
+    ModelInfo.objects.bulk_create(
+        ModelInfo(
+            name=f'model-{i:06d}',
+            organization=f'Organization {i % 50}',
+            use_cases=[f'Use case {j}' for j in range(6)],
+            practices=[f'Practice {j}' for j in range(6)],
+            data_info=[paragraph],
+            concerning_practices=[paragraph],
+            concerning_practices_urls=[f'https://example.com/{i}/{j}' for j in range(3)],
+            severity=('low', 'medium', 'high')[i % 3],
+            content_hash=f'{i:064x}',
+        )
+        for i in range(count)
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the ModelInfo list endpoint')
+    parser.add_argument('--rows', type=int, default=2000)
+    parser.add_argument('--page-size', type=int, default=500)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--number', type=int, default=10, help='Pages rendered per repeat')
+    args = parser.parse_args()
+    # The metrics middleware logs every request; keep it out of the timings
+    logging.getLogger('main.requests').setLevel(logging.WARNING)
+
+    setup_test_environment()
+    old_name = connection.creation.create_test_db(verbosity=0)
+    try:
+        create_rows(args.rows)
+        size = args.page_size
+
+        def run_model_serializer():
+            rows = ModelInfo.objects.order_by('name')[:size]
+            JSONRenderer().render(ModelInfoSerializer(rows, many=True).data)
+
+        def run_values(fields):
+            def run():
+                rows = ModelInfo.objects.order_by('name').values(*fields)[:size]
+                renderers.FastJSONRenderer().render(ModelInfoValuesSerializer(rows, fields, many=True).data)
+            return run
+
+        client = Client(HTTP_HOST='localhost')
+
+        def run_endpoint(query):
+            def run():
+                response = client.get(f'/api/models/?page_size={size}{query}')
+                assert response.status_code == 200, response.status_code
+            return run
+
+        def best(func):
+            return min(timeit.repeat(func, repeat=args.repeat, number=args.number)) / args.number * 1e3
+
+        print(f"{args.rows} rows, {size} per page, orjson {'enabled' if renderers.orjson else 'not installed'} "
+              f"(best of {args.repeat}, ms/page)")
+
+        baseline = best(run_model_serializer)
+        print(f"ModelSerializer + JSONRenderer:  {baseline:8.2f}")
+        for label, fields in (('values() all fields:', MODEL_INFO_FIELDS), ('values() sparse fields:', SPARSE_FIELDS)):
+            elapsed = best(run_values(fields))
+            print(f"{label:32s} {elapsed:8.2f}  ({baseline / elapsed:.2f}x)")
+
+        with override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}}):
+            full = best(run_endpoint(''))
+            sparse = best(run_endpoint('&fields=' + ','.join(SPARSE_FIELDS)))
+        print(f"GET /api/models/:                {full:8.2f}")
+        print(f"GET /api/models/?fields=...:     {sparse:8.2f}  ({full / sparse:.2f}x)")
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        teardown_test_environment()
+
+
+if __name__ == '__main__':
+    main()
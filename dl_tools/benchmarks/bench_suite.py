@@ -0,0 +1,322 @@
+#!/usr/bin/env python3
+"""
+Benchmark linting, ingest and the catalog API on synthetic corpora.
+
+Run from the dl_tools directory:
+
+    python benchmarks/bench_suite.py [--sizes 100,10000] [--output results.json]
+    python benchmarks/bench_suite.py --database-url postgres://localhost/dl_tools
+
+For each corpus size a corpus is generated with benchmarks/corpus.py and
+timed through:
+
+* lint:   MdDataLint.validate_directory, without and with the validation cache
+* ingest: process_markdown end to end (full sync into an empty table, an
+          incremental no-op, and an incremental sync after 1% of files change)
+* api:    /api/models/ with and without the response cache, and /api/profile/
+          for a user with 50 preferences, through the test client
+
+A throwaway test database is created on the server given by --database-url
+(or DATABASE_URL; an on-disk SQLite file by default). Results are written as
+JSON. Each result is the median of --repeat samples; the fastest sample is
+kept alongside it. When a baseline file exists the results are compared with
+it, and the script exits with status 1 if any median is slower than the
+baseline's by more than --tolerance. Use --save-baseline to store the results
+as the new baseline. Baselines are only comparable on the same machine and
+Python version; against a baseline recorded elsewhere the comparison is only
+printed.
+"""
+
+import os
+import sys
+import io
+import json
+import time
+import shutil
+import statistics
+import argparse
+import platform
+import datetime
+import tempfile
+import subprocess
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_DIR = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, PROJECT_DIR)
+
+DEFAULT_BASELINE = os.path.join(BENCH_DIR, 'baseline.json')
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Benchmark linting, ingest and the catalog API')
+    parser.add_argument('--sizes', default='100,10000',
+                        help='Comma-separated corpus sizes (default: 100,10000; 100000 is also supported)')
+    parser.add_argument('--database-url', help='Database server to benchmark against (default: DATABASE_URL or SQLite)')
+    parser.add_argument('--repeat', type=int, default=3, help='Samples per timing; the median is compared')
+    parser.add_argument('--requests', type=int, default=200, help='Requests per API benchmark')
+    parser.add_argument('--seed', type=int, default=0, help='Corpus random seed')
+    parser.add_argument('--output', help='Write the results to this JSON file')
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help='Baseline to compare against')
+    parser.add_argument('--save-baseline', action='store_true', help='Store the results as the baseline')
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help='Allowed slowdown against the baseline before failing (default: 0.25 = 25%%)')
+    return parser.parse_args()
+
+
+args = parse_args()
+if args.database_url:
+    os.environ['DATABASE_URL'] = args.database_url
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'dl_tools.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+import logging  # noqa: E402
+
+from django.conf import settings  # noqa: E402
+from django.contrib.auth.models import User  # noqa: E402
+from django.core.management import call_command  # noqa: E402
+from django.db import connection  # noqa: E402
+from django.test import Client  # noqa: E402
+from django.test.utils import (  # noqa: E402
+    override_settings, setup_test_environment, teardown_test_environment,
+)
+
+from corpus import generate_corpus  # noqa: E402
+from md_data_linter import MdDataLint, console  # noqa: E402
+from main.models import ModelInfo, UserPreference  # noqa: E402
+
+SCHEMA_PATH = os.path.join(PROJECT_DIR, 'example-schema.json')
+
+# Shortest time a sample may take; faster benchmarks are looped to reach it
+MIN_SAMPLE_SECONDS = 0.2
+
+
+def sample(func, repeat, setup=None):
+    """
+    Return ``repeat`` samples of the time per call of ``func``.
+
+    Without ``setup`` each sample calls ``func`` enough times to last at least
+    MIN_SAMPLE_SECONDS, so short benchmarks aren't dominated by timer noise.
+    Otherwise ``setup`` runs untimed before each single timed call.
+    """
+    number = 1
+    times = []
+    if setup is None:
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        if elapsed < MIN_SAMPLE_SECONDS:
+            number = int(MIN_SAMPLE_SECONDS / max(elapsed, 1e-6)) + 1
+        else:
+            times.append(elapsed)  # Long enough to count as the first sample
+    while len(times) < repeat:
+        if setup:
+            setup()
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        times.append((time.perf_counter() - start) / number)
+    return times
+
+
+class Results:
+    """
+    Benchmark results keyed by name, each with a value, unit and direction.
+
+    The value is the median of the samples, which is what baselines are
+    compared on; the best sample is recorded too.
+    """
+
+    def __init__(self):
+        self.values = {}
+
+    def add(self, name, times, unit='s', scale=None):
+        """Record timing samples, or throughput (``scale / time``) when ``scale`` is given."""
+        if scale is None:
+            value, best, better = statistics.median(times), min(times), 'lower'
+        else:
+            value, best, better = scale / statistics.median(times), scale / min(times), 'higher'
+        self.values[name] = {'value': round(value, 6), 'best': round(best, 6), 'unit': unit, 'better': better}
+        print(f"  {name:42s} {value:12.4f} {unit}  (best {best:.4f})")
+
+
+def bench_lint(results, size, corpus_dir, workdir, repeat):
+    cache_path = os.path.join(workdir, 'lint-cache.json')
+
+    def cold():
+        MdDataLint(SCHEMA_PATH).validate_directory(corpus_dir)
+
+    def warm():
+        MdDataLint(SCHEMA_PATH, cache_path=cache_path).validate_directory(corpus_dir)
+
+    results.add(f'lint.cold[{size}]', sample(cold, repeat))
+    warm()  # Fill the cache
+    results.add(f'lint.cached[{size}]', sample(warm, repeat))
+
+
+def bench_ingest(results, size, corpus_dir, workdir, repeat):
+    files = sorted(os.listdir(corpus_dir))
+    changed_per_run = max(len(files) // 100, 1)
+    edits = {'count': 0}
+
+    def process(**options):
+        call_command('process_markdown', stdout=io.StringIO(), **options)
+
+    def clear():
+        ModelInfo.objects.all().delete()
+
+    def touch_files():
+        # Change the frontmatter of 1% of the files, different ones on each run
+        # (body edits don't change a file's content hash)
+        start = edits['count'] * changed_per_run
+        edits['count'] += 1
+        for name in files[start:start + changed_per_run]:
+            path = os.path.join(corpus_dir, name)
+            with open(path, encoding='utf-8') as f:
+                text = f.read()
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(text.replace('use_cases:\n', f"use_cases:\n  - Edited in run {edits['count']}.\n", 1))
+
+    # process_markdown reads markdown_files/ and example-schema.json from BASE_DIR
+    with override_settings(BASE_DIR=workdir, CATALOG_SNAPSHOT_ROOT=os.path.join(workdir, 'snapshots')):
+        results.add(f'ingest.full[{size}]', sample(lambda: process(no_cache=True), repeat, setup=clear))
+        process()  # Fill the validation cache
+        results.add(f'ingest.incremental_noop[{size}]', sample(lambda: process(incremental=True), repeat))
+        results.add(
+            f'ingest.incremental_1pct[{size}]',
+            sample(lambda: process(incremental=True), repeat, setup=touch_files),
+        )
+
+
+def bench_api(results, size, requests, repeat):
+    user, _ = User.objects.get_or_create(username='bench')
+    UserPreference.objects.filter(user=user).delete()
+    UserPreference.objects.bulk_create(
+        UserPreference(user=user, model=model, preference='like')
+        for model in ModelInfo.objects.order_by('name')[:50]
+    )
+    client = Client(HTTP_HOST='localhost')
+
+    def throughput(name, path):
+        def run():
+            for _ in range(requests):
+                response = client.get(path)
+                assert response.status_code == 200, (path, response.status_code)
+        run()  # Warm up, and fill the response cache when there is one
+        results.add(f'{name}.throughput[{size}]', sample(run, repeat), 'req/s', scale=requests)
+
+    with override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}}):
+        throughput('api.models', '/api/models/')
+    throughput('api.models_cached', '/api/models/')
+    client.force_login(user)
+    throughput('api.profile', '/api/profile/')
+
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=PROJECT_DIR, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(current, baseline, tolerance):
+    """Print each benchmark against the baseline; return the names that regressed."""
+    regressions = []
+    print(f"\nCompared with baseline (tolerance {tolerance:.0%}):")
+    for name, result in current.items():
+        base = baseline.get(name)
+        if base is None or not base['value'] or not result['value']:
+            continue
+        if result['better'] == 'higher':
+            slowdown = base['value'] / result['value'] - 1
+        else:
+            slowdown = result['value'] / base['value'] - 1
+        flag = ''
+        if slowdown > tolerance:
+            flag = '  REGRESSION'
+            regressions.append(name)
+        elif slowdown < -tolerance:
+            flag = '  improved'
+        print(f"  {name:42s} {base['value']:12.4f} -> {result['value']:12.4f} {result['unit']:6s}"
+              f" ({-slowdown:+.0%}){flag}")
+    return regressions
+
+
+def main():
+    sizes = [int(size) for size in args.sizes.split(',') if size]
+    logging.getLogger('main.requests').setLevel(logging.WARNING)
+    console.quiet = True
+
+    workroot = tempfile.mkdtemp(prefix='dl-bench-')
+    if connection.vendor == 'sqlite':
+        # Use an on-disk file rather than the default in-memory test database
+        settings.DATABASES['default'].setdefault('TEST', {})['NAME'] = os.path.join(workroot, 'bench.sqlite3')
+    setup_test_environment()
+    old_name = connection.creation.create_test_db(verbosity=0)
+    results = Results()
+    try:
+        for size in sizes:
+            print(f"{size} files ({connection.vendor}):")
+            workdir = os.path.join(workroot, str(size))
+            corpus_dir = os.path.join(workdir, 'markdown_files')
+            generate_corpus(corpus_dir, size, seed=args.seed)
+            shutil.copy(SCHEMA_PATH, workdir)
+
+            bench_lint(results, size, corpus_dir, workdir, args.repeat)
+            bench_ingest(results, size, corpus_dir, workdir, args.repeat)
+            bench_api(results, size, args.requests, args.repeat)
+            shutil.rmtree(workdir, ignore_errors=True)
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        teardown_test_environment()
+        shutil.rmtree(workroot, ignore_errors=True)
+
+    report = {
+        'meta': {
+            'date': datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='seconds'),
+            'revision': git_revision(),
+            'database': connection.vendor,
+            'python': platform.python_version(),
+            'django': django.get_version(),
+            'machine': f'{platform.system()} {platform.machine()}, {os.cpu_count()} CPUs',
+            'sizes': sizes,
+            'seed': args.seed,
+            'repeat': args.repeat,
+        },
+        'results': results.values,
+    }
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"\nResults written to {args.output}")
+
+    regressions = []
+    if os.path.exists(args.baseline) and not args.save_baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        meta = baseline['meta']
+        if meta.get('database') != report['meta']['database']:
+            print(f"\nBaseline was recorded on {meta.get('database')}; not comparing")
+        elif (meta.get('machine'), meta.get('python')) != (report['meta']['machine'], report['meta']['python']):
+            compare(results.values, baseline['results'], args.tolerance)
+            print(f"\nWarning: baseline was recorded on {meta.get('machine')} with Python {meta.get('python')}; "
+                  f"differences are not treated as regressions")
+        else:
+            regressions = compare(results.values, baseline['results'], args.tolerance)
+    if args.save_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump(report, f, indent=2)
+            f.write('\n')
+        print(f"\nBaseline saved to {args.baseline}")
+
+    if regressions:
+        print(f"\n{len(regressions)} benchmarks regressed: {', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Benchmark the compiled frontmatter validators against the Pydantic path they replaced.
+
+Run from the dl_tools directory:
+
+    python benchmarks/bench_validators.py [--schema example-schema.json] [--repeat 5]
+
+Pydantic is only needed here and isn't in requirements.txt; install it with
+``pip install pydantic`` (or ``uv sync --group bench``).
+
+The frontmatter of every file in markdown_files/ is parsed once up front, so
+only validation is timed.
+"""
+
+import os
+import sys
+import glob
+import timeit
+import argparse
+import datetime
+from typing import Any, Dict, List
+
+from pydantic import ValidationError, create_model, Field
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from md_data_linter import MdDataLint, ValidationResult, console  # noqa: E402
+
+PYDANTIC_TYPES = {
+    'string': str,
+    'number': float,
+    'integer': int,
+    'boolean': bool,
+    'array': List[str],
+    'object': Dict[str, Any],
+    'date': datetime.date,
+}
+
+
+def build_pydantic_models(linter):
+    """Build the per-schema Pydantic models the linter used before schemas were compiled."""
+    models = {}
+    for name, schema in linter.schemas.items():
+        field_definitions = {}
+        for field_name, field_def in schema.fields.items():
+            field_type = PYDANTIC_TYPES.get(field_def.get('type', 'string'), str)
+            default = ... if field_name in schema.required else None
+            field_definitions[field_name] = (field_type, Field(default=default))
+        models[name] = create_model(f"{name}Model", **field_definitions)
+    return models
+
+
+def validate_pydantic(schema, model, data, result):
+    """The previous validation path: two Python loops, then a Pydantic model."""
+    for field in schema.required:
+        if field not in data:
+            result.errors.append(f"Missing required field: '{field}'")
+
+    known_fields = set(schema.fields.keys())
+    for field in data.keys():
+        if field not in known_fields:
+            result.warnings.append(f"Unknown field: '{field}'")
+
+    try:
+        model(**data)
+    except ValidationError as e:
+        for error in e.errors():
+            field = ".".join(str(loc) for loc in error["loc"])
+            result.errors.append(f"Field '{field}': {error['msg']}")
+
+
+def main():
+    base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    parser = argparse.ArgumentParser(description='Benchmark frontmatter validators')
+    parser.add_argument('--schema', default=os.path.join(base_dir, 'example-schema.json'))
+    parser.add_argument('--directory', default=os.path.join(base_dir, 'markdown_files'))
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--number', type=int, default=2000, help='Validation passes over the corpus per repeat')
+    args = parser.parse_args()
+
+    console.quiet = True
+    linter = MdDataLint(args.schema)
+    documents = [linter.parse_file(path) for path in sorted(glob.glob(os.path.join(args.directory, '*.md')))]
+    documents = [document for document in documents if document.data]
+    schema_name = next(iter(linter.schemas))
+    schema = linter.schemas[schema_name]
+    compiled = linter.compiled_schemas[schema_name]
+    model = build_pydantic_models(linter)[schema_name]
+
+    def run_pydantic():
+        for document in documents:
+            validate_pydantic(schema, model, document.data, ValidationResult(document.file_path, schema_name))
+
+    def run_compiled():
+        for document in documents:
+            compiled.validate(document.data, ValidationResult(document.file_path, schema_name))
+
+    calls = args.number * len(documents)
+    pydantic_time = min(timeit.repeat(run_pydantic, repeat=args.repeat, number=args.number))
+    compiled_time = min(timeit.repeat(run_compiled, repeat=args.repeat, number=args.number))
+
+    print(f"{len(documents)} documents, {calls} validations per run (best of {args.repeat})")
+    print(f"pydantic models:   {pydantic_time / calls * 1e6:8.2f} us/file")
+    print(f"compiled schema:   {compiled_time / calls * 1e6:8.2f} us/file")
+    print(f"speedup:           {pydantic_time / compiled_time:8.2f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Generate a synthetic corpus of model Markdown files matching example-schema.json.
+
+Run from the dl_tools directory:
+
+    python benchmarks/corpus.py /tmp/corpus-10k --count 10000 [--seed 0]
+
+The same count and seed always produce byte-identical files, so benchmark
+runs on different machines or branches see the same input. Field sizes
+follow the hand-written files in markdown_files/.
+"""
+
+import os
+import random
+import argparse
+
+WORDS = (
+    'model data users training conversations content privacy settings account '
+    'service retention review opt out default enterprise API personal feedback '
+    'prompts outputs metadata location device storage policy third party partners '
+    'research improve safety moderation history delete export access logs images '
+    'voice assistant workspace browser search documents code productivity tutoring'
+).split()
+
+SEVERITIES = ('low', 'medium', 'high')
+
+
+def sentence(rng, low=8, high=20):
+    words = rng.choices(WORDS, k=rng.randint(low, high))
+    return ' '.join(words).capitalize() + '.'
+
+
+def render_document(index, rng, organizations, domains):
+    """Return the Markdown text of one synthetic model file."""
+    lines = ['---', f'organization: {organizations[rng.randrange(len(organizations))]}']
+    for field, low, high in (
+        ('use_cases', 1, 5), ('practices', 2, 8), ('data_info', 1, 3), ('concerning_practices', 0, 4),
+    ):
+        items = [sentence(rng) for _ in range(rng.randint(low, high))]
+        if items:
+            lines.append(f'{field}:')
+            lines.extend(f'  - {item}' for item in items)
+    urls = [
+        f'https://{domains[rng.randrange(len(domains))]}/policy/{index}/{i}'
+        for i in range(rng.randint(0, 3))
+    ]
+    if urls:
+        lines.append('concerning_practices_urls:')
+        lines.extend(f'  - {url}' for url in urls)
+    lines.append(f'severity: {rng.choice(SEVERITIES)}')
+    lines.append('---')
+    lines.append('')
+    lines.append(f'# Model {index}')
+    lines.extend(sentence(rng, 20, 60) for _ in range(rng.randint(1, 4)))
+    return '\n'.join(lines) + '\n'
+
+
+def generate_corpus(directory, count, seed=0):
+    """Write ``count`` model files into ``directory``. Returns their paths."""
+    rng = random.Random(seed)
+    organizations = [f'Organization {i}' for i in range(max(count // 50, 10))]
+    domains = [f'example-{i}.org' for i in range(50)]
+    os.makedirs(directory, exist_ok=True)
+    paths = []
+    for index in range(count):
+        path = os.path.join(directory, f'model-{index:06d}.md')
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(render_document(index, rng, organizations, domains))
+        paths.append(path)
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate synthetic model Markdown files')
+    parser.add_argument('directory', help='Directory to write the files into')
+    parser.add_argument('--count', type=int, default=100, help='Number of files to generate')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed')
+    args = parser.parse_args()
+
+    generate_corpus(args.directory, args.count, args.seed)
+    print(f"Wrote {args.count} files to {args.directory}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Load-test a running server to compare the sync (WSGI) and async (ASGI) setups.
+
+Start each configuration from the dl_tools directory, for example:
+
+    gunicorn --bind 127.0.0.1:8001 --workers 2 dl_tools.wsgi:application
+    CONN_MAX_AGE=0 gunicorn --bind 127.0.0.1:8002 --workers 2 \\
+        -k uvicorn_worker.UvicornWorker dl_tools.asgi:application
+
+then run the same load against both:
+
+    python benchmarks/load_test.py --url http://127.0.0.1:8001 --slow-clients 4
+    python benchmarks/load_test.py --url http://127.0.0.1:8002 --slow-clients 4
+
+Fast clients request the given paths back to back. Slow clients send their
+request headers a line at a time over ``--slow-seconds``, the way a client on
+a poor connection does; a sync worker is held for that whole time, while an
+async worker keeps serving other requests.
+"""
+
+import time
+import socket
+import argparse
+import threading
+import statistics
+import http.client
+from urllib.parse import urlsplit
+
+DEFAULT_PATHS = ['/api/catalog/', '/api/models/?page_size=50', '/api/models/?q=data']
+
+
+def fast_client(host, port, paths, deadline, latencies, errors, lock):
+    """Request the paths in turn until the deadline, on a fresh connection each time."""
+    i = 0
+    while time.monotonic() < deadline:
+        path = paths[i % len(paths)]
+        i += 1
+        start = time.monotonic()
+        try:
+            conn = http.client.HTTPConnection(host, port, timeout=30)
+            conn.request('GET', path, headers={'Accept-Encoding': 'gzip'})
+            response = conn.getresponse()
+            response.read()
+            conn.close()
+            ok = response.status < 400
+        except OSError:
+            ok = False
+        elapsed = time.monotonic() - start
+        with lock:
+            if ok:
+                latencies.append(elapsed)
+            else:
+                errors[0] += 1
+
+
+def slow_client(host, port, path, seconds, deadline, completed, lock):
+    """Send a request's header lines spread over ``seconds``, then read the response."""
+    lines = [
+        f'GET {path} HTTP/1.1\r\n', f'Host: {host}\r\n', 'User-Agent: load-test-slow\r\n',
+        'Accept: application/json\r\n', 'Connection: close\r\n', '\r\n',
+    ]
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection((host, port), timeout=seconds + 30) as sock:
+                for line in lines:
+                    sock.sendall(line.encode('ascii'))
+                    time.sleep(seconds / len(lines))
+                while sock.recv(65536):
+                    pass
+            with lock:
+                completed[0] += 1
+        except OSError:
+            time.sleep(0.1)
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * fraction), len(ordered) - 1)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Load-test the dl_tools API')
+    parser.add_argument('--url', default='http://127.0.0.1:8000', help='Base URL of the running server')
+    parser.add_argument('--path', action='append', dest='paths', help='Path to request (repeatable)')
+    parser.add_argument('--concurrency', type=int, default=8, help='Number of fast clients')
+    parser.add_argument('--duration', type=float, default=10.0, help='Seconds to run')
+    parser.add_argument('--slow-clients', type=int, default=0, help='Number of slow clients')
+    parser.add_argument('--slow-seconds', type=float, default=3.0, help='Seconds each slow request takes to send')
+    args = parser.parse_args()
+
+    parts = urlsplit(args.url)
+    host, port = parts.hostname, parts.port or 80
+    paths = args.paths or DEFAULT_PATHS
+
+    latencies, errors, slow_completed = [], [0], [0]
+    lock = threading.Lock()
+    deadline = time.monotonic() + args.duration
+    threads = [
+        threading.Thread(target=slow_client, args=(host, port, paths[0], args.slow_seconds, deadline, slow_completed, lock))
+        for _ in range(args.slow_clients)
+    ]
+    # Let the slow clients occupy their connections before the fast load starts
+    for thread in threads:
+        thread.start()
+    if args.slow_clients:
+        time.sleep(0.2)
+    fast = [
+        threading.Thread(target=fast_client, args=(host, port, paths, deadline, latencies, errors, lock))
+        for _ in range(args.concurrency)
+    ]
+    for thread in fast:
+        thread.start()
+    for thread in threads + fast:
+        thread.join()
+
+    print(f"{args.url}: {args.concurrency} fast clients, {args.slow_clients} slow clients, {args.duration:.0f}s")
+    if not latencies:
+        print(f"no successful requests ({errors[0]} errors)")
+        return
+    print(f"requests:   {len(latencies)} ok, {errors[0]} errors, {len(latencies) / args.duration:.1f} req/s")
+    print(f"latency ms: p50 {statistics.median(latencies) * 1e3:.1f}  "
+          f"p95 {percentile(latencies, 0.95) * 1e3:.1f}  p99 {percentile(latencies, 0.99) * 1e3:.1f}  "
+          f"max {max(latencies) * 1e3:.1f}")
+    if args.slow_clients:
+        print(f"slow requests completed: {slow_completed[0]}")
+
+
+if __name__ == '__main__':
+    main()
@@ -10,7 +10,13 @@ https://docs.djangoproject.com/en/5.0/howto/deployment/asgi/
 import os
 
 from django.core.asgi import get_asgi_application
+from django.urls import get_resolver
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'dl_tools.settings')
 
 application = get_asgi_application()
+
+# Import the URLconf, and with it the views and DRF, while the worker boots
+# rather than during its first request. With gunicorn --preload this happens
+# once in the master and every forked worker inherits it.
+get_resolver().url_patterns
@@ -49,6 +49,7 @@ INSTALLED_APPS = [
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',  # Add WhiteNoise for static files
+    'main.middleware.RequestMetricsMiddleware',  # Server-Timing, request logs and /metrics
     'django.contrib.sessions.middleware.SessionMiddleware',
     'corsheaders.middleware.CorsMiddleware',  # Move CORS up
     'django.middleware.common.CommonMiddleware',
@@ -70,6 +71,10 @@ REST_FRAMEWORK = {
         'rest_framework.authentication.SessionAuthentication',
         'rest_framework.authentication.BasicAuthentication',
     ),
+    'DEFAULT_RENDERER_CLASSES': (
+        'main.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
 }
 
 
@@ -115,16 +120,53 @@ WSGI_APPLICATION = 'dl_tools.wsgi.application'
 
 # Database
 # https://docs.djangoproject.com/en/5.0/ref/settings/#databases
+#
+# Set CONN_MAX_AGE=0 when serving through ASGI (dl_tools.asgi): requests run
+# on short-lived threads there, so persistent connections would pile up.
 
 DATABASES = {
     'default': dj_database_url.config(
         default=f'sqlite:///{BASE_DIR / "db.sqlite3"}',
-        conn_max_age=600,
+        conn_max_age=int(os.getenv('CONN_MAX_AGE', '600')),
         conn_health_checks=True,
     )
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/5.0/topics/cache/
+#
+# CACHE_URL selects the backend:
+#   locmem://[name]     per-process memory (default)
+#   file:///some/dir    files on local disk
+#   redis://host:6379/0 Redis or any Redis-compatible server (needs the redis package)
+
+CACHE_URL = os.getenv('CACHE_URL', 'locmem://')
+_cache_scheme, _, _cache_location = CACHE_URL.partition('://')
+
+if _cache_scheme == 'file':
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': _cache_location or str(BASE_DIR / '.django_cache'),
+        }
+    }
+elif _cache_scheme in ('redis', 'rediss'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': CACHE_URL,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': _cache_location or 'dl-tools',
+        }
+    }
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.0/ref/settings/#auth-password-validators
 
@@ -166,6 +208,43 @@ STATICFILES_DIRS = [BASE_DIR.parent / 'frontend' / 'dist']
 # WhiteNoise configuration for serving static files
 STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
 
+# Seconds a web worker may serve a cached catalog version before re-reading it
+# from the database; bounds how long after a sync ETags can be stale.
+CATALOG_VERSION_TIMEOUT = int(os.getenv('CATALOG_VERSION_TIMEOUT', '30'))
+
+# Seconds a rendered catalog response stays cached. Entries are keyed by catalog
+# version, so a sync makes them unreachable immediately; this only bounds memory.
+CATALOG_CACHE_TIMEOUT = int(os.getenv('CATALOG_CACHE_TIMEOUT', '86400'))
+
+# Directory holding the pre-compressed catalog snapshots written by process_markdown
+CATALOG_SNAPSHOT_ROOT = os.getenv('CATALOG_SNAPSHOT_ROOT', str(BASE_DIR / 'catalog_snapshots'))
+
+# Logging
+# https://docs.djangoproject.com/en/5.0/topics/logging/
+#
+# main.requests logs one JSON line per request (see main.metrics); set
+# REQUEST_LOG_LEVEL=WARNING to turn those off.
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'stdout': {
+            'class': 'logging.StreamHandler',
+            'stream': 'ext://sys.stdout',
+        },
+    },
+    'loggers': {
+        'main': {
+            'handlers': ['stdout'],
+            'level': os.getenv('LOG_LEVEL', 'INFO'),
+        },
+        'main.requests': {
+            'level': os.getenv('REQUEST_LOG_LEVEL', 'INFO'),
+        },
+    },
+}
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.0/ref/settings/#default-auto-field
 
@@ -1,11 +1,34 @@
 from django.contrib import admin
+from django.utils.html import format_html_join
 from .models import ModelInfo, UserPreference
+from .signals import models_deleted
 
 @admin.register(ModelInfo)
 class ModelInfoAdmin(admin.ModelAdmin):
-    list_display = ('name', 'organization', 'use_cases', 'practices', 'colored_severity', 'formatted_concerning_practices_urls')
+    list_display = ('name', 'organization', 'formatted_use_cases', 'formatted_practices', 'colored_severity', 'formatted_concerning_practices_urls')
     search_fields = ('name', 'organization')
     list_filter = ('severity',)  # Optional: This adds a filter for severity in the admin interface
+    readonly_fields = ('content_hash',)
+
+    @admin.display(description='Use cases')
+    def formatted_use_cases(self, obj):
+        return format_html_join('', '{}<br>', ((item,) for item in obj.use_cases))
+
+    @admin.display(description='Practices')
+    def formatted_practices(self, obj):
+        return format_html_join('', '{}<br>', ((item,) for item in obj.practices))
+
+    # Saves are reindexed by the post_save receiver in main.signals; deletes are not
+
+    def delete_model(self, request, obj):
+        pk = obj.pk
+        super().delete_model(request, obj)
+        models_deleted([pk])
+
+    def delete_queryset(self, request, queryset):
+        pks = list(queryset.values_list('pk', flat=True))
+        super().delete_queryset(request, queryset)
+        models_deleted(pks)
 
 @admin.register(UserPreference)
 class UserPreferenceAdmin(admin.ModelAdmin):
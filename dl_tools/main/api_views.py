@@ -1,35 +1,104 @@
+import logging
+
 from rest_framework import viewsets, generics, status
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.permissions import IsAuthenticated, SAFE_METHODS
 from rest_framework.response import Response
-from rest_framework.decorators import api_view
+from rest_framework.decorators import api_view, action
+from rest_framework.generics import get_object_or_404
 
 from django.contrib.auth.models import User
 
+from .catalog import cached_catalog_response, conditional_catalog_response
+from .filters import ModelInfoFilter
 from .models import ModelInfo, UserPreference
+from .pagination import ModelInfoCursorPagination
+from .search import search_models
+from .signals import models_deleted
 from .serializers import (
     ModelInfoSerializer,
+    ModelInfoValuesSerializer,
+    parse_sparse_fields,
     UserPreferenceSerializer,
     UserPreferenceCreateSerializer,
+    UserPreferenceBulkSerializer,
     UserSerializer
 )
 
+logger = logging.getLogger(__name__)
+
+
 class ModelInfoViewSet(viewsets.ModelViewSet):
     """
     ViewSet for viewing and editing ModelInfo instances.
+
+    The list is cursor-paginated and filtered on the server; see
+    ModelInfoFilter for the supported query parameters. Reads fetch rows
+    with values() and accept ``?fields=name,organization`` to return only
+    some fields.
     """
     queryset = ModelInfo.objects.all()
     serializer_class = ModelInfoSerializer
+    pagination_class = ModelInfoCursorPagination
+    filter_backends = [ModelInfoFilter]
+
+    def perform_authentication(self, request):
+        # Catalog reads are public. Authenticating lazily keeps conditional
+        # requests answered with 304 from loading the session from the database.
+        if request.method not in SAFE_METHODS:
+            super().perform_authentication(request)
+
+    def get_sparse_fields(self):
+        return parse_sparse_fields(self.request.query_params.get('fields', ''))
+
+    @conditional_catalog_response
+    @cached_catalog_response
+    def list(self, request, *args, **kwargs):
+        fields = self.get_sparse_fields()
+        queryset = self.filter_queryset(self.get_queryset())
+        # The pagination cursor is built from 'name', so it is fetched even when not requested
+        rows = queryset.values(*dict.fromkeys(fields + ('name',)))
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(ModelInfoValuesSerializer(page, fields, many=True).data)
+        return Response(ModelInfoValuesSerializer(rows, fields, many=True).data)
+
+    @conditional_catalog_response
+    @cached_catalog_response
+    def retrieve(self, request, *args, **kwargs):
+        fields = self.get_sparse_fields()
+        queryset = self.filter_queryset(self.get_queryset()).values(*fields)
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        row = get_object_or_404(queryset, **{self.lookup_field: self.kwargs[lookup_url_kwarg]})
+        return Response(ModelInfoValuesSerializer(row, fields).data)
+
+    @action(detail=False, methods=['get'])
+    @conditional_catalog_response
+    @cached_catalog_response
+    def search(self, request):
+        """
+        Ranked full-text search: /api/models/search/?q=<terms>&limit=<n>
+        """
+        query = request.query_params.get('q', '').strip()
+        try:
+            limit = min(max(int(request.query_params.get('limit', 50)), 1), 200)
+        except ValueError:
+            limit = 50
 
+        fields = self.get_sparse_fields()
+        results = []
+        for model, rank in search_models(query, limit=limit):
+            data = {field: getattr(model, field) for field in fields}
+            data['rank'] = rank
+            results.append(data)
+        return Response({'query': query, 'count': len(results), 'results': results})
 
-class UserProfileView(generics.RetrieveAPIView):
-    """
-    API view to retrieve user profile.
-    """
-    serializer_class = UserSerializer
-    permission_classes = [IsAuthenticated]
+    # Creates and updates are reindexed and bump the catalog version through
+    # the post_save receiver in main.signals; deletes do it explicitly.
 
-    def get_object(self):
-        return self.request.user
+    def perform_destroy(self, instance):
+        pk = instance.pk
+        instance.delete()
+        models_deleted([pk])
 
 
 class UserRegistrationView(generics.CreateAPIView):
@@ -40,18 +109,6 @@ class UserRegistrationView(generics.CreateAPIView):
     serializer_class = UserSerializer
 
 
-class UserPreferenceListView(generics.RetrieveAPIView):
-    """
-    API view to retrieve user preferences.
-    """
-    permission_classes = [IsAuthenticated]
-
-    def get(self, request, *args, **kwargs):
-        preferences = UserPreference.objects.filter(user=request.user)
-        serializer = UserPreferenceSerializer(preferences, many=True)
-        return Response(serializer.data)
-
-
 class UserPreferenceCreateView(generics.CreateAPIView):
     """
     API view to create user preferences.
@@ -61,7 +118,12 @@ class UserPreferenceCreateView(generics.CreateAPIView):
     permission_classes = [IsAuthenticated]
 
     def perform_create(self, serializer):
-        serializer.save(user=self.request.user)
+        # A user has at most one preference per model, so saving again replaces it
+        serializer.instance, _ = UserPreference.objects.update_or_create(
+            user=self.request.user,
+            model=serializer.validated_data['model'],
+            defaults={'preference': serializer.validated_data['preference']},
+        )
 
     def create(self, request, *args, **kwargs):
         """
@@ -79,7 +141,7 @@ class UserPreferenceCreateView(generics.CreateAPIView):
         """
         response = super().handle_exception(exc)
         if response.status_code == 400:
-            print("Validation error:", exc.detail)
+            logger.info("Validation error: %s", exc.detail)
         return response
 
 
@@ -95,4 +157,35 @@ class UserPreferenceUpdateView(generics.UpdateAPIView):
         return UserPreference.objects.filter(user=self.request.user)
 
     def perform_update(self, serializer):
-        serializer.save(user=self.request.user)
\ No newline at end of file
+        serializer.save(user=self.request.user)
+
+
+class UserPreferenceBulkView(generics.GenericAPIView):
+    """
+    API view to create or update many user preferences in one request.
+
+    Expects ``{"preferences": [{"model_id": 1, "preference": "..."}, ...]}`` and
+    writes every pair with a single upsert on (user, model).
+    """
+    serializer_class = UserPreferenceBulkSerializer
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        items = serializer.validated_data['preferences']
+
+        UserPreference.objects.bulk_create(
+            [
+                UserPreference(user=request.user, model_id=item['model_id'], preference=item['preference'])
+                for item in items
+            ],
+            update_conflicts=True,
+            unique_fields=['user', 'model'],
+            update_fields=['preference'],
+        )
+
+        saved = UserPreference.objects.filter(
+            user=request.user, model_id__in=[item['model_id'] for item in items]
+        ).select_related('model')
+        return Response(UserPreferenceSerializer(saved, many=True).data)
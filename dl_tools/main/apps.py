@@ -4,3 +4,16 @@ from django.apps import AppConfig
 class MainConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'main'
+
+    def ready(self):
+        from django.db.backends.signals import connection_created
+        from django.db.models.signals import post_save
+        from .metrics import install_query_timer
+        from .models import ModelInfo
+        from .signals import model_info_saved
+
+        # Time every SQL statement for the request metrics (see main.metrics)
+        connection_created.connect(install_query_timer, dispatch_uid='main.metrics.install_query_timer')
+
+        # Reindex and bump the catalog version when a single ModelInfo is saved (see main.signals)
+        post_save.connect(model_info_saved, sender=ModelInfo, dispatch_uid='main.signals.model_info_saved')
@@ -0,0 +1,168 @@
+# main/catalog.py
+"""
+Catalog versioning for conditional and cached responses.
+
+The catalog only changes when process_markdown runs or a row is saved or
+deleted through the model API or the admin (see main.signals), so every
+change bumps a single version counter. Responses derive a
+strong ETag and a Last-Modified date from it, and conditional requests are
+answered with 304 Not Modified without rendering the response. The ETag also
+covers the URL, the negotiated media type and the sparse field set, so two
+representations never share one. Rendered
+responses are cached under keys that include the version, so a bump
+invalidates all of them at once.
+"""
+import functools
+import hashlib
+import threading
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F
+from django.http import HttpResponse
+from django.utils import timezone
+from django.utils.decorators import method_decorator
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import condition
+
+from .models import CatalogVersion, ModelInfo
+from .serializers import parse_sparse_fields
+
+CATALOG_VERSION_CACHE_KEY = 'catalog:version'
+
+# Per-process hit/miss counters for the rendered response cache
+_cache_stats = {'hits': 0, 'misses': 0}
+_cache_stats_lock = threading.Lock()
+
+
+def get_catalog_version():
+    """
+    Return ``(version, updated_at)`` for the catalog.
+
+    The value is cached for ``CATALOG_VERSION_TIMEOUT`` seconds, so most calls
+    don't touch the database.
+    """
+    state = cache.get(CATALOG_VERSION_CACHE_KEY)
+    if state is None:
+        row = CatalogVersion.objects.values_list('version', 'updated_at').first()
+        state = row or (0, None)
+        cache.set(CATALOG_VERSION_CACHE_KEY, state, settings.CATALOG_VERSION_TIMEOUT)
+    return state
+
+
+async def aget_catalog_version():
+    """Async version of get_catalog_version, for async views."""
+    state = await cache.aget(CATALOG_VERSION_CACHE_KEY)
+    if state is None:
+        row = await CatalogVersion.objects.values_list('version', 'updated_at').afirst()
+        state = row or (0, None)
+        await cache.aset(CATALOG_VERSION_CACHE_KEY, state, settings.CATALOG_VERSION_TIMEOUT)
+    return state
+
+
+def bump_catalog_version():
+    """Record that the catalog changed. The new version is visible once the transaction commits."""
+    updated = CatalogVersion.objects.update(version=F('version') + 1, updated_at=timezone.now())
+    if not updated:
+        CatalogVersion.objects.create(version=1)
+    transaction.on_commit(lambda: cache.delete(CATALOG_VERSION_CACHE_KEY))
+
+
+def _object_exists(request, kwargs):
+    """
+    Whether the model a detail view was asked for exists; always True for other views.
+
+    Checked before the conditions are evaluated so that a missing pk gets a
+    404 rather than a 304. The answer is kept on the request because both the
+    ETag and the Last-Modified function need it.
+    """
+    if 'pk' not in kwargs:
+        return True
+    if not hasattr(request, '_catalog_object_exists'):
+        try:
+            exists = ModelInfo.objects.filter(pk=kwargs['pk']).exists()
+        except (TypeError, ValueError):
+            exists = False
+        request._catalog_object_exists = exists
+    return request._catalog_object_exists
+
+
+def catalog_etag(request, *args, **kwargs):
+    if not _object_exists(request, kwargs):
+        return None
+    version, _ = get_catalog_version()
+    fields = parse_sparse_fields(request.query_params.get('fields', ''))
+    fingerprint = f'{version}|{request.accepted_media_type}|{request.get_full_path()}|{",".join(fields)}'
+    digest = hashlib.sha256(fingerprint.encode('utf-8')).hexdigest()[:16]
+    return f'catalog-{version}-{digest}'
+
+
+def catalog_last_modified(request, *args, **kwargs):
+    if not _object_exists(request, kwargs):
+        return None
+    _, updated_at = get_catalog_version()
+    return updated_at
+
+
+# Applied to read-only catalog views: answer If-None-Match / If-Modified-Since
+# with 304 and ask browsers to revalidate instead of re-downloading.
+conditional_catalog_response = method_decorator([
+    cache_control(no_cache=True),
+    condition(etag_func=catalog_etag, last_modified_func=catalog_last_modified),
+])
+
+
+def catalog_cache_stats():
+    """Return this process's response cache counters as ``{'hits': n, 'misses': n}``."""
+    with _cache_stats_lock:
+        return dict(_cache_stats)
+
+
+def _count_cache(event):
+    with _cache_stats_lock:
+        _cache_stats[event] += 1
+
+
+def catalog_cache_key(version, request):
+    """Build the response cache key for a request at a given catalog version."""
+    fingerprint = f'{request.accepted_media_type}|{request.get_full_path()}'
+    digest = hashlib.sha256(fingerprint.encode('utf-8')).hexdigest()
+    return f'catalog:v{version}:response:{digest}'
+
+
+def cached_catalog_response(view_method):
+    """
+    Serve a read-only catalog view from pre-rendered bytes in the cache.
+
+    Only successful JSON responses are stored; other formats, such as the
+    browsable API, may contain per-user content.
+    """
+    @functools.wraps(view_method)
+    def wrapper(self, request, *args, **kwargs):
+        version, _ = get_catalog_version()
+        key = catalog_cache_key(version, request)
+        cacheable = getattr(request.accepted_renderer, 'format', None) == 'json'
+
+        if cacheable:
+            cached = cache.get(key)
+            if cached is not None:
+                _count_cache('hits')
+                content, content_type = cached
+                response = HttpResponse(content, content_type=content_type)
+                response['X-Cache'] = 'HIT'
+                return response
+            _count_cache('misses')
+
+        response = view_method(self, request, *args, **kwargs)
+        if cacheable and response.status_code == 200:
+            # Render now, the same way finalize_response would, so the bytes can be stored
+            response.accepted_renderer = request.accepted_renderer
+            response.accepted_media_type = request.accepted_media_type
+            response.renderer_context = self.get_renderer_context()
+            response.render()
+            cache.set(key, (response.content, response['Content-Type']), settings.CATALOG_CACHE_TIMEOUT)
+            response['X-Cache'] = 'MISS'
+        return response
+
+    return wrapper
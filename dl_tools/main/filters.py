@@ -0,0 +1,76 @@
+# main/filters.py
+from django.db.models import Q
+from rest_framework.filters import BaseFilterBackend
+
+from .models import ModelInfoTerm
+from .terms import normalize_term
+
+
+class ModelInfoFilter(BaseFilterBackend):
+    """
+    Server-side filtering for the model catalog.
+
+    Supported query parameters:
+      - ``name``, ``organization``: case-insensitive substring match
+      - ``use_cases``, ``practices``: case-insensitive substring match against any one item of the list
+      - ``severity``: exact match, comma-separated for several values (e.g. ``high,medium``)
+      - ``q``: substring match against any of name, organization, use cases and practices
+      - ``use_case``, ``practice``: exact match against one item of the list (indexed)
+      - ``domain``: models citing a concerning-practice URL on this host (indexed)
+    """
+    text_fields = ('name', 'organization')
+    # JSON list fields are matched item by item through their term rows: an
+    # icontains on the column itself would search the JSON encoding, where
+    # e.g. a curly apostrophe is stored as \u2019.
+    list_fields = {
+        'use_cases': ModelInfoTerm.USE_CASE,
+        'practices': ModelInfoTerm.PRACTICE,
+    }
+    term_params = {
+        'use_case': ModelInfoTerm.USE_CASE,
+        'practice': ModelInfoTerm.PRACTICE,
+        'domain': ModelInfoTerm.DOMAIN,
+    }
+
+    @staticmethod
+    def list_item_contains(kind, value):
+        """Condition matching models with a list item of this kind that contains ``value``."""
+        terms = ModelInfoTerm.objects.filter(kind=kind, value__icontains=value)
+        return Q(pk__in=terms.values('model_id'))
+
+    def filter_queryset(self, request, queryset, view):
+        params = request.query_params
+
+        for field in self.text_fields:
+            value = params.get(field, '').strip()
+            if value:
+                queryset = queryset.filter(**{f'{field}__icontains': value})
+        for field, kind in self.list_fields.items():
+            value = params.get(field, '').strip()
+            if value:
+                queryset = queryset.filter(self.list_item_contains(kind, value))
+
+        severity = params.get('severity', '').strip()
+        if severity:
+            levels = [level.strip().lower() for level in severity.split(',') if level.strip()]
+            queryset = queryset.filter(severity__in=levels)
+
+        query = params.get('q', '').strip()
+        if query:
+            condition = Q()
+            for field in self.text_fields:
+                condition |= Q(**{f'{field}__icontains': query})
+            for kind in self.list_fields.values():
+                condition |= self.list_item_contains(kind, query)
+            queryset = queryset.filter(condition)
+
+        for param, kind in self.term_params.items():
+            value = params.get(param, '').strip()
+            if kind == ModelInfoTerm.DOMAIN and value and '://' not in value:
+                value = 'http://' + value  # Accept a bare host as well as a URL
+            if value:
+                # Start from the (kind, value) index rather than probing it once per model
+                terms = ModelInfoTerm.objects.filter(kind=kind, value=normalize_term(kind, value))
+                queryset = queryset.filter(pk__in=terms.values('model_id'))
+
+        return queryset
@@ -1,18 +1,173 @@
+import random
+from itertools import accumulate, islice
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
 from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from main.catalog import bump_catalog_version
+from main.models import ModelInfo, ModelInfoTerm, UserPreference
+from main.search import rebuild_search_index
+from main.terms import rebuild_terms
+
+SYNTHETIC_MODEL_PREFIX = 'synthetic-model-'
+SYNTHETIC_USER_PREFIX = 'synthetic-user-'
+
+# (items per row, characters per item) for each list field, taken from the
+# files in markdown_files/
+LIST_FIELD_SHAPES = {
+    'use_cases': ((2, 5), (66, 124)),
+    'practices': ((3, 6), (92, 201)),
+    'data_info': ((1, 2), (61, 113)),
+    'concerning_practices': ((2, 5), (51, 159)),
+}
+URLS_PER_ROW = (1, 3)
+
+# Severity mix of markdown_files/ (None is an unset severity)
+SEVERITY_WEIGHTS = {'high': 40, 'medium': 25, 'low': 20, None: 15}
+
+WORDS = (
+    'model data users training conversations content privacy settings account service '
+    'retention review opt-out default enterprise API personal feedback prompts outputs '
+    'metadata location device storage policy third-party partners research improve safety '
+    'moderation history deleted export access logs images voice assistant workspace browser '
+    'search documents code productivity tutoring reviewers annotate shared collected'
+).split()
+
 
 class Command(BaseCommand):
-    help = 'Load example data into the database'
+    help = 'Load example data into the database, optionally with a large synthetic catalog'
 
-    def handle(self, *args, **kwargs):
-        load_example_data()
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--models', type=int, default=0,
+            help='Number of synthetic models to generate in addition to the examples'
+        )
+        parser.add_argument(
+            '--users', type=int, default=0,
+            help='Number of synthetic users to generate (password: "password")'
+        )
+        parser.add_argument(
+            '--prefs-per-user', type=int, default=10,
+            help='Preferences given to each synthetic user, for distinct random models'
+        )
+        parser.add_argument(
+            '--seed', type=int, default=0,
+            help='Random seed; the same options and seed produce the same data'
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=5000,
+            help='Number of rows written per bulk insert'
+        )
 
-# main/load_example_data.py
-from django.contrib.auth.models import User
-from main.models import ModelInfo, UserPreference
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            load_example_data()
+            generator = SyntheticData(options['seed'], options['batch_size'])
+            if options['models']:
+                count = generator.create_models(options['models'])
+                self.stdout.write(f"Created {count} synthetic models")
+            if options['users']:
+                count = generator.create_users(options['users'])
+                self.stdout.write(f"Created {count} synthetic users")
+                count = generator.create_preferences(options['prefs_per_user'])
+                self.stdout.write(f"Created {count} synthetic preferences")
+
+            # Rows were inserted directly, so rebuild the indexes process_markdown maintains
+            rebuild_search_index()
+            rebuild_terms()
+            bump_catalog_version()
+        self.stdout.write(self.style.SUCCESS(
+            f"Loaded {ModelInfo.objects.count()} models and {UserPreference.objects.count()} preferences"
+        ))
+
+
+def bulk_create_in_chunks(model, objects, batch_size):
+    """Insert objects from an iterator in chunks, so only one chunk is held in memory."""
+    objects = iter(objects)
+    created = 0
+    while True:
+        chunk = list(islice(objects, batch_size))
+        if not chunk:
+            return created
+        model.objects.bulk_create(chunk, batch_size=batch_size)
+        created += len(chunk)
+
+
+class SyntheticData:
+    """Generates synthetic models, users and preferences from a seeded random source."""
+
+    def __init__(self, seed, batch_size):
+        self.rng = random.Random(seed)
+        self.batch_size = batch_size
+        # Items are cut from one long run of random words, which is much faster
+        # than drawing every word separately
+        self.words = ' '.join(self.rng.choices(WORDS, k=50000))
+
+    def text(self, length_range):
+        """Return a sentence whose length is drawn from ``length_range``."""
+        low, high = length_range
+        random = self.rng.random
+        length = low + int(random() * (high - low + 1))
+        start = self.words.find(' ', int(random() * (len(self.words) - 2 * high))) + 1
+        end = self.words.rfind(' ', start, start + length + 1)
+        return self.words[start].upper() + self.words[start + 1:end] + '.'
+
+    def create_models(self, count):
+        # A few large organizations publish most models (Zipf-like weights)
+        organizations = [f'Organization {i}' for i in range(max(count // 20, 10))]
+        org_weights = list(accumulate(1 / (rank + 1) for rank in range(len(organizations))))
+        severities = list(SEVERITY_WEIGHTS)
+        severity_weights = list(accumulate(SEVERITY_WEIGHTS.values()))
+        rng = self.rng
+
+        def rows():
+            for i in range(count):
+                fields = {
+                    field: [self.text(lengths) for _ in range(rng.randint(*items))]
+                    for field, (items, lengths) in LIST_FIELD_SHAPES.items()
+                }
+                yield ModelInfo(
+                    name=f'{SYNTHETIC_MODEL_PREFIX}{i:06d}',
+                    organization=rng.choices(organizations, cum_weights=org_weights)[0],
+                    concerning_practices_urls=[
+                        f'https://example-{rng.randrange(200)}.org/privacy/{i}/{j}'
+                        for j in range(rng.randint(*URLS_PER_ROW))
+                    ],
+                    severity=rng.choices(severities, cum_weights=severity_weights)[0],
+                    **fields,
+                )
+
+        return bulk_create_in_chunks(ModelInfo, rows(), self.batch_size)
+
+    def create_users(self, count):
+        User.objects.filter(username__startswith=SYNTHETIC_USER_PREFIX).delete()
+        # Hashing is deliberately slow, so every user shares one hash
+        password = make_password('password')
+        users = (
+            User(username=f'{SYNTHETIC_USER_PREFIX}{i:06d}', email=f'user{i}@example.com', password=password)
+            for i in range(count)
+        )
+        return bulk_create_in_chunks(User, users, self.batch_size)
+
+    def create_preferences(self, per_user):
+        model_ids = list(ModelInfo.objects.order_by('pk').values_list('pk', flat=True))
+        user_ids = list(User.objects.filter(
+            username__startswith=SYNTHETIC_USER_PREFIX
+        ).order_by('pk').values_list('pk', flat=True))
+        per_user = min(per_user, len(model_ids))
+        rng = self.rng
+
+        def rows():
+            for user_id in user_ids:
+                for model_id in rng.sample(model_ids, per_user):
+                    yield UserPreference(
+                        user_id=user_id, model_id=model_id, preference=self.text((20, 160)),
+                    )
+
+        return bulk_create_in_chunks(UserPreference, rows(), self.batch_size)
 
-# main/load_example_data.py
-from django.contrib.auth.models import User
-from main.models import ModelInfo, UserPreference
 
 def load_example_data():
     # Create example models
@@ -20,92 +175,93 @@ def load_example_data():
         {
             "name": "ChatGPT",
             "organization": "OpenAI",
-            "use_cases": "General-purpose AI",
-            "practices": "Responsible AI",
-            "data_info": "Uses diverse internet data for training",
-            "concerning_practices": "May use data without explicit consent"
+            "use_cases": ["General-purpose AI"],
+            "practices": ["Responsible AI"],
+            "data_info": ["Uses diverse internet data for training"],
+            "concerning_practices": ["May use data without explicit consent"]
         },
         {
             "name": "Claude",
             "organization": "Anthropic",
-            "use_cases": "Conversational AI",
-            "practices": "Ethical AI",
-            "data_info": "Trained on large-scale conversational data",
-            "concerning_practices": "Potential bias in training data"
+            "use_cases": ["Conversational AI"],
+            "practices": ["Ethical AI"],
+            "data_info": ["Trained on large-scale conversational data"],
+            "concerning_practices": ["Potential bias in training data"]
         },
         {
             "name": "Gemini",
             "organization": "Google DeepMind",
-            "use_cases": "Research AI",
-            "practices": "Transparent AI",
-            "data_info": "Uses research papers and scholarly articles",
-            "concerning_practices": "Data might not be anonymized"
+            "use_cases": ["Research AI"],
+            "practices": ["Transparent AI"],
+            "data_info": ["Uses research papers and scholarly articles"],
+            "concerning_practices": ["Data might not be anonymized"]
         },
         {
             "name": "DALL-E",
             "organization": "OpenAI",
-            "use_cases": "Image generation",
-            "practices": "Creative AI",
-            "data_info": "Trained on vast image datasets",
-            "concerning_practices": "Risk of generating inappropriate images"
+            "use_cases": ["Image generation"],
+            "practices": ["Creative AI"],
+            "data_info": ["Trained on vast image datasets"],
+            "concerning_practices": ["Risk of generating inappropriate images"]
         },
         {
             "name": "BERT",
             "organization": "Google",
-            "use_cases": "Natural language processing",
-            "practices": "Linguistic AI",
-            "data_info": "Utilizes text corpora for training",
-            "concerning_practices": "May perpetuate existing biases in text"
+            "use_cases": ["Natural language processing"],
+            "practices": ["Linguistic AI"],
+            "data_info": ["Utilizes text corpora for training"],
+            "concerning_practices": ["May perpetuate existing biases in text"]
         },
         {
             "name": "GPT-3",
             "organization": "OpenAI",
-            "use_cases": "Text generation",
-            "practices": "Innovative AI",
-            "data_info": "Trained on a variety of internet texts",
-            "concerning_practices": "May produce harmful or biased content"
+            "use_cases": ["Text generation"],
+            "practices": ["Innovative AI"],
+            "data_info": ["Trained on a variety of internet texts"],
+            "concerning_practices": ["May produce harmful or biased content"]
         },
         {
             "name": "Mistral",
             "organization": "Mistral AI",
-            "use_cases": "Text analysis",
-            "practices": "Accurate AI",
-            "data_info": "Analyzes text data for insights",
-            "concerning_practices": "Potential misuse of sensitive data"
+            "use_cases": ["Text analysis"],
+            "practices": ["Accurate AI"],
+            "data_info": ["Analyzes text data for insights"],
+            "concerning_practices": ["Potential misuse of sensitive data"]
         },
         {
             "name": "Turing-NLG",
             "organization": "Microsoft",
-            "use_cases": "Language understanding",
-            "practices": "Robust AI",
-            "data_info": "Trained on diverse language datasets",
-            "concerning_practices": "Data privacy concerns"
+            "use_cases": ["Language understanding"],
+            "practices": ["Robust AI"],
+            "data_info": ["Trained on diverse language datasets"],
+            "concerning_practices": ["Data privacy concerns"]
         },
         {
             "name": "XLNet",
             "organization": "Google",
-            "use_cases": "Sequence prediction",
-            "practices": "Adaptive AI",
-            "data_info": "Uses sequential data for predictions",
-            "concerning_practices": "Might infer sensitive information"
+            "use_cases": ["Sequence prediction"],
+            "practices": ["Adaptive AI"],
+            "data_info": ["Uses sequential data for predictions"],
+            "concerning_practices": ["Might infer sensitive information"]
         },
         {
             "name": "RoBERTa",
             "organization": "Facebook AI",
-            "use_cases": "Text classification",
-            "practices": "Efficient AI",
-            "data_info": "Enhanced training on large text corpora",
-            "concerning_practices": "Risk of data bias in outcomes"
+            "use_cases": ["Text classification"],
+            "practices": ["Efficient AI"],
+            "data_info": ["Enhanced training on large text corpora"],
+            "concerning_practices": ["Risk of data bias in outcomes"]
         }
     ]
 
-    # Clear existing data
-    ModelInfo.objects.all().delete()
+    # Clear existing data. Deleting the dependent rows first, each in one
+    # statement, keeps this fast when a large synthetic catalog is replaced.
     UserPreference.objects.all().delete()
+    ModelInfoTerm.objects.all().delete()
+    ModelInfo.objects.only('pk').delete()
 
     # Create ModelInfo instances
-    for model in models:
-        ModelInfo.objects.create(**model)
+    ModelInfo.objects.bulk_create(ModelInfo(**model) for model in models)
 
     # Create example user
     user, created = User.objects.get_or_create(username="example_user", email="user@example.com")
@@ -114,7 +270,7 @@ def load_example_data():
         user.save()
 
     # Create UserPreference instances
-    for model in ModelInfo.objects.all():
-        UserPreference.objects.create(user=user, model=model, preference=f"Preference for {model.name}")
-
-    print("Example data loaded successfully.")
\ No newline at end of file
+    UserPreference.objects.bulk_create(
+        UserPreference(user=user, model=model, preference=f"Preference for {model.name}")
+        for model in ModelInfo.objects.all()
+    )
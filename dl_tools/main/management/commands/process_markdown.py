@@ -1,13 +1,64 @@
 import os
-import frontmatter
-from django.core.management.base import BaseCommand
+import time
+import subprocess
+from django.core.management.base import BaseCommand, CommandError
 from django.conf import settings
+from django.db import transaction
+from main.catalog import bump_catalog_version
 from main.models import ModelInfo
-from md_data_linter import MdDataLint  # Import the linter
+from main.snapshot import write_snapshot
+from main.search import index_models, prune_search_index, rebuild_search_index
+from main.terms import index_terms, rebuild_terms
+from main.watcher import RESCAN, MarkdownWatcher
+from md_data_linter import MdDataLint, DEFAULT_CACHE_PATH  # Import the linter
+
+# Columns refreshed when an existing ModelInfo row is upserted
+UPSERT_FIELDS = [
+    'organization', 'use_cases', 'practices', 'data_info', 'concerning_practices',
+    'concerning_practices_urls', 'severity', 'content_hash',
+]
 
 class Command(BaseCommand):
     help = 'Validates and processes Markdown files into ModelInfo'
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--jobs', '-j', type=int, default=1,
+            help='Number of worker processes used for linting (0 = one per CPU)'
+        )
+        parser.add_argument(
+            '--no-cache', action='store_true',
+            help='Ignore the validation cache and re-validate every file'
+        )
+        parser.add_argument(
+            '--incremental', action='store_true',
+            help='Only write rows whose source file was added, changed or removed'
+        )
+        parser.add_argument(
+            '--since', metavar='GIT_REV',
+            help='Only consider files changed since this git revision (implies --incremental)'
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=500,
+            help='Number of rows written per bulk upsert statement'
+        )
+        parser.add_argument(
+            '--watch', action='store_true',
+            help='After syncing (incrementally), keep watching markdown_files and sync the files that change'
+        )
+        parser.add_argument(
+            '--debounce', type=float, default=0.2,
+            help='With --watch, seconds without further changes before a batch of changes is synced'
+        )
+        parser.add_argument(
+            '--poll', action='store_true',
+            help='With --watch, poll for changes instead of using file system events'
+        )
+        parser.add_argument(
+            '--poll-interval', type=float, default=1.0,
+            help='With --watch, seconds between directory scans when polling'
+        )
+
     def handle(self, *args, **options):
         # Path to markdown files (should be in project root/markdown_files)
         markdown_dir = os.path.join(settings.BASE_DIR, 'markdown_files')
@@ -15,7 +66,7 @@ class Command(BaseCommand):
 
         # Path to schema (in project root - same as manage.py)
         schema_path = os.path.join(settings.BASE_DIR, 'example-schema.json')
-        
+
         if not os.path.exists(schema_path):
             self.stdout.write(self.style.ERROR(
                 f"Schema file not found at {schema_path}. "
@@ -23,15 +74,120 @@ class Command(BaseCommand):
             ))
             return
 
-        # Step 1: Validate files
+        # Step 1: Validate files (unchanged files are served from the cache).
+        # Results are streamed, so rows are written while linting is still running.
+        cache_path = None if options['no_cache'] else os.path.join(settings.BASE_DIR, DEFAULT_CACHE_PATH)
+        linter = MdDataLint(schema_path, cache_path=cache_path)
+        candidate_names = None
+        if options['since']:
+            candidates = self.changed_files(markdown_dir, options['since'])
+            candidate_names = [self.model_name(path) for path in candidates]
+            self.stdout.write(f"{len(candidates)} files changed since {options['since']}")
+            results = linter.iter_validate_files(
+                [path for path in candidates if os.path.exists(path)], jobs=options['jobs']
+            )
+        else:
+            results = linter.iter_validate(markdown_dir, jobs=options['jobs'])
+
+        self.verbosity = options['verbosity']
+        self.batch_size = options['batch_size']
+        self.result_count = 0
+        self.cached_count = 0
+
+        # Apply the whole sync in one transaction so readers never see a partial catalog
+        with transaction.atomic():
+            if options['incremental'] or options['since'] or options['watch']:
+                self.sync_incremental(linter, self.count_results(results), candidate_names)
+            else:
+                self.sync_full(linter, self.count_results(results))
+
+        # Pre-serialize the committed catalog so it can be served without the database
+        snapshot = write_snapshot()
+        self.stdout.write(f"Catalog snapshot written to {snapshot}")
+
+        if self.cached_count:
+            self.stdout.write(f"Served {self.cached_count}/{self.result_count} validation results from cache")
+
+        if options['watch']:
+            self.watch(markdown_dir, schema_path, options)
+
+    def watch(self, markdown_dir, schema_path, options):
+        """Sync the files under ``markdown_dir`` as they change, until interrupted."""
+        # Only the changed files are validated, so skip the validation cache
+        # rather than rewriting all of it after every change
         linter = MdDataLint(schema_path)
-        results = linter.validate_directory(markdown_dir)
+        watcher = MarkdownWatcher(
+            markdown_dir, debounce=options['debounce'],
+            poll_interval=options['poll_interval'], use_polling=options['poll'],
+        )
+        with watcher:
+            self.stdout.write(f"Watching {markdown_dir} for changes ({watcher.backend}). Press Ctrl+C to stop.")
+            try:
+                for paths in watcher.batches():
+                    try:
+                        self.sync_paths(linter, markdown_dir, paths)
+                    except Exception as e:
+                        # Keep watching; the next change to the file will retry it
+                        self.stdout.write(self.style.ERROR(f"Sync failed: {e}"))
+            except KeyboardInterrupt:
+                self.stdout.write("Stopped watching")
+
+    def sync_paths(self, linter, markdown_dir, paths):
+        """
+        Sync the rows for a batch of added, changed or removed files, then
+        write the snapshot for the new catalog version. Only the documents of
+        the changed rows are compressed again.
+        """
+        start = time.perf_counter()
+        if RESCAN in paths:
+            description = 'all files'
+            candidate_names = None
+            results = linter.iter_validate(markdown_dir)
+        else:
+            description = f'{len(paths)} changed files'
+            paths = sorted(paths)
+            candidate_names = [self.model_name(path) for path in paths]
+            results = linter.iter_validate_files([path for path in paths if os.path.exists(path)])
 
-        # Step 2: Get names of all valid files (without .md extension)
-        valid_names = [os.path.basename(r.file_path)[:-3] for r in results if r.is_valid]
+        self.result_count = 0
+        self.cached_count = 0
+        with transaction.atomic():
+            self.sync_incremental(linter, self.report_invalid(self.count_results(results)), candidate_names)
+        write_snapshot()
+        self.stdout.write(f"Synced {description} in {(time.perf_counter() - start) * 1000:.0f}ms")
+
+    def report_invalid(self, results):
+        """Pass validation results through, printing the errors of invalid files."""
+        for result in results:
+            if not result.is_valid:
+                self.stdout.write(self.style.ERROR(
+                    f"{os.path.basename(result.file_path)}: {'; '.join(result.errors)}"
+                ))
+            yield result
+
+    def count_results(self, results):
+        """Pass validation results through while counting them."""
+        for result in results:
+            self.result_count += 1
+            if result.cached:
+                self.cached_count += 1
+            yield result
+
+    def sync_full(self, linter, results):
+        """Rewrite every valid file and delete rows with no matching file."""
+        valid_names = {}
+
+        def valid_documents():
+            for result in results:
+                if result.is_valid:
+                    self.claim_name(valid_names, result.file_path)
+                    yield self.load_document(linter, result)
+
+        # Step 2: Process valid files
+        processed_count = self.write_rows(valid_documents())
 
         # Step 3: Delete records that aren't represented in current files
-        stale_records = ModelInfo.objects.exclude(name__in=valid_names)
+        stale_records = ModelInfo.objects.exclude(name__in=list(valid_names))
         stale_count = stale_records.count()
         if stale_count > 0:
             stale_records.delete()
@@ -39,40 +195,156 @@ class Command(BaseCommand):
                 f"Deleted {stale_count} stale records no longer present in markdown files"
             ))
 
-        # Step 4: Process valid files
-        processed_count = 0
-        for result in results:
-            if result.is_valid:
-                self.process_file(result.file_path)
-                processed_count += 1
+        # Every row was rewritten, so rebuild the search and term indexes in one pass
+        rebuild_search_index()
+        rebuild_terms()
+        bump_catalog_version()
 
         self.stdout.write(self.style.SUCCESS(
-            f"Processed {processed_count}/{len(results)} valid files. "
+            f"Processed {processed_count}/{self.result_count} valid files. "
             f"Deleted {stale_count} stale records."
         ))
 
-    def process_file(self, filepath):
-        """Process a single Markdown file into the database."""
+    def sync_incremental(self, linter, results, candidate_names=None):
+        """
+        Write only the rows whose source file was added, changed or removed.
+
+        When ``candidate_names`` is given, only those rows are compared against
+        the files; otherwise the whole table is.
+        """
+        rows = ModelInfo.objects.all()
+        if candidate_names is not None:
+            rows = rows.filter(name__in=candidate_names)
+        existing = dict(rows.values_list('name', 'content_hash'))
+
+        valid_names = {}
+        added = []
+        changed = []
+
+        def delta_documents():
+            for result in results:
+                if not result.is_valid:
+                    continue
+                name = self.claim_name(valid_names, result.file_path)
+                if name not in existing:
+                    added.append(name)
+                elif existing[name] != result.content_hash:
+                    changed.append(name)
+                else:
+                    continue
+                yield self.load_document(linter, result)
+
+        self.write_rows(delta_documents())
+
+        removed = [name for name in existing if name not in valid_names]
+        if removed:
+            ModelInfo.objects.filter(name__in=removed).delete()
+
+        # Keep the search index in step with the rows touched above
+        index_models(added + changed)
+        index_terms(added + changed)
+        if removed:
+            prune_search_index()
+        if added or changed or removed:
+            bump_catalog_version()
+
+        unchanged_count = len(valid_names) - len(added) - len(changed)
+        self.stdout.write(self.style.SUCCESS(
+            f"Added {len(added)}, updated {len(changed)}, deleted {len(removed)} records. "
+            f"{unchanged_count} records unchanged."
+        ))
+
+    def changed_files(self, markdown_dir, since):
+        """Return the Markdown files added, modified or deleted since a git revision."""
+        commands = [
+            ['git', 'diff', '--name-only', '--no-renames', '--relative', since, '--', '.'],
+            ['git', 'ls-files', '--others', '--exclude-standard', '--', '.'],
+        ]
+        paths = set()
+        for command in commands:
+            try:
+                output = subprocess.run(
+                    command, cwd=markdown_dir, capture_output=True, text=True, check=True
+                ).stdout
+            except (OSError, subprocess.CalledProcessError) as e:
+                raise CommandError(f"Could not list files changed since {since}: {getattr(e, 'stderr', '') or e}")
+            paths.update(
+                os.path.join(markdown_dir, line) for line in output.splitlines() if line.endswith('.md')
+            )
+        return sorted(paths)
+
+    def load_document(self, linter, result):
+        """Return the parsed document for a result, parsing the file if it came from the cache."""
+        return result.document or linter.parse_file(result.file_path)
+
+    def model_name(self, filepath):
+        """Return the ModelInfo name for a Markdown file (the file name without '.md')."""
+        return os.path.basename(filepath)[:-3]
+
+    def claim_name(self, claimed, filepath):
+        """
+        Return the model name for a file, recording it in ``claimed`` (name -> path).
+
+        Files in different subdirectories can share a name, but rows are keyed
+        on it, so a second file with a claimed name stops the sync before its
+        row reaches an upsert batch (the transaction then rolls back).
+        """
+        name = self.model_name(filepath)
+        other = claimed.setdefault(name, filepath)
+        if other != filepath:
+            raise CommandError(
+                f"{other} and {filepath} both map to model '{name}'. Rename one of them."
+            )
+        return name
+
+    def write_rows(self, documents):
+        """Upsert ModelInfo rows for the documents in batches. Returns the number of rows written."""
+        written = 0
+        batch = []
+        for document in documents:
+            row = self.build_row(document)
+            if row is None:
+                continue
+            batch.append(row)
+            if len(batch) >= self.batch_size:
+                written += self.upsert(batch)
+                batch = []
+        if batch:
+            written += self.upsert(batch)
+        return written
+
+    def upsert(self, rows):
+        """Insert or update a batch of ModelInfo rows in a single statement."""
+        ModelInfo.objects.bulk_create(
+            rows,
+            update_conflicts=True,
+            unique_fields=['name'],
+            update_fields=UPSERT_FIELDS,
+        )
+        return len(rows)
+
+    def build_row(self, document):
+        """Build an unsaved ModelInfo row from a single parsed Markdown document."""
+        filepath = document.file_path
+        post = document.data
         try:
-            with open(filepath, 'r', encoding='utf-8') as f:
-                post = frontmatter.load(f)
-            
-            ModelInfo.objects.update_or_create(
-                name=os.path.basename(filepath)[:-3],  # Remove '.md'
-                defaults={
-                    'organization': post.get('organization', ''),
-                    'use_cases': '\n'.join(post.get('use_cases', [])),
-                    'practices': '\n'.join(post.get('practices', [])),
-                    'data_info': '\n'.join(post.get('data_info', [])) or None,
-                    'concerning_practices': '\n'.join(post.get('concerning_practices', [])) or None,
-                    'concerning_practices_urls': ','.join(post.get('concerning_practices_urls', [])) or None,
-                    'severity': post.get('severity', '').lower() or None
-                }
+            row = ModelInfo(
+                name=self.model_name(filepath),
+                organization=post.get('organization', ''),
+                use_cases=list(post.get('use_cases', [])),
+                practices=list(post.get('practices', [])),
+                data_info=list(post.get('data_info', [])),
+                concerning_practices=list(post.get('concerning_practices', [])),
+                concerning_practices_urls=list(post.get('concerning_practices_urls', [])),
+                severity=post.get('severity', '').lower() or None,
+                content_hash=document.content_hash or '',
             )
-            self.stdout.write(self.style.SUCCESS(
-                f"Processed {os.path.basename(filepath)}"
-            ))
         except Exception as e:
             self.stdout.write(self.style.ERROR(
                 f"Error processing {os.path.basename(filepath)}: {str(e)}"
-            ))
\ No newline at end of file
+            ))
+            return None
+
+        if self.verbosity > 1:
+            self.stdout.write(f"Processed {os.path.basename(filepath)}")
+        return row
@@ -0,0 +1,142 @@
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# Runs in a fresh interpreter: load the application, then serve one request
+# through it in-process, and print the timings as JSON on stdout.
+PROBE = r'''
+import json, sys, time
+start = time.perf_counter()
+kind, path = sys.argv[1], sys.argv[2]
+host = 'localhost'
+query = ''
+if '?' in path:
+    path, query = path.split('?', 1)
+
+if kind == 'wsgi':
+    import io
+    from dl_tools.wsgi import application
+    loaded = time.perf_counter()
+    status = []
+    environ = {
+        'REQUEST_METHOD': 'GET', 'PATH_INFO': path, 'QUERY_STRING': query,
+        'SERVER_NAME': host, 'SERVER_PORT': '80', 'HTTP_HOST': host,
+        'SERVER_PROTOCOL': 'HTTP/1.1', 'wsgi.url_scheme': 'http', 'wsgi.input': io.BytesIO(),
+        'wsgi.errors': sys.stderr, 'wsgi.version': (1, 0), 'wsgi.multithread': False,
+        'wsgi.multiprocess': True, 'wsgi.run_once': False,
+    }
+    body = b''.join(application(environ, lambda s, h, exc_info=None: status.append(s)))
+    code = int(status[0].split()[0])
+else:
+    import asyncio
+    from dl_tools.asgi import application
+    loaded = time.perf_counter()
+    scope = {
+        'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1', 'method': 'GET',
+        'scheme': 'http', 'path': path, 'raw_path': path.encode(), 'query_string': query.encode(),
+        'headers': [(b'host', host.encode())], 'server': (host, 80), 'client': ('127.0.0.1', 0),
+    }
+    messages = []
+    received = []
+
+    async def receive():
+        if not received:
+            received.append(True)
+            return {'type': 'http.request', 'body': b'', 'more_body': False}
+        await asyncio.Event().wait()  # The client never disconnects
+
+    async def send(message):
+        messages.append(message)
+
+    asyncio.run(application(scope, receive, send))
+    code = next(m['status'] for m in messages if m['type'] == 'http.response.start')
+    body = b''.join(m.get('body', b'') for m in messages if m['type'] == 'http.response.body')
+
+done = time.perf_counter()
+print(json.dumps({'load': loaded - start, 'first_response': done - loaded, 'status': code, 'bytes': len(body)}))
+'''
+
+
+class Command(BaseCommand):
+    help = 'Profiles web worker cold start: import time per module and time to first response'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--app', choices=['wsgi', 'asgi'], default='wsgi',
+            help='Application entry point to load (default: wsgi)'
+        )
+        parser.add_argument(
+            '--path', default='/api/models/',
+            help='Path requested once the application has loaded'
+        )
+        parser.add_argument(
+            '--runs', type=int, default=3,
+            help='Number of cold starts to measure; medians are reported'
+        )
+        parser.add_argument(
+            '--top', type=int, default=15,
+            help='Number of modules listed by cumulative import time'
+        )
+
+    def handle(self, *args, **options):
+        runs = [self.cold_start(options['app'], options['path']) for _ in range(max(options['runs'], 1))]
+
+        def median(key):
+            return statistics.median(run[key] for run in runs)
+
+        self.stdout.write(self.style.MIGRATE_HEADING(
+            f"Cold start of dl_tools.{options['app']} + GET {options['path']} "
+            f"(median of {len(runs)} runs, status {runs[-1]['status']}, {runs[-1]['bytes']} bytes)"
+        ))
+        self.stdout.write(f"  interpreter + imports + first response: {median('total') * 1e3:8.1f} ms")
+        self.stdout.write(f"  load application:                       {median('load') * 1e3:8.1f} ms")
+        self.stdout.write(f"  first response:                         {median('first_response') * 1e3:8.1f} ms")
+        self.stdout.write(f"  import time (all modules):              {median('import_total') / 1e3:8.1f} ms")
+
+        imports = runs[-1]['imports']
+        self.stdout.write(self.style.MIGRATE_HEADING("Import time by top-level package (self time):"))
+        by_package = {}
+        for module, self_us, _ in imports:
+            package = module.split('.')[0]
+            by_package[package] = by_package.get(package, 0) + self_us
+        for package, total in sorted(by_package.items(), key=lambda item: -item[1])[:options['top']]:
+            self.stdout.write(f"  {total / 1e3:8.1f} ms  {package}")
+
+        self.stdout.write(self.style.MIGRATE_HEADING("Slowest modules (cumulative time):"))
+        for module, _, cumulative_us in sorted(imports, key=lambda item: -item[2])[:options['top']]:
+            self.stdout.write(f"  {cumulative_us / 1e3:8.1f} ms  {module}")
+
+    def cold_start(self, app, path):
+        """Start a fresh interpreter and return its timings and import profile."""
+        env = dict(os.environ, DJANGO_SETTINGS_MODULE=os.environ.get('DJANGO_SETTINGS_MODULE', 'dl_tools.settings'))
+        started = time.perf_counter()
+        try:
+            proc = subprocess.run(
+                [sys.executable, '-X', 'importtime', '-c', PROBE, app, path],
+                cwd=settings.BASE_DIR, env=env, capture_output=True, text=True, check=True,
+            )
+        except subprocess.CalledProcessError as e:
+            raise CommandError(f"Startup probe failed:\n{e.stderr[-2000:]}")
+        total = time.perf_counter() - started
+
+        result = json.loads(proc.stdout.strip().splitlines()[-1])
+        result['total'] = total
+        result['imports'] = self.parse_importtime(proc.stderr)
+        result['import_total'] = sum(self_us for _, self_us, _ in result['imports'])
+        return result
+
+    def parse_importtime(self, output):
+        """Parse ``-X importtime`` lines into (module, self_us, cumulative_us) tuples."""
+        imports = []
+        for line in output.splitlines():
+            if not line.startswith('import time:') or 'self [us]' in line:
+                continue
+            self_us, cumulative_us, module = line[len('import time:'):].split('|')
+            imports.append((module.strip(), int(self_us), int(cumulative_us)))
+        return imports
@@ -0,0 +1,218 @@
+# main/metrics.py
+"""
+Per-request timing and SQL instrumentation.
+
+RequestMetricsMiddleware starts a RequestMetrics collector for each request
+and keeps it in a context variable, which follows the request into the
+threads that run sync code under ASGI. While it is active:
+
+* every SQL statement is timed by a wrapper installed on each database
+  connection as it is created;
+* FastJSONRenderer adds the time it spends encoding to ``serialize``.
+
+When the response is ready the totals are added to a Server-Timing header,
+logged as one JSON line on the ``main.requests`` logger, and added to the
+per-process counters that the ``/metrics`` view renders in Prometheus text
+format. Each worker process keeps its own counters.
+"""
+import contextlib
+import contextvars
+import json
+import logging
+import threading
+import time
+
+from .catalog import catalog_cache_stats
+
+logger = logging.getLogger('main.requests')
+
+# Upper bounds (seconds) of the request duration histogram buckets
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_current = contextvars.ContextVar('request_metrics', default=None)
+
+# Per-process totals keyed by (view, method, status)
+_requests = {}
+_requests_lock = threading.Lock()
+
+
+class RequestMetrics:
+    """Timings collected while one request is handled."""
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.duration = 0.0
+        self.db_time = 0.0
+        self.queries = 0
+        self.serialize_time = 0.0
+        self.response_bytes = 0
+
+    def as_server_timing(self):
+        return ', '.join([
+            f'app;dur={self.duration * 1e3:.1f}',
+            f'db;dur={self.db_time * 1e3:.1f};desc="{self.queries} queries"',
+            f'serialize;dur={self.serialize_time * 1e3:.1f}',
+        ])
+
+
+@contextlib.contextmanager
+def collect_request():
+    """Collect timings for the request handled inside the block."""
+    metrics = RequestMetrics()
+    token = _current.set(metrics)
+    try:
+        yield metrics
+    finally:
+        _current.reset(token)
+
+
+def finish_request(metrics, request, response):
+    """Annotate, log and count a response once its request has been handled."""
+    metrics.duration = time.perf_counter() - metrics.start
+    if response.streaming:
+        metrics.response_bytes = int(response.get('Content-Length') or 0)
+    else:
+        metrics.response_bytes = len(response.content)
+    response['Server-Timing'] = metrics.as_server_timing()
+
+    view = _view_name(request)
+    _record(view, request.method, response.status_code, metrics)
+    if logger.isEnabledFor(logging.INFO):
+        logger.info(json.dumps({
+            'method': request.method,
+            'path': request.path,
+            'view': view,
+            'status': response.status_code,
+            'duration_ms': round(metrics.duration * 1e3, 2),
+            'db_ms': round(metrics.db_time * 1e3, 2),
+            'queries': metrics.queries,
+            'serialize_ms': round(metrics.serialize_time * 1e3, 2),
+            'bytes': metrics.response_bytes,
+        }))
+    return response
+
+
+def _view_name(request):
+    match = getattr(request, 'resolver_match', None)
+    if match is None:
+        return 'unmatched'
+    return match.view_name or match.route or 'unmatched'
+
+
+def time_queries(execute, sql, params, many, context):
+    """Database execute wrapper that adds each statement to the current request's totals."""
+    metrics = _current.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        metrics.db_time += time.perf_counter() - start
+        metrics.queries += 1
+
+
+def install_query_timer(sender, connection, **kwargs):
+    """connection_created receiver that installs ``time_queries`` once per connection."""
+    if time_queries not in connection.execute_wrappers:
+        connection.execute_wrappers.append(time_queries)
+
+
+@contextlib.contextmanager
+def serialize_timer():
+    """Add the time spent in the block to the current request's serialization time."""
+    metrics = _current.get()
+    if metrics is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics.serialize_time += time.perf_counter() - start
+
+
+def _record(view, method, status, metrics):
+    key = (view, method, str(status))
+    with _requests_lock:
+        totals = _requests.get(key)
+        if totals is None:
+            totals = _requests[key] = {
+                'count': 0, 'duration': 0.0, 'db': 0.0, 'queries': 0, 'serialize': 0.0, 'bytes': 0,
+                'buckets': [0] * len(DURATION_BUCKETS),
+            }
+        totals['count'] += 1
+        totals['duration'] += metrics.duration
+        totals['db'] += metrics.db_time
+        totals['queries'] += metrics.queries
+        totals['serialize'] += metrics.serialize_time
+        totals['bytes'] += metrics.response_bytes
+        for i, bound in enumerate(DURATION_BUCKETS):
+            if metrics.duration <= bound:
+                totals['buckets'][i] += 1
+
+
+def _labels(**labels):
+    values = (
+        str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+        for value in labels.values()
+    )
+    return '{' + ','.join(f'{name}="{value}"' for name, value in zip(labels, values)) + '}'
+
+
+def render_prometheus():
+    """Return this process's counters in the Prometheus text exposition format."""
+    with _requests_lock:
+        snapshot = {key: dict(totals, buckets=list(totals['buckets'])) for key, totals in _requests.items()}
+
+    lines = []
+
+    def metric(name, kind, help_text, samples):
+        lines.append(f'# HELP {name} {help_text}')
+        lines.append(f'# TYPE {name} {kind}')
+        lines.extend(samples)
+
+    items = sorted(snapshot.items())
+    metric('dl_tools_http_requests_total', 'counter', 'Requests handled, by view, method and status.', [
+        f'dl_tools_http_requests_total{_labels(view=v, method=m, status=s)} {t["count"]}'
+        for (v, m, s), t in items
+    ])
+
+    duration = []
+    for (v, m, s), t in items:
+        for bound, count in zip(DURATION_BUCKETS, t['buckets']):
+            duration.append(
+                f'dl_tools_http_request_duration_seconds_bucket{_labels(view=v, method=m, status=s, le=bound)} {count}'
+            )
+        duration.append(
+            f'dl_tools_http_request_duration_seconds_bucket{_labels(view=v, method=m, status=s, le="+Inf")} {t["count"]}'
+        )
+        duration.append(f'dl_tools_http_request_duration_seconds_sum{_labels(view=v, method=m, status=s)} {t["duration"]:.6f}')
+        duration.append(f'dl_tools_http_request_duration_seconds_count{_labels(view=v, method=m, status=s)} {t["count"]}')
+    metric('dl_tools_http_request_duration_seconds', 'histogram', 'Wall time spent handling requests.', duration)
+
+    for name, key, help_text, fmt in (
+        ('dl_tools_http_request_db_seconds_total', 'db', 'Time spent executing SQL.', '{:.6f}'),
+        ('dl_tools_http_request_queries_total', 'queries', 'SQL statements executed.', '{}'),
+        ('dl_tools_http_request_serialize_seconds_total', 'serialize', 'Time spent encoding response bodies.', '{:.6f}'),
+        ('dl_tools_http_response_bytes_total', 'bytes', 'Response body bytes sent.', '{}'),
+    ):
+        metric(name, 'counter', help_text, [
+            f'{name}{_labels(view=v, method=m, status=s)} {fmt.format(t[key])}'
+            for (v, m, s), t in items
+        ])
+
+    cache_stats = catalog_cache_stats()
+    metric('dl_tools_catalog_cache_hits_total', 'counter', 'Catalog responses served from the cache.', [
+        f'dl_tools_catalog_cache_hits_total {cache_stats["hits"]}'
+    ])
+    metric('dl_tools_catalog_cache_misses_total', 'counter', 'Catalog responses rendered and cached.', [
+        f'dl_tools_catalog_cache_misses_total {cache_stats["misses"]}'
+    ])
+    return '\n'.join(lines) + '\n'
+
+
+def reset_metrics():
+    """Clear this process's request counters."""
+    with _requests_lock:
+        _requests.clear()
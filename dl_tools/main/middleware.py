@@ -0,0 +1,32 @@
+# main/middleware.py
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+
+from .metrics import collect_request, finish_request
+
+
+class RequestMetricsMiddleware:
+    """
+    Time each request and count its SQL statements.
+
+    Adds a Server-Timing header, logs one JSON line per request and updates
+    the counters served by the ``/metrics`` view. See main.metrics.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        with collect_request() as metrics:
+            response = self.get_response(request)
+        return finish_request(metrics, request, response)
+
+    async def __acall__(self, request):
+        with collect_request() as metrics:
+            response = await self.get_response(request)
+        return finish_request(metrics, request, response)
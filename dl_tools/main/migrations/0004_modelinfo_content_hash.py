@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 20:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0003_modelinfo_concerning_practices_urls_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='modelinfo',
+            name='content_hash',
+            field=models.CharField(blank=True, default='', max_length=64),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-18 20:06
+
+from django.db import migrations
+
+
+def merge_duplicate_names(apps, schema_editor):
+    """Keep the oldest row per name, moving preferences off the duplicates first."""
+    ModelInfo = apps.get_model('main', 'ModelInfo')
+    UserPreference = apps.get_model('main', 'UserPreference')
+
+    kept = {}
+    for pk, name in ModelInfo.objects.order_by('pk').values_list('pk', 'name'):
+        if name not in kept:
+            kept[name] = pk
+            continue
+        UserPreference.objects.filter(model_id=pk).update(model_id=kept[name])
+        ModelInfo.objects.filter(pk=pk).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0004_modelinfo_content_hash'),
+    ]
+
+    operations = [
+        migrations.RunPython(merge_duplicate_names, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 20:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0005_merge_duplicate_modelinfo_names'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='modelinfo',
+            name='name',
+            field=models.CharField(max_length=255, unique=True),
+        ),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 5.2.18 on 2026-10-18 20:10
+
+from django.db import migrations, models
+
+# Columns filtered with icontains by the catalog API. On PostgreSQL these get
+# trigram GIN indexes on UPPER(column), the expression Django's icontains
+# lookup compares against, so substring filters don't need a sequential scan.
+TRIGRAM_COLUMNS = ['name', 'organization', 'use_cases', 'practices']
+
+
+def create_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    for column in TRIGRAM_COLUMNS:
+        schema_editor.execute(
+            f'CREATE INDEX IF NOT EXISTS modelinfo_{column}_trgm_idx '
+            f'ON main_modelinfo USING gin (UPPER({column}::text) gin_trgm_ops)'
+        )
+
+
+def drop_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for column in TRIGRAM_COLUMNS:
+        schema_editor.execute(f'DROP INDEX IF EXISTS modelinfo_{column}_trgm_idx')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0006_modelinfo_name_unique'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='modelinfo',
+            index=models.Index(fields=['organization'], name='modelinfo_organization_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='modelinfo',
+            index=models.Index(fields=['severity'], name='modelinfo_severity_idx'),
+        ),
+        migrations.RunPython(create_trigram_indexes, drop_trigram_indexes),
+    ]
@@ -0,0 +1,52 @@
+from django.db import migrations
+
+# Weighted document: name and organization rank above the descriptive fields
+SEARCH_VECTOR_SQL = """
+    setweight(to_tsvector('english', coalesce(name, '')), 'A') ||
+    setweight(to_tsvector('english', coalesce(organization, '')), 'A') ||
+    setweight(to_tsvector('english', coalesce(use_cases, '')), 'B') ||
+    setweight(to_tsvector('english', coalesce(practices, '')), 'B') ||
+    setweight(to_tsvector('english', coalesce(data_info, '')), 'C') ||
+    setweight(to_tsvector('english', coalesce(concerning_practices, '')), 'C')
+"""
+
+SEARCH_COLUMNS = 'name, organization, use_cases, practices, data_info, concerning_practices'
+
+
+def create_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        schema_editor.execute(
+            f"ALTER TABLE main_modelinfo ADD COLUMN search_vector tsvector "
+            f"GENERATED ALWAYS AS ({SEARCH_VECTOR_SQL}) STORED"
+        )
+        schema_editor.execute(
+            "CREATE INDEX modelinfo_search_vector_idx ON main_modelinfo USING gin (search_vector)"
+        )
+    elif vendor == 'sqlite':
+        schema_editor.execute(
+            f"CREATE VIRTUAL TABLE main_modelinfo_fts USING fts5({SEARCH_COLUMNS}, tokenize='porter unicode61')"
+        )
+        schema_editor.execute(
+            f"INSERT INTO main_modelinfo_fts (rowid, {SEARCH_COLUMNS}) "
+            f"SELECT id, {SEARCH_COLUMNS} FROM main_modelinfo"
+        )
+
+
+def drop_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        schema_editor.execute("ALTER TABLE main_modelinfo DROP COLUMN IF EXISTS search_vector")
+    elif vendor == 'sqlite':
+        schema_editor.execute("DROP TABLE IF EXISTS main_modelinfo_fts")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0007_modelinfo_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
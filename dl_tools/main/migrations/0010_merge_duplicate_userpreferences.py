@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-18 20:14
+
+from django.db import migrations
+
+
+def merge_duplicate_preferences(apps, schema_editor):
+    """Keep the most recently saved preference per (user, model) and delete the rest."""
+    UserPreference = apps.get_model('main', 'UserPreference')
+
+    seen = set()
+    duplicates = []
+    for pk, user_id, model_id in UserPreference.objects.order_by('-pk').values_list('pk', 'user_id', 'model_id'):
+        if (user_id, model_id) in seen:
+            duplicates.append(pk)
+        else:
+            seen.add((user_id, model_id))
+    if duplicates:
+        UserPreference.objects.filter(pk__in=duplicates).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0009_catalogversion'),
+    ]
+
+    operations = [
+        migrations.RunPython(merge_duplicate_preferences, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-18 20:15
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0010_merge_duplicate_userpreferences'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name='userpreference',
+            constraint=models.UniqueConstraint(fields=('user', 'model'), name='userpreference_user_model_unique'),
+        ),
+    ]
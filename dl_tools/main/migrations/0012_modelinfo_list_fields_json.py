@@ -0,0 +1,146 @@
+# Generated by Django 5.2.18 on 2026-10-18 20:16
+
+from django.db import migrations, models
+
+# Text columns that held lists, and the separator process_markdown joined them with
+LIST_FIELDS = {
+    'use_cases': '\n',
+    'practices': '\n',
+    'data_info': '\n',
+    'concerning_practices': '\n',
+    'concerning_practices_urls': ',',
+}
+
+TRIGRAM_COLUMNS = ['use_cases', 'practices']
+
+SEARCH_COLUMNS = 'name, organization, use_cases, practices, data_info, concerning_practices'
+
+OLD_SEARCH_VECTOR_SQL = """
+    setweight(to_tsvector('english', coalesce(name, '')), 'A') ||
+    setweight(to_tsvector('english', coalesce(organization, '')), 'A') ||
+    setweight(to_tsvector('english', coalesce(use_cases, '')), 'B') ||
+    setweight(to_tsvector('english', coalesce(practices, '')), 'B') ||
+    setweight(to_tsvector('english', coalesce(data_info, '')), 'C') ||
+    setweight(to_tsvector('english', coalesce(concerning_practices, '')), 'C')
+"""
+
+# to_tsvector(jsonb) indexes only the string values of the arrays
+SEARCH_VECTOR_SQL = """
+    setweight(to_tsvector('english', coalesce(name, '')), 'A') ||
+    setweight(to_tsvector('english', coalesce(organization, '')), 'A') ||
+    setweight(to_tsvector('english', use_cases), 'B') ||
+    setweight(to_tsvector('english', practices), 'B') ||
+    setweight(to_tsvector('english', data_info), 'C') ||
+    setweight(to_tsvector('english', concerning_practices), 'C')
+"""
+
+FTS_SOURCE_SQL = ', '.join(
+    f"(SELECT group_concat(value, char(10)) FROM json_each(main_modelinfo.{column}))"
+    if column in LIST_FIELDS else column
+    for column in SEARCH_COLUMNS.split(', ')
+)
+
+
+def _create_search_vector(schema_editor, expression):
+    schema_editor.execute(
+        f"ALTER TABLE main_modelinfo ADD COLUMN search_vector tsvector "
+        f"GENERATED ALWAYS AS ({expression}) STORED"
+    )
+    schema_editor.execute(
+        "CREATE INDEX modelinfo_search_vector_idx ON main_modelinfo USING gin (search_vector)"
+    )
+
+
+def _create_trigram_indexes(schema_editor):
+    for column in TRIGRAM_COLUMNS:
+        schema_editor.execute(
+            f'CREATE INDEX IF NOT EXISTS modelinfo_{column}_trgm_idx '
+            f'ON main_modelinfo USING gin (UPPER({column}::text) gin_trgm_ops)'
+        )
+
+
+def drop_dependent_indexes(apps, schema_editor):
+    """The generated search column and trigram indexes depend on the text columns being replaced."""
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute("ALTER TABLE main_modelinfo DROP COLUMN IF EXISTS search_vector")
+    for column in TRIGRAM_COLUMNS:
+        schema_editor.execute(f'DROP INDEX IF EXISTS modelinfo_{column}_trgm_idx')
+
+
+def restore_text_indexes(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        _create_search_vector(schema_editor, OLD_SEARCH_VECTOR_SQL)
+        _create_trigram_indexes(schema_editor)
+    elif vendor == 'sqlite':
+        schema_editor.execute("DELETE FROM main_modelinfo_fts")
+        schema_editor.execute(
+            f"INSERT INTO main_modelinfo_fts (rowid, {SEARCH_COLUMNS}) "
+            f"SELECT id, {SEARCH_COLUMNS} FROM main_modelinfo"
+        )
+
+
+def split_lists(apps, schema_editor):
+    ModelInfo = apps.get_model('main', 'ModelInfo')
+    rows = []
+    for row in ModelInfo.objects.all().iterator(chunk_size=500):
+        for field, separator in LIST_FIELDS.items():
+            text = getattr(row, field) or ''
+            setattr(row, f'{field}_list', [item.strip() for item in text.split(separator) if item.strip()])
+        rows.append(row)
+    ModelInfo.objects.bulk_update(rows, [f'{field}_list' for field in LIST_FIELDS], batch_size=500)
+
+
+def join_lists(apps, schema_editor):
+    ModelInfo = apps.get_model('main', 'ModelInfo')
+    rows = []
+    for row in ModelInfo.objects.all().iterator(chunk_size=500):
+        for field, separator in LIST_FIELDS.items():
+            setattr(row, field, separator.join(getattr(row, f'{field}_list') or []))
+        rows.append(row)
+    ModelInfo.objects.bulk_update(rows, list(LIST_FIELDS), batch_size=500)
+
+
+def create_list_indexes(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        _create_search_vector(schema_editor, SEARCH_VECTOR_SQL)
+        _create_trigram_indexes(schema_editor)
+    elif vendor == 'sqlite':
+        schema_editor.execute("DELETE FROM main_modelinfo_fts")
+        schema_editor.execute(
+            f"INSERT INTO main_modelinfo_fts (rowid, {SEARCH_COLUMNS}) "
+            f"SELECT id, {FTS_SOURCE_SQL} FROM main_modelinfo"
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0011_userpreference_user_model_unique'),
+    ]
+
+    operations = [
+        migrations.RunPython(drop_dependent_indexes, restore_text_indexes),
+        # Nullable while both copies exist, so the old columns can be re-added when migrating backwards
+        *[
+            migrations.AlterField(model_name='modelinfo', name=field, field=models.TextField(blank=True, null=True))
+            for field in ('use_cases', 'practices')
+        ],
+        *[
+            migrations.AddField(
+                model_name='modelinfo',
+                name=f'{field}_list',
+                field=models.JSONField(blank=True, default=list),
+            )
+            for field in LIST_FIELDS
+        ],
+        migrations.RunPython(split_lists, join_lists),
+        *[migrations.RemoveField(model_name='modelinfo', name=field) for field in LIST_FIELDS],
+        *[
+            migrations.RenameField(model_name='modelinfo', old_name=f'{field}_list', new_name=field)
+            for field in LIST_FIELDS
+        ],
+        migrations.RunPython(create_list_indexes, drop_dependent_indexes),
+    ]
@@ -0,0 +1,57 @@
+# Generated by Django 5.2.18 on 2026-10-18 20:21
+
+from urllib.parse import urlsplit
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+MAX_VALUE_LENGTH = 500
+
+
+def url_domain(url):
+    try:
+        host = urlsplit(str(url).strip()).hostname or ''
+    except ValueError:
+        return ''
+    return host[4:] if host.startswith('www.') else host
+
+
+def populate_terms(apps, schema_editor):
+    """Index the list fields of existing rows; main.terms keeps them current afterwards."""
+    ModelInfo = apps.get_model('main', 'ModelInfo')
+    ModelInfoTerm = apps.get_model('main', 'ModelInfoTerm')
+    terms = []
+    rows = ModelInfo.objects.values('id', 'use_cases', 'practices', 'concerning_practices_urls')
+    for row in rows.iterator(chunk_size=500):
+        values = set()
+        for kind, field in (('use_case', 'use_cases'), ('practice', 'practices')):
+            values.update((kind, str(value).strip()[:MAX_VALUE_LENGTH]) for value in row[field] or ())
+        values.update(('domain', url_domain(url)[:MAX_VALUE_LENGTH]) for url in row['concerning_practices_urls'] or ())
+        terms.extend(
+            ModelInfoTerm(model_id=row['id'], kind=kind, value=value) for kind, value in sorted(values) if value
+        )
+    ModelInfoTerm.objects.bulk_create(terms, batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0012_modelinfo_list_fields_json'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ModelInfoTerm',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('use_case', 'Use case'), ('practice', 'Practice'), ('domain', 'Domain')], max_length=10)),
+                ('value', models.CharField(max_length=500)),
+                ('model', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='terms', to='main.modelinfo')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['kind', 'value'], name='modelinfoterm_kind_value_idx')],
+                'constraints': [models.UniqueConstraint(fields=('model', 'kind', 'value'), name='modelinfoterm_unique')],
+            },
+        ),
+        migrations.RunPython(populate_terms, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 5.2.18 on 2026-10-18 21:05
+
+from django.db import migrations
+
+# Since use_cases and practices are filtered through ModelInfoTerm rows, their
+# trigram indexes on main_modelinfo are never used. The substring lookups run
+# against main_modelinfoterm.value instead, so that is what gets indexed, on
+# the UPPER(value::text) expression Django's icontains lookup compares against.
+UNUSED_TRIGRAM_COLUMNS = ['use_cases', 'practices']
+
+
+def create_term_trigram_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for column in UNUSED_TRIGRAM_COLUMNS:
+        schema_editor.execute(f'DROP INDEX IF EXISTS modelinfo_{column}_trgm_idx')
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    schema_editor.execute(
+        'CREATE INDEX IF NOT EXISTS modelinfoterm_value_trgm_idx '
+        'ON main_modelinfoterm USING gin (UPPER(value::text) gin_trgm_ops)'
+    )
+
+
+def drop_term_trigram_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('DROP INDEX IF EXISTS modelinfoterm_value_trgm_idx')
+    for column in UNUSED_TRIGRAM_COLUMNS:
+        schema_editor.execute(
+            f'CREATE INDEX IF NOT EXISTS modelinfo_{column}_trgm_idx '
+            f'ON main_modelinfo USING gin (UPPER({column}::text) gin_trgm_ops)'
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0013_modelinfoterm'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_term_trigram_index, drop_term_trigram_index),
+    ]
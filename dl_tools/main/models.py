@@ -1,17 +1,25 @@
 from django.db import models
 from django.contrib.auth.models import User
-from django.utils.html import format_html
+from django.utils.html import format_html, format_html_join
 
 
 class ModelInfo(models.Model):
-    name = models.CharField(max_length=255)
+    name = models.CharField(max_length=255, unique=True)
     organization = models.CharField(max_length=255)
-    use_cases = models.TextField()
-    practices = models.TextField()
-    data_info = models.TextField(blank=True, null=True)
-    concerning_practices = models.TextField(blank=True, null=True)
-    concerning_practices_urls = models.TextField(blank=True, null=True)
+    # List fields are stored as JSON arrays of strings, in the order of the source file
+    use_cases = models.JSONField(default=list, blank=True)
+    practices = models.JSONField(default=list, blank=True)
+    data_info = models.JSONField(default=list, blank=True)
+    concerning_practices = models.JSONField(default=list, blank=True)
+    concerning_practices_urls = models.JSONField(default=list, blank=True)
     severity = models.CharField(max_length=10, choices=[('low', 'Low'), ('medium', 'Medium'), ('high', 'High')], blank=True, null=True)
+    content_hash = models.CharField(max_length=64, blank=True, default='')  # SHA-256 of the source file's frontmatter block
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['organization'], name='modelinfo_organization_idx'),
+            models.Index(fields=['severity'], name='modelinfo_severity_idx'),
+        ]
 
     def __str__(self):
         return self.name
@@ -30,17 +38,61 @@ class ModelInfo(models.Model):
     
     colored_severity.short_description = 'Severity'  # Display name in admin
     def formatted_concerning_practices_urls(self):
-        # Check if concerning_practices_urls is not None and has content
         if self.concerning_practices_urls:
-            urls = self.concerning_practices_urls.split(',')
-            links = ''.join([f'<a href="{url.strip()}" target="_blank">{url.strip()}</a><br>' for url in urls if url.strip()])
-            return format_html(links)
+            return format_html_join(
+                '', '<a href="{}" target="_blank">{}</a><br>',
+                ((url, url) for url in self.concerning_practices_urls),
+            )
         return format_html('<span>No URLs provided</span>')  # Fallback if there are no URLs
 
     
     formatted_concerning_practices_urls.short_description = 'Concerning Practices Links'
 
+class ModelInfoTerm(models.Model):
+    """
+    One use case, practice or cited domain of a ModelInfo.
+
+    Mirrors the JSON list fields in an indexed table, so "models with use case X"
+    or "models citing domain Y" is an index lookup. Rows are rebuilt from the
+    lists by main.terms.index_terms whenever a ModelInfo is written.
+    """
+    USE_CASE = 'use_case'
+    PRACTICE = 'practice'
+    DOMAIN = 'domain'
+    KIND_CHOICES = [(USE_CASE, 'Use case'), (PRACTICE, 'Practice'), (DOMAIN, 'Domain')]
+
+    # Longer values are truncated, both when stored and when looked up
+    MAX_VALUE_LENGTH = 500
+
+    model = models.ForeignKey(ModelInfo, on_delete=models.CASCADE, related_name='terms')
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    value = models.CharField(max_length=MAX_VALUE_LENGTH)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['kind', 'value'], name='modelinfoterm_kind_value_idx'),
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=['model', 'kind', 'value'], name='modelinfoterm_unique'),
+        ]
+
+    def __str__(self):
+        return f"{self.get_kind_display()}: {self.value}"
+
+class CatalogVersion(models.Model):
+    """Single-row counter bumped whenever the model catalog changes."""
+    version = models.PositiveBigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Catalog version {self.version}"
+
 class UserPreference(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE)
     model = models.ForeignKey(ModelInfo, on_delete=models.CASCADE)
-    preference = models.TextField()
\ No newline at end of file
+    preference = models.TextField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'model'], name='userpreference_user_model_unique'),
+        ]
\ No newline at end of file
@@ -0,0 +1,15 @@
+# main/pagination.py
+from rest_framework.pagination import CursorPagination
+
+
+class ModelInfoCursorPagination(CursorPagination):
+    """
+    Cursor pagination for the model catalog.
+
+    Pages are keyed on the unique, indexed ``name`` column, so fetching any
+    page costs the same index range scan however large the catalog grows.
+    """
+    ordering = 'name'
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 500
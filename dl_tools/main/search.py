@@ -0,0 +1,134 @@
+# main/search.py
+"""
+Ranked full-text search over ModelInfo text fields.
+
+On PostgreSQL the index is a stored, generated ``tsvector`` column with a GIN
+index, so the database keeps it current on every write. On SQLite (local
+development) it is an FTS5 virtual table whose rows share ids with
+``main_modelinfo``; writers call ``index_models`` / ``unindex_models`` /
+``prune_search_index`` to keep it in sync (single-row saves are handled by
+main.signals). Other backends fall back to unranked substring matching.
+"""
+from django.db import connection
+from django.db.models import Q
+
+from .models import ModelInfo
+
+# Columns covered by the index, most significant first
+SEARCH_COLUMNS = ('name', 'organization', 'use_cases', 'practices', 'data_info', 'concerning_practices')
+
+# JSON list columns are indexed as their items joined by newlines
+LIST_COLUMNS = ('use_cases', 'practices', 'data_info', 'concerning_practices')
+
+
+def _fts_source_sql():
+    """SELECT list matching SEARCH_COLUMNS that reads the indexed text out of main_modelinfo."""
+    sources = []
+    for column in SEARCH_COLUMNS:
+        if column in LIST_COLUMNS:
+            column = f"(SELECT group_concat(value, char(10)) FROM json_each(main_modelinfo.{column}))"
+        sources.append(column)
+    return ', '.join(sources)
+
+FTS_TABLE = 'main_modelinfo_fts'
+
+# Keep IN (...) lists well below SQLite's bound-parameter limit
+CHUNK_SIZE = 500
+
+
+def search_models(query, limit=50):
+    """
+    Return up to ``limit`` (model, rank) pairs matching ``query``, best match first.
+
+    Ranks are only comparable within one backend: ts_rank on PostgreSQL (higher
+    is better) and negated bm25 on SQLite.
+    """
+    terms = query.split()
+    if not terms:
+        return []
+
+    if connection.vendor == 'postgresql':
+        sql = (
+            "SELECT id, ts_rank(search_vector, query) AS rank "
+            "FROM main_modelinfo, websearch_to_tsquery('english', %s) query "
+            "WHERE search_vector @@ query ORDER BY rank DESC, name LIMIT %s"
+        )
+        params = [query, limit]
+    elif connection.vendor == 'sqlite':
+        # Quote every term so user input can't use FTS5 query syntax
+        match = ' '.join('"{}"'.format(term.replace('"', '""')) for term in terms)
+        sql = (
+            f"SELECT rowid, -bm25({FTS_TABLE}, 10.0, 5.0) AS rank FROM {FTS_TABLE} "
+            f"WHERE {FTS_TABLE} MATCH %s ORDER BY rank DESC LIMIT %s"
+        )
+        params = [match, limit]
+    else:
+        condition = Q()
+        for term in terms:
+            term_condition = Q()
+            for column in SEARCH_COLUMNS:
+                term_condition |= Q(**{f'{column}__icontains': term})
+            condition &= term_condition
+        return [(model, 0.0) for model in ModelInfo.objects.filter(condition).order_by('name')[:limit]]
+
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        ranked = cursor.fetchall()
+
+    models = ModelInfo.objects.in_bulk([pk for pk, _ in ranked])
+    return [(models[pk], rank) for pk, rank in ranked if pk in models]
+
+
+def index_models(names):
+    """Refresh the search index entries of the named models (SQLite only)."""
+    if connection.vendor != 'sqlite':
+        return
+    names = list(names)
+    columns = ', '.join(SEARCH_COLUMNS)
+    sources = _fts_source_sql()
+    with connection.cursor() as cursor:
+        for start in range(0, len(names), CHUNK_SIZE):
+            chunk = names[start:start + CHUNK_SIZE]
+            placeholders = ', '.join(['%s'] * len(chunk))
+            cursor.execute(
+                f"DELETE FROM {FTS_TABLE} WHERE rowid IN "
+                f"(SELECT id FROM main_modelinfo WHERE name IN ({placeholders}))",
+                chunk,
+            )
+            cursor.execute(
+                f"INSERT INTO {FTS_TABLE} (rowid, {columns}) "
+                f"SELECT id, {sources} FROM main_modelinfo WHERE name IN ({placeholders})",
+                chunk,
+            )
+
+
+def unindex_models(ids):
+    """Drop the search index entries of deleted models by id (SQLite only)."""
+    if connection.vendor != 'sqlite':
+        return
+    ids = list(ids)
+    with connection.cursor() as cursor:
+        for start in range(0, len(ids), CHUNK_SIZE):
+            chunk = ids[start:start + CHUNK_SIZE]
+            placeholders = ', '.join(['%s'] * len(chunk))
+            cursor.execute(f"DELETE FROM {FTS_TABLE} WHERE rowid IN ({placeholders})", chunk)
+
+
+def prune_search_index():
+    """Drop search index entries whose model no longer exists (SQLite only)."""
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {FTS_TABLE} WHERE rowid NOT IN (SELECT id FROM main_modelinfo)")
+
+
+def rebuild_search_index():
+    """Rebuild the whole search index from main_modelinfo (SQLite only)."""
+    if connection.vendor != 'sqlite':
+        return
+    columns = ', '.join(SEARCH_COLUMNS)
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {FTS_TABLE}")
+        cursor.execute(
+            f"INSERT INTO {FTS_TABLE} (rowid, {columns}) SELECT id, {_fts_source_sql()} FROM main_modelinfo"
+        )
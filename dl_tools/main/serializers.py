@@ -4,9 +4,58 @@ from django.contrib.auth.models import User
 from .models import UserPreference, ModelInfo
 
 class ModelInfoSerializer(serializers.ModelSerializer):
+    use_cases = serializers.ListField(child=serializers.CharField(), required=False)
+    practices = serializers.ListField(child=serializers.CharField(), required=False)
+    data_info = serializers.ListField(child=serializers.CharField(), required=False)
+    concerning_practices = serializers.ListField(child=serializers.CharField(), required=False)
+    concerning_practices_urls = serializers.ListField(child=serializers.URLField(), required=False)
+
     class Meta:
         model = ModelInfo
-        fields = '__all__'
+        # content_hash is ingest bookkeeping for process_markdown, not part of the document
+        exclude = ['content_hash']
+
+# Fields of a ModelInfo document, in the order ModelInfoSerializer emits them
+MODEL_INFO_FIELDS = tuple(
+    field.name for field in ModelInfo._meta.concrete_fields
+    if field.name not in ModelInfoSerializer.Meta.exclude
+)
+
+def parse_sparse_fields(value):
+    """
+    Parse a ``fields=name,organization`` query parameter into a tuple of field names.
+
+    Returns every field when the parameter is empty.
+    """
+    if not value:
+        return MODEL_INFO_FIELDS
+    requested = [field.strip() for field in value.split(',') if field.strip()]
+    unknown = [field for field in requested if field not in MODEL_INFO_FIELDS]
+    if unknown:
+        raise serializers.ValidationError({'fields': f"Unknown field(s): {', '.join(unknown)}"})
+    return tuple(dict.fromkeys(requested))
+
+class ModelInfoValuesSerializer:
+    """
+    Read-only serializer for ModelInfo rows fetched with ``values()``.
+
+    Gives the same output as ModelInfoSerializer without building model
+    instances or running per-field serializer code; every column is already
+    a JSON type. ``fields`` limits the output to a subset of MODEL_INFO_FIELDS.
+    """
+    def __init__(self, rows, fields=MODEL_INFO_FIELDS, many=False):
+        self.rows = rows
+        self.fields = fields
+        self.many = many
+
+    def to_representation(self, row):
+        return {field: row[field] for field in self.fields}
+
+    @property
+    def data(self):
+        if self.many:
+            return [self.to_representation(row) for row in self.rows]
+        return self.to_representation(self.rows)
 
 class UserPreferenceCreateSerializer(serializers.ModelSerializer):
     model_id = serializers.PrimaryKeyRelatedField(queryset=ModelInfo.objects.all(), source='model')
@@ -15,6 +64,42 @@ class UserPreferenceCreateSerializer(serializers.ModelSerializer):
         model = UserPreference
         fields = ['model_id', 'preference']
 
+    def validate(self, attrs):
+        # Moving a preference onto a model the user already rated would break
+        # the (user, model) constraint; report it instead of failing on save.
+        model = attrs.get('model')
+        if self.instance is not None and model is not None and model.pk != self.instance.model_id:
+            if UserPreference.objects.filter(user_id=self.instance.user_id, model=model).exists():
+                raise serializers.ValidationError(
+                    {'model_id': 'A preference for this model already exists.'}
+                )
+        return attrs
+
+class BulkPreferenceItemSerializer(serializers.Serializer):
+    model_id = serializers.IntegerField(min_value=1)
+    preference = serializers.CharField()
+
+class UserPreferenceBulkSerializer(serializers.Serializer):
+    """
+    Validates many (model_id, preference) pairs at once.
+
+    Model ids are checked with a single query rather than one lookup per item.
+    When a model appears more than once, the last entry wins.
+    """
+    MAX_ITEMS = 1000
+
+    preferences = BulkPreferenceItemSerializer(many=True, allow_empty=False, max_length=MAX_ITEMS)
+
+    def validate_preferences(self, items):
+        by_model = {item['model_id']: item['preference'] for item in items}
+        found = set(ModelInfo.objects.filter(pk__in=by_model).values_list('pk', flat=True))
+        missing = sorted(set(by_model) - found)
+        if missing:
+            raise serializers.ValidationError(
+                f"Invalid model_id(s): {', '.join(str(pk) for pk in missing)}"
+            )
+        return [{'model_id': pk, 'preference': text} for pk, text in by_model.items()]
+
 class UserPreferenceSerializer(serializers.ModelSerializer):
     model = ModelInfoSerializer()
 
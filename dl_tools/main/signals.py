@@ -0,0 +1,37 @@
+# main/signals.py
+"""
+Keep the derived catalog state current when a single ModelInfo is written.
+
+Saving a ModelInfo through the ORM (the model API, the admin, a shell)
+refreshes its search index entry and term rows and bumps the catalog
+version, so ETags and cached responses change with it. Once the change
+commits, the snapshot for the new version is written in the background. Bulk writers
+(process_markdown, load_example_data) use bulk_create, which sends no
+signals, and maintain the same state themselves in batches.
+
+Deletes are not handled by a post_delete receiver: any receiver makes
+Django send one signal per deleted row, which would turn the bulk writers'
+deletes into row-by-row work. Code that deletes catalog rows one at a time
+calls ``models_deleted`` instead.
+"""
+from django.db import transaction
+
+from .catalog import bump_catalog_version
+from .search import index_models, unindex_models
+from .snapshot import schedule_snapshot
+from .terms import index_terms
+
+
+def model_info_saved(sender, instance, **kwargs):
+    """post_save receiver for ModelInfo."""
+    index_models([instance.name])
+    index_terms([instance.name])
+    bump_catalog_version()
+    transaction.on_commit(schedule_snapshot)
+
+
+def models_deleted(ids):
+    """Record that the ModelInfo rows with these ids were deleted. Their terms cascade."""
+    unindex_models(ids)
+    bump_catalog_version()
+    transaction.on_commit(schedule_snapshot)
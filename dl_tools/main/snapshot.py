@@ -0,0 +1,296 @@
+# main/snapshot.py
+"""
+Pre-serialized catalog snapshots.
+
+Between syncs the catalog never changes, so process_markdown writes it once
+as compressed JSON: the full catalog plus one document per model, stored
+under a directory named after the catalog version. The snapshot views serve
+those bytes as they are, so requests skip the ORM and the serializers.
+
+Layout under ``CATALOG_SNAPSHOT_ROOT``::
+
+    <version>/catalog.json.gz
+    <version>/catalog.json.br          (only when the brotli package is installed)
+    <version>/models/<pk>.json.gz
+    <version>/models/<pk>.json.br
+    <version>/manifest.json            (see below)
+    <version>/digests.json             (SHA-256 of each model document, by pk)
+
+The catalog version and the rows are read in one transaction, and the
+snapshot is filed under the version that was read. Its manifest records that
+version, the ``updated_at`` of the CatalogVersion row and a SHA-256 of the
+catalog. A snapshot whose manifest doesn't match the database (for instance
+after the database was reset, restarting the counter) is rebuilt rather than
+served.
+
+A new version only compresses the model documents that changed; the files of
+unchanged models are hard-linked from the previous version. Writes caused by
+single-row edits (see main.signals) run in a background thread rather than
+in the request that made the edit.
+"""
+import gzip
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+import threading
+
+from django.conf import settings
+from django.db import connections, transaction
+
+from .models import CatalogVersion, ModelInfo
+from .serializers import MODEL_INFO_FIELDS
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip is always written
+    brotli = None
+
+# Number of catalog versions kept on disk, so clients that were just
+# redirected to the previous version can still fetch it.
+KEEP_VERSIONS = 2
+
+CHUNK_SIZE = 2000
+
+logger = logging.getLogger(__name__)
+
+# Background writer state: the running thread, and whether another write was
+# requested while it ran
+_writer_lock = threading.Lock()
+_writer = {'thread': None, 'pending': False}
+
+
+def snapshot_dir(version):
+    return os.path.join(settings.CATALOG_SNAPSHOT_ROOT, str(version))
+
+
+def snapshot_path(version, model_pk=None, encoding='gzip'):
+    """Return the file holding the catalog (or one model) for a version in the given encoding."""
+    suffix = '.json.br' if encoding == 'br' else '.json.gz'
+    if model_pk is None:
+        return os.path.join(snapshot_dir(version), 'catalog' + suffix)
+    return os.path.join(snapshot_dir(version), 'models', f'{model_pk}{suffix}')
+
+
+class _CompressedWriter:
+    """Writes text to a .gz file and, when brotli is available, a matching .br file."""
+
+    def __init__(self, base_path):
+        self.gzip_file = gzip.open(base_path + '.json.gz', 'wb', compresslevel=9)
+        self.br_file = None
+        if brotli is not None:
+            self.br_file = open(base_path + '.json.br', 'wb')
+            self.br = brotli.Compressor(mode=brotli.MODE_TEXT)
+
+    def write(self, text):
+        data = text.encode('utf-8')
+        self.gzip_file.write(data)
+        if self.br_file:
+            self.br_file.write(self.br.process(data))
+
+    def close(self):
+        self.gzip_file.close()
+        if self.br_file:
+            self.br_file.write(self.br.finish())
+            self.br_file.close()
+
+
+def _dumps(data):
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':'))
+
+
+def _stamp(version, updated_at):
+    """The part of a manifest that identifies the catalog version it was written from."""
+    return {'version': version, 'updated_at': updated_at.isoformat() if updated_at else None}
+
+
+def read_manifest(version):
+    """Return the manifest of a complete snapshot, or None if there is none."""
+    try:
+        with open(os.path.join(snapshot_dir(version), 'manifest.json'), encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return manifest if isinstance(manifest, dict) else None
+
+
+def snapshot_is_current(version, updated_at):
+    """Whether the snapshot on disk was written from this catalog version (as read from CatalogVersion)."""
+    manifest = read_manifest(version)
+    if manifest is None:
+        return False
+    return {key: manifest.get(key) for key in ('version', 'updated_at')} == _stamp(version, updated_at)
+
+
+def _model_suffixes():
+    return ('.json.gz', '.json.br') if brotli is not None else ('.json.gz',)
+
+
+def _previous_snapshot(version):
+    """Return ``(directory, model digests)`` of the newest complete snapshot before ``version``, or ``(None, {})``."""
+    try:
+        entries = os.listdir(settings.CATALOG_SNAPSHOT_ROOT)
+    except FileNotFoundError:
+        return None, {}
+    for previous in sorted((int(entry) for entry in entries if entry.isdigit() and int(entry) < version), reverse=True):
+        directory = snapshot_dir(previous)
+        try:
+            with open(os.path.join(directory, 'digests.json'), encoding='utf-8') as f:
+                return directory, json.load(f)
+        except (OSError, ValueError):
+            continue  # Written before digests were recorded, or being pruned
+    return None, {}
+
+
+def _reuse_model_files(previous_dir, tmp, pk):
+    """Link (or copy) the files of an unchanged model from the previous snapshot. Returns False if any is missing."""
+    sources = [os.path.join(previous_dir, 'models', f'{pk}{suffix}') for suffix in _model_suffixes()]
+    targets = [os.path.join(tmp, 'models', f'{pk}{suffix}') for suffix in _model_suffixes()]
+    try:
+        for source, target in zip(sources, targets):
+            try:
+                os.link(source, target)
+            except OSError:
+                if not os.path.exists(source):
+                    raise
+                shutil.copyfile(source, target)  # File systems without hard links
+    except OSError:
+        for target in targets:
+            if os.path.exists(target):
+                os.remove(target)
+        return False
+    return True
+
+
+def write_snapshot():
+    """
+    Write the snapshot for the current catalog version, unless it is already on disk.
+
+    The version and the rows are read in one transaction, straight from the
+    database. On PostgreSQL the CatalogVersion row stays locked until the rows
+    are read, so a change can't commit in between; writers bump the version in
+    the same transaction as their row changes. Files are written to a
+    temporary directory that is renamed into place, so readers never see a
+    partial snapshot. Model documents that are unchanged since the previous
+    snapshot reuse its files. Returns the snapshot directory.
+    """
+    os.makedirs(settings.CATALOG_SNAPSHOT_ROOT, exist_ok=True)
+    with transaction.atomic():
+        version, updated_at = (
+            CatalogVersion.objects.select_for_update().values_list('version', 'updated_at').first() or (0, None)
+        )
+        target = snapshot_dir(version)
+        if snapshot_is_current(version, updated_at):
+            return target
+        # A directory left over from another database doesn't match; neither do its neighbours
+        stale = os.path.isdir(target)
+
+        previous_dir, previous_digests = (None, {}) if stale else _previous_snapshot(version)
+        digests = {}
+        catalog_digest = hashlib.sha256()
+        tmp = tempfile.mkdtemp(prefix=f'.{version}-', dir=settings.CATALOG_SNAPSHOT_ROOT)
+        try:
+            os.makedirs(os.path.join(tmp, 'models'))
+            catalog = _CompressedWriter(os.path.join(tmp, 'catalog'))
+            catalog.write(f'{{"version":{version},"results":[')
+            count = 0
+            rows = ModelInfo.objects.order_by('name').values(*MODEL_INFO_FIELDS)
+            for row in rows.iterator(chunk_size=CHUNK_SIZE):
+                document = _dumps(row)
+                encoded = document.encode('utf-8')
+                catalog.write((',' if count else '') + document)
+                catalog_digest.update(encoded)
+                pk = str(row['id'])
+                digests[pk] = hashlib.sha256(encoded).hexdigest()
+                if previous_digests.get(pk) != digests[pk] or not _reuse_model_files(previous_dir, tmp, pk):
+                    model_file = _CompressedWriter(os.path.join(tmp, 'models', pk))
+                    model_file.write(document)
+                    model_file.close()
+                count += 1
+            catalog.write(f'],"count":{count}}}')
+            catalog.close()
+            with open(os.path.join(tmp, 'digests.json'), 'w', encoding='utf-8') as f:
+                json.dump(digests, f, separators=(',', ':'))
+            # Written last: a directory without a manifest is never served
+            with open(os.path.join(tmp, 'manifest.json'), 'w', encoding='utf-8') as f:
+                json.dump({**_stamp(version, updated_at), 'digest': catalog_digest.hexdigest()}, f)
+
+            if stale:
+                _discard(target)
+            try:
+                os.rename(tmp, target)
+            except OSError:
+                # Another process finished the same version first
+                if not snapshot_is_current(version, updated_at):
+                    raise
+        finally:
+            shutil.rmtree(tmp, ignore_errors=True)
+
+    prune_snapshots(keep=version, everything_else=stale)
+    return target
+
+
+def _discard(directory):
+    """Move a snapshot directory out of the way, then delete it."""
+    trash = tempfile.mkdtemp(prefix='.discard-', dir=settings.CATALOG_SNAPSHOT_ROOT)
+    try:
+        os.rename(directory, os.path.join(trash, 'snapshot'))
+    except FileNotFoundError:
+        pass
+    shutil.rmtree(trash, ignore_errors=True)
+
+
+def prune_snapshots(keep, everything_else=False):
+    """
+    Delete snapshots older than the last KEEP_VERSIONS versions up to ``keep``,
+    or every version but ``keep`` when ``everything_else`` is set.
+    """
+    try:
+        entries = os.listdir(settings.CATALOG_SNAPSHOT_ROOT)
+    except FileNotFoundError:
+        return
+    for entry in entries:
+        if not entry.isdigit() or int(entry) == keep:
+            continue
+        if everything_else or int(entry) <= keep - KEEP_VERSIONS:
+            _discard(os.path.join(settings.CATALOG_SNAPSHOT_ROOT, entry))
+
+
+def schedule_snapshot():
+    """
+    Write the snapshot for the current catalog version in a background thread.
+
+    Calls made while a write is running are coalesced into one more write
+    once it finishes, which picks up the latest version.
+    """
+    with _writer_lock:
+        _writer['pending'] = True
+        if _writer['thread'] is None:
+            _writer['thread'] = threading.Thread(target=_write_pending_snapshots, name='catalog-snapshot', daemon=True)
+            _writer['thread'].start()
+
+
+def wait_for_snapshot(timeout=None):
+    """Wait for a snapshot write started by schedule_snapshot to finish."""
+    thread = _writer['thread']
+    if thread is not None:
+        thread.join(timeout)
+
+
+def _write_pending_snapshots():
+    try:
+        while True:
+            with _writer_lock:
+                if not _writer['pending']:
+                    _writer['thread'] = None
+                    return
+                _writer['pending'] = False
+            try:
+                write_snapshot()
+            except Exception:
+                # The snapshot view writes it on demand instead
+                logger.exception('Writing the catalog snapshot failed')
+    finally:
+        connections.close_all()
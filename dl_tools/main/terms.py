@@ -0,0 +1,93 @@
+# main/terms.py
+"""
+Indexed lookups on ModelInfo list fields.
+
+Use cases, practices and the domains of concerning-practice URLs are copied
+from the JSON list columns into ModelInfoTerm rows, which carry a
+(kind, value) index. Writers call ``index_terms`` for the rows they touched
+or ``rebuild_terms`` after a full sync. Deleting a ModelInfo cascades to
+its terms.
+"""
+from urllib.parse import urlsplit
+
+from django.db import connection
+
+from .models import ModelInfo, ModelInfoTerm
+
+# Keep IN (...) lists well below SQLite's bound-parameter limit
+CHUNK_SIZE = 500
+
+
+def url_domain(url):
+    """Return the lower-cased host of a URL without a leading 'www.', or '' if it has none."""
+    try:
+        host = urlsplit(str(url).strip()).hostname or ''
+    except ValueError:
+        return ''
+    return host[4:] if host.startswith('www.') else host
+
+
+def normalize_term(kind, value):
+    """Normalize a value the way it is stored in, and looked up from, ModelInfoTerm."""
+    value = url_domain(value) if kind == ModelInfoTerm.DOMAIN else str(value).strip()
+    return value[:ModelInfoTerm.MAX_VALUE_LENGTH]
+
+
+def terms_for(row):
+    """Return the (kind, value) pairs for a ModelInfo ``values()`` row."""
+    sources = (
+        (ModelInfoTerm.USE_CASE, row['use_cases']),
+        (ModelInfoTerm.PRACTICE, row['practices']),
+        (ModelInfoTerm.DOMAIN, row['concerning_practices_urls']),
+    )
+    terms = set()
+    for kind, values in sources:
+        for value in values or ():
+            value = normalize_term(kind, value)
+            if value:
+                terms.add((kind, value))
+    return terms
+
+
+def _insert_terms(rows):
+    """Insert the term rows for a batch of ModelInfo ``values()`` rows."""
+    terms = [(row['id'], kind, value) for row in rows for kind, value in sorted(terms_for(row))]
+    if connection.vendor == 'sqlite':
+        # sqlite3 runs executemany in C, which is several times faster than
+        # building model instances; psycopg2 would send one statement per row.
+        with connection.cursor() as cursor:
+            cursor.executemany(
+                f"INSERT INTO {ModelInfoTerm._meta.db_table} (model_id, kind, value) VALUES (%s, %s, %s)",
+                terms,
+            )
+    else:
+        ModelInfoTerm.objects.bulk_create(
+            [ModelInfoTerm(model_id=model_id, kind=kind, value=value) for model_id, kind, value in terms],
+            batch_size=CHUNK_SIZE,
+        )
+
+
+def index_terms(names):
+    """Rebuild the term rows of the named models."""
+    names = list(names)
+    for start in range(0, len(names), CHUNK_SIZE):
+        chunk = names[start:start + CHUNK_SIZE]
+        rows = ModelInfo.objects.filter(name__in=chunk).values(
+            'id', 'use_cases', 'practices', 'concerning_practices_urls'
+        )
+        ModelInfoTerm.objects.filter(model__name__in=chunk).delete()
+        _insert_terms(rows)
+
+
+def rebuild_terms():
+    """Rebuild every term row from the ModelInfo table."""
+    ModelInfoTerm.objects.all().delete()
+    rows = ModelInfo.objects.values('id', 'use_cases', 'practices', 'concerning_practices_urls')
+    batch = []
+    for row in rows.iterator(chunk_size=CHUNK_SIZE):
+        batch.append(row)
+        if len(batch) >= CHUNK_SIZE:
+            _insert_terms(batch)
+            batch = []
+    if batch:
+        _insert_terms(batch)
@@ -1,3 +1,990 @@
-from django.test import TestCase
+import base64
+import datetime
+import gzip
+import io
+import json
+import logging
+import os
+import shutil
+import tempfile
+from unittest import mock
 
-# Create your tests here.
+from django.conf import settings
+from django.contrib import admin
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection, transaction
+from django.test import TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from .filters import ModelInfoFilter
+from .metrics import reset_metrics
+from .management.commands.load_example_data import SYNTHETIC_MODEL_PREFIX, SYNTHETIC_USER_PREFIX
+from .management.commands.process_markdown import Command as ProcessMarkdownCommand
+from .catalog import bump_catalog_version
+from .models import CatalogVersion, ModelInfo, ModelInfoTerm, UserPreference
+from .search import search_models
+from .serializers import MODEL_INFO_FIELDS
+from .snapshot import read_manifest, snapshot_dir, snapshot_path, wait_for_snapshot, write_snapshot
+from .watcher import MarkdownWatcher
+import md_data_linter
+from md_data_linter import MarkdownDocument, MdDataLint, ValidationResult, console
+
+
+def setUpModule():
+    # Keep the per-request log lines out of the test output
+    logging.getLogger('main.requests').setLevel(logging.WARNING)
+
+
+def tearDownModule():
+    logging.getLogger('main.requests').setLevel(logging.NOTSET)
+
+
+class TempDirectoryMixin:
+    """Gives each test an empty ``self.directory`` and silences the linter's console output."""
+
+    def setUp(self):
+        super().setUp()
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        console.quiet = True
+        self.addCleanup(setattr, console, 'quiet', False)
+
+
+class PreferenceQueryCountTests(TestCase):
+    """Preference and profile endpoints use a fixed number of queries."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='alice', password='secret')
+        self.client.force_login(self.user)
+
+    def add_preferences(self, count):
+        start = ModelInfo.objects.count()
+        models = ModelInfo.objects.bulk_create(
+            ModelInfo(name=f'model-{start + i}', organization='Org')
+            for i in range(count)
+        )
+        UserPreference.objects.bulk_create(
+            UserPreference(user=self.user, model=model, preference='like') for model in models
+        )
+
+    def count_queries(self, url):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, HTTP_HOST='localhost')
+        self.assertEqual(response.status_code, 200)
+        return len(queries), response.json()
+
+    def assertConstantQueries(self, url, extract):
+        self.add_preferences(1)
+        baseline, data = self.count_queries(url)
+        self.assertEqual(len(extract(data)), 1)
+
+        self.add_preferences(25)
+        queries, data = self.count_queries(url)
+        self.assertEqual(len(extract(data)), 26)
+        self.assertEqual(queries, baseline)
+
+    def test_profile(self):
+        self.assertConstantQueries('/api/profile/', lambda data: data['preferences'])
+
+    def test_preference_list(self):
+        self.assertConstantQueries('/api/preferences/list/', lambda data: data)
+
+    def test_basic_authentication(self):
+        self.client.logout()
+        credentials = base64.b64encode(b'alice:secret').decode()
+        for url in ('/api/profile/', '/api/preferences/list/'):
+            with self.subTest(url=url):
+                response = self.client.get(url, HTTP_HOST='localhost', HTTP_AUTHORIZATION=f'Basic {credentials}')
+                self.assertEqual(response.status_code, 200)
+
+                wrong = base64.b64encode(b'alice:wrong').decode()
+                response = self.client.get(url, HTTP_HOST='localhost', HTTP_AUTHORIZATION=f'Basic {wrong}')
+                self.assertEqual(response.status_code, 403)
+                self.assertEqual(response.json(), {'detail': 'Invalid username/password.'})
+
+                self.assertEqual(self.client.get(url, HTTP_HOST='localhost').status_code, 403)
+
+
+class PreferenceApiTests(TestCase):
+    """Preferences stay one per (user, model) whichever endpoint writes them."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='alice', password='secret')
+        self.client.force_login(self.user)
+        self.first, self.second = ModelInfo.objects.bulk_create(
+            [ModelInfo(name='first', organization='Org'), ModelInfo(name='second', organization='Org')]
+        )
+
+    def send(self, method, url, data):
+        return getattr(self.client, method)(url, data, content_type='application/json', HTTP_HOST='localhost')
+
+    def preferences(self):
+        return dict(UserPreference.objects.filter(user=self.user).values_list('model__name', 'preference'))
+
+    def test_bulk(self):
+        UserPreference.objects.create(user=self.user, model=self.first, preference='like')
+        response = self.send('post', '/api/preferences/bulk/', {'preferences': [
+            {'model_id': self.first.pk, 'preference': 'dislike'},
+            {'model_id': self.second.pk, 'preference': 'like'},
+            {'model_id': self.second.pk, 'preference': 'neutral'},
+        ]})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()), 2)
+        self.assertEqual(self.preferences(), {'first': 'dislike', 'second': 'neutral'})
+
+    def test_bulk_unknown_model(self):
+        response = self.send('post', '/api/preferences/bulk/', {'preferences': [
+            {'model_id': self.first.pk, 'preference': 'like'},
+            {'model_id': self.second.pk + 100, 'preference': 'like'},
+        ]})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(self.preferences(), {})
+
+    def test_update_onto_existing_model(self):
+        preference = UserPreference.objects.create(user=self.user, model=self.first, preference='like')
+        UserPreference.objects.create(user=self.user, model=self.second, preference='dislike')
+        url = f'/api/preferences/{preference.pk}/'
+
+        response = self.send('put', url, {'model_id': self.second.pk, 'preference': 'like'})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('model_id', response.json())
+        self.assertEqual(self.preferences(), {'first': 'like', 'second': 'dislike'})
+
+        response = self.send('put', url, {'model_id': self.first.pk, 'preference': 'neutral'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.preferences(), {'first': 'neutral', 'second': 'dislike'})
+
+
+class QueryPlanTests(TestCase):
+    """Ingest and filter lookups are answered from indexes, not table scans."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='bob', password='secret')
+        models = ModelInfo.objects.bulk_create(
+            ModelInfo(name=f'model-{i}', organization=f'Org {i % 5}', severity=('low', 'high')[i % 2])
+            for i in range(20)
+        )
+        UserPreference.objects.bulk_create(
+            UserPreference(user=cls.user, model=model, preference='like') for model in models[:5]
+        )
+
+    def explain(self, queryset):
+        if connection.vendor == 'postgresql':
+            # Tables this small are cheaper to scan; make the planner show the index it would use
+            with connection.cursor() as cursor:
+                cursor.execute('SET LOCAL enable_seqscan = off')
+        return queryset.explain()
+
+    def assertIndexScan(self, queryset, table):
+        plan = self.explain(queryset)
+        if connection.vendor == 'sqlite':
+            self.assertRegex(plan, rf'SEARCH {table} USING (COVERING )?INDEX', plan)
+            self.assertNotIn('USE TEMP B-TREE', plan)
+        elif connection.vendor == 'postgresql':
+            self.assertNotIn(f'Seq Scan on {table}', plan)
+            self.assertIn('Index', plan)
+        else:
+            self.skipTest(f'No query plan assertions for {connection.vendor}')
+
+    def test_ingest_lookup_by_name(self):
+        self.assertIndexScan(ModelInfo.objects.filter(name='model-3'), 'main_modelinfo')
+        self.assertIndexScan(
+            ModelInfo.objects.filter(name__in=['model-1', 'model-2']).values_list('name', 'content_hash'),
+            'main_modelinfo',
+        )
+
+    def test_cursor_page_walks_name_index(self):
+        queryset = ModelInfo.objects.filter(name__gt='model-1').order_by('name')[:51]
+        self.assertIndexScan(queryset, 'main_modelinfo')
+
+    def test_filter_by_severity_and_organization(self):
+        self.assertIndexScan(ModelInfo.objects.filter(severity__in=['high', 'medium']), 'main_modelinfo')
+        self.assertIndexScan(ModelInfo.objects.filter(organization='Org 1'), 'main_modelinfo')
+
+    def test_filter_by_term(self):
+        queryset = ModelInfoTerm.objects.filter(kind=ModelInfoTerm.DOMAIN, value='example.com')
+        self.assertIndexScan(queryset, 'main_modelinfoterm')
+
+    def test_api_term_filter(self):
+        request = Request(APIRequestFactory().get('/api/models/', {'domain': 'example.com'}))
+        queryset = ModelInfoFilter().filter_queryset(request, ModelInfo.objects.all(), None)
+        plan = self.explain(queryset)
+        if connection.vendor == 'sqlite':
+            self.assertNotRegex(plan, r'SCAN main_modelinfo\b')
+        self.assertIn('modelinfoterm_kind_value_idx', plan)
+
+    def test_list_substring_filters(self):
+        # Substring filters on list items probe a trigram index on the term values
+        if connection.vendor != 'postgresql':
+            self.skipTest('Trigram indexes are PostgreSQL-only')
+        for params in ({'use_cases': 'chat'}, {'practices': 'logs'}, {'q': 'chat'}):
+            request = Request(APIRequestFactory().get('/api/models/', params))
+            queryset = ModelInfoFilter().filter_queryset(request, ModelInfo.objects.all(), None)
+            plan = self.explain(queryset)
+            self.assertIn('modelinfoterm_value_trgm_idx', plan, params)
+            self.assertNotIn('Seq Scan on main_modelinfoterm', plan, params)
+
+    def test_preferences_by_user(self):
+        self.assertIndexScan(UserPreference.objects.filter(user=self.user), 'main_userpreference')
+        model = ModelInfo.objects.get(name='model-0')
+        self.assertIndexScan(UserPreference.objects.filter(user=self.user, model=model), 'main_userpreference')
+
+
+class ModelInfoFilterTests(TestCase):
+    """List fields are matched on their items, not on their JSON encoding; the list API pages and filters."""
+
+    @classmethod
+    def setUpTestData(cls):
+        ModelInfo.objects.create(
+            name='assistant', organization='Org', use_cases=['Chat'], severity='high',
+            practices=['Follows OpenAI’s privacy policy', 'Logs prompts'],
+        )
+        ModelInfo.objects.create(
+            name='coder', organization='Org', use_cases=['Code review'], practices=[], severity='low',
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def names(self, params):
+        request = Request(APIRequestFactory().get('/api/models/', params))
+        queryset = ModelInfoFilter().filter_queryset(request, ModelInfo.objects.all(), None)
+        return sorted(queryset.values_list('name', flat=True))
+
+    def get(self, url, params=None):
+        response = self.client.get(url, params, HTTP_HOST='localhost', HTTP_ACCEPT='application/json')
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def api_names(self, params):
+        return [row['name'] for row in self.get('/api/models/', params)['results']]
+
+    def test_non_ascii_item(self):
+        self.assertEqual(self.names({'practices': 'OpenAI’s privacy'}), ['assistant'])
+        self.assertEqual(self.names({'q': 'openai’s'}), ['assistant'])
+        self.assertEqual(self.names({'practices': 'u2019'}), [])
+        self.assertEqual(self.names({'q': '", "'}), [])
+
+    def test_substring_of_item(self):
+        self.assertEqual(self.names({'use_cases': 'review'}), ['coder'])
+        self.assertEqual(self.names({'q': 'org'}), ['assistant', 'coder'])
+        self.assertEqual(self.names({'q': 'prompts'}), ['assistant'])
+
+    def test_api_cursor_pagination(self):
+        ModelInfo.objects.bulk_create(ModelInfo(name=f'model-{i:03}', organization='Org') for i in range(510))
+        expected = sorted(ModelInfo.objects.values_list('name', flat=True))
+
+        page = self.get('/api/models/', {'page_size': 1000})
+        self.assertEqual(len(page['results']), 500)
+        self.assertIsNotNone(page['next'])
+
+        names = []
+        page = self.get('/api/models/', {'page_size': 200})
+        while True:
+            names.extend(row['name'] for row in page['results'])
+            if page['next'] is None:
+                break
+            page = self.get(page['next'])
+        self.assertEqual(names, expected)
+
+    def test_api_severity(self):
+        self.assertEqual(self.api_names({'severity': 'high'}), ['assistant'])
+        self.assertEqual(self.api_names({'severity': 'HIGH, low'}), ['assistant', 'coder'])
+        self.assertEqual(self.api_names({'severity': 'medium,'}), [])
+
+    def test_api_q(self):
+        self.assertEqual(self.api_names({'q': 'review'}), ['coder'])
+        self.assertEqual(self.api_names({'q': 'org'}), ['assistant', 'coder'])
+        self.assertEqual(self.api_names({'q': 'org', 'severity': 'low'}), ['coder'])
+        self.assertEqual(self.api_names({'q': 'nothing'}), [])
+
+
+class SearchApiTests(TestCase):
+    """/api/models/search/ ranks matches, accepts any input and follows writes."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.chat = ModelInfo.objects.create(name='chat', organization='Org', use_cases=['Conversation'])
+        cls.helper = ModelInfo.objects.create(name='helper', organization='Org', use_cases=['Chat', 'Code review'])
+        ModelInfo.objects.create(name='painter', organization='Studio', use_cases=['Images'])
+
+    def search(self, q, **params):
+        # Writes in a TestCase never commit, so drop responses cached under the old version
+        cache.clear()
+        response = self.client.get(
+            '/api/models/search/', {'q': q, **params}, HTTP_HOST='localhost', HTTP_ACCEPT='application/json',
+        )
+        self.assertEqual(response.status_code, 200, q)
+        return response.json()
+
+    def names(self, q):
+        return [row['name'] for row in self.search(q)['results']]
+
+    def test_ranking(self):
+        # A match in the name outranks one in a list field
+        data = self.search('chat')
+        self.assertEqual([row['name'] for row in data['results']], ['chat', 'helper'])
+        self.assertEqual(data['count'], 2)
+        self.assertGreater(data['results'][0]['rank'], data['results'][1]['rank'])
+        self.assertEqual(self.names('chat review'), ['helper'])
+        self.assertEqual([row['name'] for row in self.search('org', limit=1)['results']], ['chat'])
+
+    def test_query_syntax_is_literal(self):
+        for q in ('"', '"chat', '*', 'chat*', '-', '-chat', 'chat -review', 'NEAR(chat', 'chat OR', '^', ':'):
+            self.search(q)
+
+    def test_empty_query(self):
+        for q in ('', '   '):
+            self.assertEqual(self.search(q), {'query': '', 'count': 0, 'results': []})
+
+    def test_index_follows_writes(self):
+        response = self.client.patch(
+            f'/api/models/{self.helper.pk}/', {'use_cases': ['Translation']},
+            content_type='application/json', HTTP_HOST='localhost',
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.names('chat'), ['chat'])
+        self.assertEqual(self.names('translation'), ['helper'])
+
+        response = self.client.delete(f'/api/models/{self.chat.pk}/', HTTP_HOST='localhost')
+        self.assertEqual(response.status_code, 204)
+        self.assertEqual(self.names('chat'), [])
+        self.assertEqual(self.names('org'), ['helper'])
+
+
+class SparseFieldsTests(TestCase):
+    """?fields= limits the keys of every catalog read."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.model = ModelInfo.objects.create(name='gpt', organization='Org', use_cases=['Chat'], severity='low')
+
+    def setUp(self):
+        cache.clear()
+
+    def get(self, url, fields):
+        return self.client.get(url, {'fields': fields}, HTTP_HOST='localhost', HTTP_ACCEPT='application/json')
+
+    def test_projected_keys(self):
+        response = self.get('/api/models/', 'name,organization')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['results'], [{'name': 'gpt', 'organization': 'Org'}])
+
+        response = self.get(f'/api/models/{self.model.pk}/', ' severity , name,severity')
+        self.assertEqual(response.json(), {'severity': 'low', 'name': 'gpt'})
+
+        response = self.client.get(
+            '/api/models/search/', {'q': 'gpt', 'fields': 'name'}, HTTP_HOST='localhost', HTTP_ACCEPT='application/json',
+        )
+        self.assertEqual(set(response.json()['results'][0]), {'name', 'rank'})
+
+    def test_id(self):
+        # id is only returned when asked for, and every field is returned without the parameter
+        self.assertNotIn('id', self.get('/api/models/', 'name').json()['results'][0])
+        self.assertEqual(self.get('/api/models/', 'id').json()['results'], [{'id': self.model.pk}])
+        full = self.get(f'/api/models/{self.model.pk}/', '').json()
+        self.assertEqual(full['id'], self.model.pk)
+        self.assertEqual(set(full), set(MODEL_INFO_FIELDS))
+
+    def test_unknown_field(self):
+        for url in ('/api/models/', f'/api/models/{self.model.pk}/', '/api/models/search/'):
+            response = self.get(url, 'name,secret')
+            self.assertEqual(response.status_code, 400, url)
+            self.assertIn('secret', response.json()['fields'])
+
+
+class RequestMetricsTests(TestCase):
+    """The metrics middleware reports what each request did."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='alice', password='secret')
+        self.client.force_login(self.user)
+        reset_metrics()
+
+    def test_server_timing_and_log(self):
+        with self.assertLogs('main.requests', 'INFO') as logs, CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/preferences/list/', HTTP_HOST='localhost')
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(f'desc="{len(queries)} queries"', response['Server-Timing'])
+
+        entry = json.loads(logs.records[-1].getMessage())
+        self.assertEqual(entry['view'], 'preference-list')
+        self.assertEqual(entry['queries'], len(queries))
+        self.assertEqual(entry['bytes'], len(response.content))
+
+    def test_metrics_endpoint(self):
+        self.client.get('/api/preferences/list/', HTTP_HOST='localhost')
+        response = self.client.get('/metrics', HTTP_HOST='localhost')
+        self.assertEqual(response.status_code, 200)
+        body = response.content.decode()
+        self.assertIn('dl_tools_http_requests_total{view="preference-list",method="GET",status="200"} 1\n', body)
+        self.assertIn('# TYPE dl_tools_catalog_cache_hits_total counter', body)
+
+    def test_metrics_endpoint_is_local_only(self):
+        response = self.client.get('/metrics', HTTP_HOST='localhost', REMOTE_ADDR='10.0.0.1')
+        self.assertEqual(response.status_code, 404)
+
+
+class ContentHashTests(TempDirectoryMixin, TestCase):
+    """content_hash is ingest bookkeeping and never part of a published document."""
+
+    def test_not_writable_or_published(self):
+        response = self.client.post(
+            '/api/models/', {'name': 'gpt', 'organization': 'Org', 'content_hash': 'f' * 64},
+            content_type='application/json', HTTP_HOST='localhost',
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertNotIn('content_hash', response.json())
+        model = ModelInfo.objects.get(name='gpt')
+        self.assertEqual(model.content_hash, '')
+
+        response = self.client.get(f'/api/models/{model.pk}/', HTTP_HOST='localhost', HTTP_ACCEPT='application/json')
+        self.assertNotIn('content_hash', response.json())
+        response = self.client.get('/api/models/', {'fields': 'name,content_hash'}, HTTP_HOST='localhost')
+        self.assertEqual(response.status_code, 400)
+
+        with self.settings(CATALOG_SNAPSHOT_ROOT=self.directory):
+            write_snapshot()
+            with gzip.open(snapshot_path(CatalogVersion.objects.get().version, model.pk), 'rt', encoding='utf-8') as f:
+                self.assertNotIn('content_hash', json.load(f))
+
+
+class SnapshotTests(TempDirectoryMixin, TestCase):
+    """A new snapshot version only compresses the documents that changed."""
+
+    def setUp(self):
+        super().setUp()
+        self.enterContext(self.settings(CATALOG_SNAPSHOT_ROOT=self.directory))
+        self.first, self.second = ModelInfo.objects.bulk_create(
+            [ModelInfo(name='first', organization='Org'), ModelInfo(name='second', organization='Org')]
+        )
+
+    def read(self, version, pk=None):
+        with gzip.open(snapshot_path(version, pk), 'rt', encoding='utf-8') as f:
+            return json.load(f)
+
+    def snapshot(self):
+        bump_catalog_version()
+        return write_snapshot()
+
+    def test_unchanged_models_are_linked(self):
+        self.assertEqual(self.snapshot(), snapshot_dir(1))
+        ModelInfo.objects.filter(pk=self.second.pk).update(organization='Other')
+        self.assertEqual(self.snapshot(), snapshot_dir(2))
+
+        self.assertTrue(os.path.samefile(snapshot_path(1, self.first.pk), snapshot_path(2, self.first.pk)))
+        self.assertFalse(os.path.samefile(snapshot_path(1, self.second.pk), snapshot_path(2, self.second.pk)))
+        self.assertEqual(self.read(2, self.second.pk)['organization'], 'Other')
+        self.assertEqual([row['organization'] for row in self.read(2)['results']], ['Org', 'Other'])
+
+        # Older versions are pruned without affecting the files linked from them
+        ModelInfo.objects.filter(pk=self.second.pk).delete()
+        self.assertEqual(self.snapshot(), snapshot_dir(3))
+        self.assertFalse(os.path.exists(snapshot_path(1)))
+        self.assertEqual(self.read(3, self.first.pk)['name'], 'first')
+        self.assertEqual(self.read(3)['count'], 1)
+        self.assertFalse(os.path.exists(snapshot_path(3, self.second.pk)))
+
+    def test_manifest_records_version_and_digest(self):
+        self.snapshot()
+        manifest = read_manifest(1)
+        self.assertEqual(manifest['version'], 1)
+        self.assertEqual(len(manifest['digest']), 64)
+        # An unchanged catalog is not written again
+        mtime = os.stat(snapshot_path(1)).st_mtime_ns
+        self.assertEqual(write_snapshot(), snapshot_dir(1))
+        self.assertEqual(os.stat(snapshot_path(1)).st_mtime_ns, mtime)
+
+    def test_leftover_snapshot_is_rebuilt(self):
+        self.snapshot()
+        self.snapshot()
+
+        # A database reset restarts the counter while the old files stay on disk
+        CatalogVersion.objects.all().delete()
+        ModelInfo.objects.filter(pk=self.first.pk).update(organization='Reset')
+        cache.clear()
+        self.assertEqual(self.snapshot(), snapshot_dir(1))
+        self.assertEqual(self.read(1, self.first.pk)['organization'], 'Reset')
+        self.assertFalse(os.path.exists(snapshot_path(2)))
+
+        CatalogVersion.objects.all().delete()
+        ModelInfo.objects.filter(pk=self.first.pk).update(organization='Served')
+        bump_catalog_version()
+        cache.clear()
+        response = self.client.get(f'/api/catalog/1/models/{self.first.pk}/', HTTP_HOST='localhost')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['organization'], 'Served')
+        self.assertEqual(self.client.get('/api/catalog/2/', HTTP_HOST='localhost').status_code, 404)
+
+
+class CatalogInvalidationTests(TempDirectoryMixin, TransactionTestCase):
+    """Writes outside process_markdown change the ETag and bypass cached responses."""
+
+    # Commits for real, so the on-commit cache invalidation and snapshot write run
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.enterContext(self.settings(CATALOG_SNAPSHOT_ROOT=self.directory))
+        self.addCleanup(wait_for_snapshot)
+        self.model = ModelInfo.objects.create(name='gpt', organization='Org', use_cases=['Chat'])
+        # The in-memory test database locks whole tables, so let the snapshot
+        # writer finish reading before the test writes again
+        wait_for_snapshot()
+
+    def get(self, url, **headers):
+        return self.client.get(url, HTTP_HOST='localhost', HTTP_ACCEPT='application/json', **headers)
+
+    def test_save_outside_api(self):
+        first = self.get('/api/models/')
+        self.assertEqual(self.get('/api/models/')['X-Cache'], 'HIT')
+
+        self.model.use_cases = ['Translation']
+        self.model.save()
+
+        response = self.get('/api/models/', HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], first['ETag'])
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.json()['results'][0]['use_cases'], ['Translation'])
+        self.assertEqual(
+            list(ModelInfoTerm.objects.filter(kind=ModelInfoTerm.USE_CASE).values_list('value', flat=True)),
+            ['Translation'],
+        )
+        self.assertEqual([model.name for model, _ in search_models('translation')], ['gpt'])
+
+        # The snapshot for the new version is written outside the request
+        wait_for_snapshot()
+        version = response['ETag'].strip('"').split('-')[1]
+        with gzip.open(snapshot_path(version, self.model.pk), 'rt', encoding='utf-8') as f:
+            self.assertEqual(json.load(f)['use_cases'], ['Translation'])
+
+    def test_api_write(self):
+        url = f'/api/models/{self.model.pk}/'
+        first = self.get(url)
+        self.assertEqual(first['X-Cache'], 'MISS')
+        self.assertEqual(self.get(url, HTTP_IF_NONE_MATCH=first['ETag']).status_code, 304)
+        self.assertEqual(self.get(url)['X-Cache'], 'HIT')
+
+        response = self.client.patch(
+            url, {'organization': 'Other'}, content_type='application/json', HTTP_HOST='localhost',
+        )
+        self.assertEqual(response.status_code, 200)
+
+        response = self.get(url, HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.json()['organization'], 'Other')
+        self.assertEqual(self.get(url, HTTP_IF_NONE_MATCH=response['ETag']).status_code, 304)
+
+    def test_admin_delete(self):
+        etag = self.get('/api/models/')['ETag']
+        model_admin = admin.site._registry[ModelInfo]
+        model_admin.delete_queryset(None, ModelInfo.objects.filter(pk=self.model.pk))
+
+        response = self.get('/api/models/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['results'], [])
+        self.assertEqual(search_models('gpt'), [])
+
+
+    def test_etag_per_representation(self):
+        detail = f'/api/models/{self.model.pk}/'
+        etags = {
+            self.get('/api/models/')['ETag'],
+            self.get('/api/models/', data={'fields': 'name'})['ETag'],
+            self.get(detail)['ETag'],
+            self.client.get(detail, {'format': 'api'}, HTTP_HOST='localhost')['ETag'],
+        }
+        self.assertEqual(len(etags), 4)
+
+        # A missing pk is a 404 whatever the request's conditions say
+        etag = self.get('/api/models/')['ETag']
+        last_modified = self.get('/api/models/')['Last-Modified']
+        response = self.get('/api/models/999999/', HTTP_IF_NONE_MATCH=etag, HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, 404)
+        self.assertNotIn('ETag', response)
+        self.assertEqual(self.get('/api/models/x/', HTTP_IF_NONE_MATCH=etag).status_code, 404)
+
+
+class SyntheticDataTests(TestCase):
+    """load_example_data generates reproducible synthetic data that the API can filter and search."""
+
+    def setUp(self):
+        # Every load hashes the synthetic users' password once
+        self.enterContext(self.settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher']))
+
+    def load(self, seed=0, **options):
+        call_command(
+            'load_example_data', models=30, users=4, prefs_per_user=6, seed=seed, batch_size=7,
+            stdout=io.StringIO(), **options,
+        )
+        models = list(ModelInfo.objects.filter(name__startswith=SYNTHETIC_MODEL_PREFIX).order_by('name').values(
+            'name', 'organization', 'severity', 'use_cases', 'practices', 'data_info',
+            'concerning_practices', 'concerning_practices_urls',
+        ))
+        preferences = list(UserPreference.objects.filter(user__username__startswith=SYNTHETIC_USER_PREFIX).order_by(
+            'user__username', 'model__name',
+        ).values_list('user__username', 'model__name', 'preference'))
+        return models, preferences
+
+    def names(self, params):
+        cache.clear()
+        response = self.client.get(
+            '/api/models/', {**params, 'page_size': 500}, HTTP_HOST='localhost', HTTP_ACCEPT='application/json',
+        )
+        self.assertEqual(response.status_code, 200)
+        return [row['name'] for row in response.json()['results']]
+
+    def test_same_seed_same_data(self):
+        models, preferences = self.load(seed=3)
+        self.assertEqual(len(models), 30)
+        self.assertEqual(self.load(seed=3), (models, preferences))
+        self.assertNotEqual(self.load(seed=4)[0], models)
+
+    def test_preferences_are_for_distinct_models(self):
+        _, preferences = self.load()
+        by_user = {}
+        for username, model_name, _ in preferences:
+            by_user.setdefault(username, []).append(model_name)
+        self.assertEqual(len(by_user), 4)
+        for model_names in by_user.values():
+            self.assertEqual(len(model_names), 6)
+            self.assertEqual(len(set(model_names)), 6)
+
+    def test_indexes_are_rebuilt(self):
+        self.load()
+        model = ModelInfo.objects.get(name=f'{SYNTHETIC_MODEL_PREFIX}000007')
+        use_case = model.use_cases[0]
+        domain = model.concerning_practices_urls[0].split('/')[2]
+
+        self.assertEqual(ModelInfoTerm.objects.filter(model=model, kind=ModelInfoTerm.USE_CASE).count(),
+                         len(set(model.use_cases)))
+        self.assertIn(model.name, self.names({'use_cases': use_case[:-1]}))
+        self.assertIn(model.name, self.names({'use_case': use_case}))
+        self.assertIn(model.name, self.names({'domain': domain}))
+        self.assertIn(model, [found for found, _ in search_models('000007')])
+
+
+class WatchTests(TempDirectoryMixin, TestCase):
+    """process_markdown --watch syncs only the files that changed."""
+
+    def setUp(self):
+        super().setUp()
+        self.enterContext(self.settings(CATALOG_SNAPSHOT_ROOT=os.path.join(self.directory, 'snapshots')))
+
+    def write(self, name, severity='low'):
+        path = os.path.join(self.directory, name)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(f'---\norganization: Org\nuse_cases: [Chat]\nseverity: {severity}\n---\n\n# {name}\n')
+        return path
+
+    def test_burst_of_changes_is_one_batch(self):
+        first = self.write('first.md')
+        with MarkdownWatcher(self.directory, debounce=0.3, poll_interval=0.05, use_polling=True) as watcher:
+            second = self.write('second.md')
+            os.remove(first)
+            self.write('notes.txt')
+            self.assertEqual(watcher.next_batch(timeout=5), {first, second})
+            self.assertEqual(watcher.next_batch(timeout=0.2), set())
+
+    def test_sync_paths(self):
+        command = ProcessMarkdownCommand(stdout=io.StringIO())
+        command.verbosity = 1
+        command.batch_size = 500
+        linter = MdDataLint(os.path.join(settings.BASE_DIR, 'example-schema.json'))
+        ModelInfo.objects.create(name='untouched', organization='Org')
+
+        kept = self.write('kept.md')
+        removed = self.write('removed.md')
+        command.sync_paths(linter, self.directory, {kept, removed})
+        self.assertEqual(set(ModelInfo.objects.values_list('name', flat=True)), {'untouched', 'kept', 'removed'})
+
+        self.write('kept.md', severity='high')
+        os.remove(removed)
+        command.sync_paths(linter, self.directory, {kept, removed})
+        self.assertEqual(dict(ModelInfo.objects.values_list('name', 'severity')), {'untouched': None, 'kept': 'high'})
+
+
+class ProcessMarkdownTests(TempDirectoryMixin, TestCase):
+    """process_markdown writes one row per file, or nothing at all."""
+
+    def setUp(self):
+        super().setUp()
+        self.command = ProcessMarkdownCommand(stdout=io.StringIO())
+        self.command.verbosity = 1
+        self.command.batch_size = 500
+        self.command.result_count = self.command.cached_count = 0
+        self.linter_schema = os.path.join(settings.BASE_DIR, 'example-schema.json')
+        self.linter = MdDataLint(self.linter_schema)
+
+    def write(self, name, organization='Org'):
+        path = os.path.join(self.directory, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(f'---\norganization: {organization}\nuse_cases: [Chat]\n---\n\n# {name}\n')
+        return path
+
+    def sync(self, incremental=False):
+        results = self.command.count_results(self.linter.iter_validate(self.directory))
+        with transaction.atomic():
+            if incremental:
+                self.command.sync_incremental(self.linter, results)
+            else:
+                self.command.sync_full(self.linter, results)
+
+    def test_validation_cache(self):
+        self.write('valid.md')
+        with open(os.path.join(self.directory, 'invalid.md'), 'w', encoding='utf-8') as f:
+            f.write('---\norganization: Org\ntitle: Extra\n---\n')
+        cache_path = os.path.join(self.directory, 'cache.json')
+
+        def summary(results):
+            return [(os.path.basename(r.file_path), r.schema_name, r.errors, r.warnings, r.cached) for r in results]
+
+        first = summary(MdDataLint(self.linter_schema, cache_path=cache_path).validate_directory(self.directory))
+        second = summary(MdDataLint(self.linter_schema, cache_path=cache_path).validate_directory(self.directory))
+        self.assertEqual([entry[-1] for entry in first], [False, False])
+        self.assertEqual([entry[-1] for entry in second], [True, True])
+        self.assertEqual([entry[:-1] for entry in second], [entry[:-1] for entry in first])
+        self.assertTrue(second[0][2])  # invalid.md keeps its errors
+
+        self.write('valid.md', organization='Other')
+        third = summary(MdDataLint(self.linter_schema, cache_path=cache_path).validate_directory(self.directory))
+        self.assertEqual([entry[-1] for entry in third], [True, False])
+
+    def test_incremental_sync(self):
+        self.write('kept.md')
+        self.write('edited.md')
+        self.sync()
+        kept = ModelInfo.objects.get(name='kept')
+
+        self.write('edited.md', organization='Other')
+        self.command.stdout = io.StringIO()
+        with CaptureQueriesContext(connection) as queries:
+            self.sync(incremental=True)
+        self.assertIn('Added 0, updated 1, deleted 0 records. 1 records unchanged.', self.command.stdout.getvalue())
+        self.assertEqual(dict(ModelInfo.objects.values_list('name', 'organization')), {'kept': 'Org', 'edited': 'Other'})
+        self.assertEqual(ModelInfo.objects.get(name='kept').content_hash, kept.content_hash)
+        upserts = [query['sql'] for query in queries if query['sql'].startswith('INSERT INTO "main_modelinfo"')]
+        self.assertEqual(len(upserts), 1)
+        self.assertNotIn("'kept'", upserts[0])
+
+    def test_duplicate_names_roll_back(self):
+        ModelInfo.objects.create(name='existing', organization='Org')
+        first = self.write('vendor-a/gpt.md')
+        second = self.write('vendor-b/gpt.md', organization='Other')
+        for incremental in (False, True):
+            with self.subTest(incremental=incremental):
+                with self.assertRaisesMessage(CommandError, "both map to model 'gpt'") as raised:
+                    self.sync(incremental)
+                self.assertIn(first, str(raised.exception))
+                self.assertIn(second, str(raised.exception))
+                self.assertEqual(list(ModelInfo.objects.values_list('name', flat=True)), ['existing'])
+
+
+class FrontmatterReaderTests(TempDirectoryMixin, TestCase):
+    """The linter reads and hashes only the frontmatter of a file."""
+
+    def setUp(self):
+        super().setUp()
+        self.path = os.path.join(self.directory, 'model.md')
+        self.linter = MdDataLint(os.path.join(settings.BASE_DIR, 'example-schema.json'))
+
+    def read(self, content):
+        with open(self.path, 'wb') as f:
+            f.write(content)
+        return self.linter.validate_file(self.path)
+
+    def test_body_is_not_read(self):
+        result = self.read(b'---\norganization: Org\nuse_cases: [Chat]\n---\n\n# Model\n' + b'\xff' * 100000)
+        self.assertTrue(result.is_valid)
+        self.assertEqual(result.document.frontmatter, 'organization: Org\nuse_cases: [Chat]\n')
+
+        other_body = self.read(b'---\norganization: Org\nuse_cases: [Chat]\n---\n\nEdited.\n')
+        self.assertEqual(other_body.content_hash, result.content_hash)
+        self.assertEqual(other_body.document.body, '\nEdited.\n')
+
+    def test_line_endings(self):
+        unix = self.read(b'---\norganization: Org\nuse_cases: [Chat]\n---\nBody\n')
+        windows = self.read(b'---\r\norganization: Org\r\nuse_cases: [Chat]\r\n---\r\nBody\r\n')
+        self.assertTrue(windows.is_valid)
+        self.assertEqual(windows.content_hash, unix.content_hash)
+
+        self.assertEqual(self.read(b'---\norganization: Org\n').errors, ['No frontmatter found'])
+
+
+class ValidatorParityTests(TempDirectoryMixin, TestCase):
+    """Compiled schemas give the results of the Pydantic models they replaced."""
+
+    # (type, value, errors) recorded from the previous Pydantic validation path
+    CASES = [
+        ('object', {1: 'v'}, ["Field 'value.1.[key]': Input should be a valid string"]),
+        ('object', {'a': 1}, []),
+        ('integer', '1.0', []),
+        ('integer', '1.5', ["Field 'value': Input should be a valid integer, unable to parse string as an integer"]),
+        ('integer', float('inf'), ["Field 'value': Input should be a finite number"]),
+        ('boolean', 2.0, ["Field 'value': Input should be a valid boolean, unable to interpret input"]),
+        ('boolean', 'yes', []),
+        ('number', '1e3', []),
+        ('date', 1699920000, []),
+        ('date', '1699920000', []),
+        ('date', 1700000000, ["Field 'value': Datetimes provided to dates should have zero time - e.g. be exact dates"]),
+        ('date', '2024-01-02T00:00:00Z', []),
+        ('date', '2024-01-02T10:00', ["Field 'value': Datetimes provided to dates should have zero time - e.g. be exact dates"]),
+        ('date', datetime.datetime(2024, 1, 2, 3), ["Field 'value': Datetimes provided to dates should have zero time - e.g. be exact dates"]),
+        ('date', datetime.date(2024, 1, 2), []),
+        ('date', '2024-02-30', ["Field 'value': Input should be a valid date or datetime, day value is outside expected range"]),
+        ('date', '2024/01/02', ["Field 'value': Input should be a valid date or datetime, invalid date separator, expected `-`"]),
+        ('date', 'Jan 2024', ["Field 'value': Input should be a valid date or datetime, input is too short"]),
+    ]
+
+    def setUp(self):
+        super().setUp()
+        self.schema_path = os.path.join(self.directory, 'schema.json')
+
+    def compile(self, fields):
+        with open(self.schema_path, 'w') as f:
+            json.dump({'schemas': [{'name': 'test', 'description': 'Test', 'fields': fields}]}, f)
+        return MdDataLint(self.schema_path).compiled_schemas['test']
+
+    def errors(self, schema, data):
+        result = ValidationResult('test.md', 'test')
+        schema.validate(data, result)
+        return result.errors
+
+    def test_types(self):
+        schemas = {}
+        for type_name, value, expected in self.CASES:
+            with self.subTest(type=type_name, value=value):
+                if type_name not in schemas:
+                    schemas[type_name] = self.compile({'value': {'type': type_name}})
+                self.assertEqual(self.errors(schemas[type_name], {'value': value}), expected)
+
+    def test_enum(self):
+        schema = self.compile({'severity': {'type': 'string', 'enum': ['low', 'medium', 'high']}})
+        self.assertEqual(self.errors(schema, {'severity': 'high'}), [])
+        self.assertEqual(
+            self.errors(schema, {'severity': 'severe'}),
+            ["Field 'severity': Input should be 'low', 'medium' or 'high'"],
+        )
+        # A value of the wrong type reports the type error only
+        self.assertEqual(self.errors(schema, {'severity': 3}), ["Field 'severity': Input should be a valid string"])
+
+
+class SchemaDispatchTests(TempDirectoryMixin, TestCase):
+    """Files are matched to schemas by subdirectory, then by category field."""
+
+    def test_dispatch(self):
+        schemas = [
+            {'name': 'article', 'description': 'Article', 'fields': {}, 'category_field': 'type'},
+            {'name': 'model', 'description': 'Model', 'fields': {}, 'subdirectory': 'models'},
+            {'name': 'dataset', 'description': 'Dataset', 'fields': {}, 'subdirectory': 'datasets',
+             'category_field': 'type'},
+        ]
+        schema_path = os.path.join(self.directory, 'schema.json')
+        with open(schema_path, 'w') as f:
+            json.dump({'schemas': schemas}, f)
+        linter = MdDataLint(schema_path)
+
+        def schema_for(path, data=None):
+            document = MarkdownDocument(path)
+            document.data = data
+            return linter._determine_schema_for_file(path, document)
+
+        self.assertEqual(schema_for('content/models/gpt.md', {'type': 'article'}), 'model')
+        # The schema defined first wins when several directories match
+        self.assertEqual(schema_for('datasets/models/gpt.md'), 'model')
+        self.assertEqual(schema_for('content/gpt.md', {'type': 'dataset'}), 'dataset')
+        self.assertIsNone(schema_for('content/gpt.md', {'type': ['article']}))
+        self.assertIsNone(schema_for('content/gpt.md'))
+
+
+class ParallelValidationTests(TempDirectoryMixin, TestCase):
+    """Validating with a process pool gives the same results as validating in-process, and both stream."""
+
+    FILES = {
+        'models/valid.md': 'name: gpt\ncount: 3\n',
+        'models/missing.md': 'count: 3\n',
+        'models/wrong_type.md': 'name: [gpt]\ncount: many\nextra: 1\n',
+        'models/bad_yaml.md': 'name: [gpt\n',
+        'articles/article.md': 'type: article\ntitle: Notes\n',
+        'models/not_an_object.md': '- a list\n',
+        'unmatched.md': 'title: No schema\n',
+    }
+
+    def setUp(self):
+        super().setUp()
+        schemas = [
+            {'name': 'model', 'description': 'Model', 'subdirectory': 'models', 'required': ['name'],
+             'fields': {'name': {'type': 'string'}, 'count': {'type': 'integer'}}},
+            {'name': 'article', 'description': 'Article', 'category_field': 'type', 'required': ['title'],
+             'fields': {'type': {'type': 'string'}, 'title': {'type': 'string'}}},
+        ]
+        schema_path = os.path.join(self.directory, 'schema.json')
+        with open(schema_path, 'w') as f:
+            json.dump({'schemas': schemas}, f)
+        self.linter = MdDataLint(schema_path)
+        self.corpus = os.path.join(self.directory, 'corpus')
+        for name, frontmatter in self.FILES.items():
+            self.write(name, frontmatter)
+        with open(os.path.join(self.corpus, 'models', 'no_frontmatter.md'), 'w') as f:
+            f.write('# Just a body\n')
+
+    def write(self, name, frontmatter):
+        path = os.path.join(self.corpus, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w') as f:
+            f.write(f'---\n{frontmatter}---\n\nBody\n')
+
+    def outcomes(self, results):
+        return [(result.file_path, result.schema_name, result.errors, result.warnings) for result in results]
+
+    def test_jobs_match_sequential(self):
+        # Enough copies that the files are split across several chunks
+        for i in range(20):
+            self.write(f'models/copy-{i:02}.md', ('name: gpt\n', 'count: 1.5\n')[i % 2])
+
+        sequential = self.outcomes(self.linter.validate_directory(self.corpus, jobs=1))
+        self.assertEqual(len(sequential), len(self.FILES) + 20)  # The unmatched file has no result
+        self.assertNotIn(os.path.join(self.corpus, 'unmatched.md'), [path for path, *_ in sequential])
+        self.assertTrue(any(errors for _, _, errors, _ in sequential))
+        self.assertTrue(any(warnings for _, _, _, warnings in sequential))
+
+        for jobs in (2, 3):
+            self.assertEqual(self.outcomes(self.linter.iter_validate(self.corpus, jobs=jobs)), sequential, jobs)
+
+    def test_results_stream(self):
+        validated = []
+        validate_file = self.linter.validate_file
+        self.linter.validate_file = lambda path: validated.append(path) or validate_file(path)
+
+        results = self.linter.iter_validate(self.corpus)
+        first = next(results)
+        self.assertEqual(validated, [first.file_path])
+        results.close()
+
+    def test_parallel_chunks_are_bounded(self):
+        for i in range(40):
+            self.write(f'models/copy-{i:02}.md', 'name: gpt\n')
+
+        submitted = []
+
+        class CountingExecutor(md_data_linter.ProcessPoolExecutor):
+            def submit(self, fn, *args, **kwargs):
+                submitted.append(args)
+                return super().submit(fn, *args, **kwargs)
+
+        self.enterContext(mock.patch.object(md_data_linter, 'ProcessPoolExecutor', CountingExecutor))
+        results = self.linter.iter_validate(self.corpus, jobs=2)
+        next(results)
+        # Only jobs * 2 chunks are handed out before the first result is yielded
+        self.assertEqual(len(submitted), 4)
+        list(results)
+        self.assertGreater(len(submitted), 4)
@@ -2,7 +2,7 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 from . import views
-from .api_views import ModelInfoViewSet, UserProfileView, UserRegistrationView, UserPreferenceCreateView, UserPreferenceListView, UserPreferenceUpdateView
+from .api_views import ModelInfoViewSet, UserRegistrationView, UserPreferenceCreateView, UserPreferenceUpdateView, UserPreferenceBulkView
 
 # from rest_framework_simplejwt.views import (
 #     TokenObtainPairView,
@@ -16,13 +16,18 @@ urlpatterns = [
     path('', views.index, name='index'),
     path('search/', views.index, name='search'),
     path('profile/', views.index, name='profile'),
+    path('api/catalog/', views.catalog_snapshot, name='catalog-snapshot'),
+    path('api/catalog/models/<int:pk>/', views.catalog_snapshot, name='catalog-snapshot-current-model'),
+    path('api/catalog/<int:version>/', views.catalog_snapshot_version, name='catalog-snapshot-version'),
+    path('api/catalog/<int:version>/models/<int:pk>/', views.catalog_snapshot_version, name='catalog-snapshot-model'),
     path('api/', include(router.urls)),
-    path('api/profile/', UserProfileView.as_view(), name='profile'),
+    path('api/profile/', views.user_profile, name='profile'),
     # path('api/register/', UserRegistrationView.as_view(), name='register'),
     # path('api/token/', TokenObtainPairView.as_view(), name='token_obtain_pair'),
     # path('api/token/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
     path('api/preferences/', UserPreferenceCreateView.as_view(), name='preferences'),
-    path('api/preferences/list/', UserPreferenceListView.as_view(), name='preference-list'),
+    path('api/preferences/list/', views.user_preference_list, name='preference-list'),
+    path('api/preferences/bulk/', UserPreferenceBulkView.as_view(), name='preference-bulk'),
     path('api/preferences/<int:pk>/', UserPreferenceUpdateView.as_view(), name='preference-update'),
 
     path('set-csrf/', views.set_csrf_token, name='set-csrf-token'),
@@ -32,4 +37,6 @@ urlpatterns = [
     path('logout/', views.logout_view, name='logout'),
     path('auth-check/', views.auth_check, name='auth-check'),
 
+    path('metrics', views.metrics, name='metrics'),
+
 ]
\ No newline at end of file
@@ -1,12 +1,27 @@
+import gzip
+import ipaddress
 import json
-from django.shortcuts import render
+import os
+from asgiref.sync import sync_to_async
+from django.shortcuts import redirect, render
 from django.contrib.auth import authenticate, login, logout
-from django.http import JsonResponse
+from django.db.models import Prefetch, aprefetch_related_objects
+from django.http import Http404, HttpResponse, JsonResponse
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import require_safe
 from django.views.decorators.csrf import csrf_exempt, ensure_csrf_cookie
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.forms import UserCreationForm
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
 
-from .models import ModelInfo
+from .catalog import aget_catalog_version
+from .metrics import render_prometheus
+from .models import ModelInfo, UserPreference
+from .renderers import FastJSONRenderer
+from .serializers import UserPreferenceSerializer, UserSerializer
+from .snapshot import read_manifest, snapshot_is_current, snapshot_path, write_snapshot
 
 
 def index(request):
@@ -14,6 +29,143 @@ def index(request):
     return render(request, 'index.html')
 
 
+@require_safe
+@cache_control(no_cache=True)
+async def catalog_snapshot(request, pk=None):
+    """
+    Redirect to the snapshot for the current catalog version.
+    """
+    version, _ = await aget_catalog_version()
+    if pk is None:
+        return redirect('catalog-snapshot-version', version=version)
+    return redirect('catalog-snapshot-model', version=version, pk=pk)
+
+
+@require_safe
+@cache_control(public=True, max_age=31536000, immutable=True)
+async def catalog_snapshot_version(request, version, pk=None):
+    """
+    Serve a pre-compressed catalog snapshot (or a single model from it).
+
+    Snapshot URLs are versioned, so responses never change and are cached
+    for a year. The current version is (re)written on demand when it is
+    missing or its manifest doesn't match the catalog version in the database,
+    e.g. if process_markdown ran on another machine.
+    """
+    current, updated_at = await aget_catalog_version()
+    if version > current:
+        raise Http404("Snapshot not found")
+    if version == current:
+        if not await sync_to_async(snapshot_is_current)(version, updated_at):
+            await sync_to_async(write_snapshot)()
+    elif await sync_to_async(read_manifest)(version) is None:
+        raise Http404("Snapshot not found")
+    gzip_path = snapshot_path(version, pk)
+    if not os.path.exists(gzip_path):
+        raise Http404("Snapshot not found")
+
+    accepted = {
+        part.split(';')[0].strip() for part in request.headers.get('Accept-Encoding', '').split(',')
+    }
+    br_path = snapshot_path(version, pk, encoding='br')
+    if 'br' in accepted and os.path.exists(br_path):
+        encoding, content = 'br', await sync_to_async(_read_file)(br_path)
+    elif 'gzip' in accepted:
+        encoding, content = 'gzip', await sync_to_async(_read_file)(gzip_path)
+    else:
+        encoding, content = None, await sync_to_async(_read_file)(gzip_path, decompress=True)
+
+    response = HttpResponse(content, content_type='application/json')
+    if encoding:
+        response['Content-Encoding'] = encoding
+    response['Vary'] = 'Accept-Encoding'
+    return response
+
+
+def _read_file(path, decompress=False):
+    opener = gzip.open if decompress else open
+    with opener(path, 'rb') as f:
+        return f.read()
+
+
+def _json_response(data, status=200):
+    return HttpResponse(FastJSONRenderer().render(data), content_type='application/json', status=status)
+
+
+def _not_authenticated(detail='Authentication credentials were not provided.'):
+    # Same status and body as DRF's IsAuthenticated under session authentication
+    return _json_response({'detail': str(detail)}, status=403)
+
+
+async def _aget_user(request):
+    """
+    Return the requesting user, authenticated the way the REST framework views are.
+
+    The session is read natively; when that gives no user and the request
+    carries credentials, the other DEFAULT_AUTHENTICATION_CLASSES (HTTP Basic)
+    run in a thread. Raises AuthenticationFailed for bad credentials.
+    """
+    user = await request.auser()
+    if user.is_authenticated or 'HTTP_AUTHORIZATION' not in request.META:
+        return user
+    drf_request = Request(request, authenticators=[auth() for auth in api_settings.DEFAULT_AUTHENTICATION_CLASSES])
+    return await sync_to_async(lambda: drf_request.user)()
+
+
+@require_safe
+async def user_profile(request):
+    """
+    Return the signed-in user with their preferences.
+    """
+    try:
+        user = await _aget_user(request)
+    except AuthenticationFailed as exc:
+        return _not_authenticated(exc.detail)
+    if not user.is_authenticated:
+        return _not_authenticated()
+    # Load every preference and its model in one query instead of one per preference
+    await aprefetch_related_objects([user], Prefetch(
+        'userpreference_set',
+        queryset=UserPreference.objects.select_related('model'),
+    ))
+    return _json_response(UserSerializer(user).data)
+
+
+@require_safe
+async def user_preference_list(request):
+    """
+    Return the signed-in user's preferences.
+    """
+    try:
+        user = await _aget_user(request)
+    except AuthenticationFailed as exc:
+        return _not_authenticated(exc.detail)
+    if not user.is_authenticated:
+        return _not_authenticated()
+    preferences = [
+        preference async for preference in
+        UserPreference.objects.filter(user=user).select_related('model')
+    ]
+    return _json_response(UserPreferenceSerializer(preferences, many=True).data)
+
+
+@require_safe
+def metrics(request):
+    """
+    Serve this process's request metrics in Prometheus text format.
+
+    Only answered for clients on the loopback interface; behind the hosting
+    proxy every request comes from another address and gets a 404.
+    """
+    try:
+        local = ipaddress.ip_address(request.META.get('REMOTE_ADDR', '')).is_loopback
+    except ValueError:
+        local = False
+    if not local:
+        raise Http404
+    return HttpResponse(render_prometheus(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
+
 @ensure_csrf_cookie
 def set_csrf_token(request):
     """
@@ -0,0 +1,149 @@
+# main/watcher.py
+"""
+Watch a directory of Markdown files and report changes in debounced batches.
+
+File system events come from watchdog (inotify on Linux) when it is
+installed; otherwise, or when polling is requested, the directory is
+re-scanned every ``poll_interval`` seconds and files whose modification time
+or size changed are reported. Either way, changed paths are collected until
+no new change has arrived for ``debounce`` seconds, so an editor's
+write-rename-chmod sequence or a ``git checkout`` touching many files is
+handled as one batch.
+"""
+import glob
+import os
+import queue
+import threading
+
+# Put in a batch in place of paths when the directory has to be compared in
+# full, e.g. after a whole subdirectory was moved.
+RESCAN = None
+
+
+def scan_markdown_files(directory):
+    """Return ``{path: (mtime_ns, size)}`` for the Markdown files under a directory."""
+    state = {}
+    for path in glob.iglob(os.path.join(directory, '**', '*.md'), recursive=True):
+        try:
+            stat = os.stat(path)
+        except OSError:  # Removed while scanning
+            continue
+        state[path] = (stat.st_mtime_ns, stat.st_size)
+    return state
+
+
+class _Poller(threading.Thread):
+    """Re-scans a directory on an interval and reports the files that changed."""
+
+    def __init__(self, directory, interval, emit):
+        super().__init__(name='markdown-poller', daemon=True)
+        self.directory = directory
+        self.interval = interval
+        self.emit = emit
+        self.stopped = threading.Event()
+        self.state = scan_markdown_files(directory)
+
+    def run(self):
+        while not self.stopped.wait(self.interval):
+            state = scan_markdown_files(self.directory)
+            for path in self.state.keys() | state.keys():
+                if self.state.get(path) != state.get(path):
+                    self.emit(path)
+            self.state = state
+
+    def stop(self):
+        self.stopped.set()
+        self.join()
+
+
+def _start_observer(directory, emit):
+    """Start a watchdog observer for the directory, or return None if watchdog isn't installed."""
+    try:
+        from watchdog.events import (
+            EVENT_TYPE_CREATED, EVENT_TYPE_DELETED, EVENT_TYPE_MODIFIED, EVENT_TYPE_MOVED,
+            FileSystemEventHandler,
+        )
+        from watchdog.observers import Observer
+    except ImportError:  # watchdog is optional; the directory is polled without it
+        return None
+
+    # Opened/closed events are ignored: reading the files to ingest them would report them again
+    changes = {EVENT_TYPE_CREATED, EVENT_TYPE_DELETED, EVENT_TYPE_MODIFIED, EVENT_TYPE_MOVED}
+
+    class Handler(FileSystemEventHandler):
+        def on_any_event(self, event):
+            if event.event_type not in changes:
+                return
+            if event.is_directory:
+                # Modified directories only mean their entries changed, which is reported per file
+                if event.event_type != EVENT_TYPE_MODIFIED:
+                    emit(RESCAN)
+                return
+            for path in (event.src_path, getattr(event, 'dest_path', '')):
+                if path.endswith('.md'):
+                    emit(path)
+
+    observer = Observer()
+    observer.schedule(Handler(), directory, recursive=True)
+    observer.start()
+    return observer
+
+
+class MarkdownWatcher:
+    """
+    Report batches of changed Markdown files under ``directory``.
+
+    Use as a context manager and iterate over ``batches()``; each batch is a
+    set of absolute paths of files that were added, changed or removed, and
+    may contain RESCAN.
+    """
+
+    def __init__(self, directory, debounce=0.2, poll_interval=1.0, use_polling=False):
+        self.directory = os.path.abspath(directory)
+        self.debounce = debounce
+        self.poll_interval = poll_interval
+        self.use_polling = use_polling
+        self.events = queue.Queue()
+        self.backend = None
+        self._observer = None
+        self._poller = None
+
+    def __enter__(self):
+        if not self.use_polling:
+            self._observer = _start_observer(self.directory, self.events.put)
+        if self._observer is not None:
+            self.backend = 'watchdog'
+        else:
+            self._poller = _Poller(self.directory, self.poll_interval, self.events.put)
+            self._poller.start()
+            self.backend = 'polling'
+        return self
+
+    def __exit__(self, *exc_info):
+        if self._observer is not None:
+            self._observer.stop()
+            self._observer.join()
+        if self._poller is not None:
+            self._poller.stop()
+
+    def next_batch(self, timeout=None):
+        """
+        Wait for a change, then collect changes until ``debounce`` seconds pass without one.
+
+        Returns the set of changed paths, or an empty set if nothing changed
+        within ``timeout`` seconds.
+        """
+        try:
+            batch = {self.events.get(timeout=timeout)}
+        except queue.Empty:
+            return set()
+        while True:
+            try:
+                batch.add(self.events.get(timeout=self.debounce))
+            except queue.Empty:
+                return batch
+
+    def batches(self):
+        """Yield batches of changed paths until interrupted."""
+        while True:
+            yield self.next_batch()
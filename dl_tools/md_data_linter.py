@@ -10,35 +10,382 @@ databases, or other applications.
 import os
 import re
 import json
+import hashlib
+import math
 import argparse
 import glob
 import datetime
-from typing import Dict, List, Any, Set, Optional, Tuple
-import yaml
-from pydantic import BaseModel, ValidationError, create_model, Field
-from rich.console import Console
-from rich.table import Table
-from rich import box
+import dataclasses
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import BinaryIO, Callable, Dict, Iterable, Iterator, List, Any, Set, Optional, Tuple, Union
 
-console = Console()
+# yaml and rich are imported where they are first used: importing them costs
+# more than the rest of the linter, and a run served from the validation cache
+# never parses YAML.
 
-# Regular expression to extract frontmatter from Markdown files
-FRONTMATTER_REGEX = re.compile(r"^---\s*\n(.*?)\n---\s*\n", re.DOTALL)
+class _LazyConsole:
+    """A rich Console that is only created (and rich imported) on first use."""
+    
+    def __init__(self):
+        object.__setattr__(self, '_console', None)
+    
+    def _get(self):
+        if self._console is None:
+            from rich.console import Console
+            object.__setattr__(self, '_console', Console())
+        return self._console
+    
+    def __getattr__(self, name):
+        return getattr(self._get(), name)
+    
+    def __setattr__(self, name, value):
+        setattr(self._get(), name, value)
+
+console = _LazyConsole()
+
+# Line that opens and closes the frontmatter block (trailing whitespace is ignored)
+FRONTMATTER_DELIMITER = b'---'
+CLOSING_DELIMITER_REGEX = re.compile(rb'\n---[ \t\f\v\r]*\n')
+
+# Bytes read at a time while looking for the end of the frontmatter
+READ_SIZE = 8192
+
+# Default location of the on-disk validation cache
+DEFAULT_CACHE_PATH = '.md_data_lint_cache.json'
+
+# Upper bound on the number of files sent to a worker process at once
+MAX_CHUNK_SIZE = 64
 
-class SchemaDefinition(BaseModel):
+@dataclasses.dataclass
+class SchemaDefinition:
     """Represents a schema definition for Markdown frontmatter."""
     name: str
     description: str
     fields: Dict[str, Dict[str, Any]]
-    required: List[str] = []
+    required: List[str] = dataclasses.field(default_factory=list)
     category_field: Optional[str] = None
     subdirectory: Optional[str] = None
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'SchemaDefinition':
+        """Build a definition from its JSON form, ignoring unknown keys."""
+        known = {field.name for field in dataclasses.fields(cls)}
+        missing = [name for name in ('name', 'description', 'fields') if name not in data]
+        if missing:
+            raise ValueError(f"Schema definition is missing {', '.join(missing)}")
+        return cls(**{key: value for key, value in data.items() if key in known})
+    
+    def __post_init__(self):
+        if not isinstance(self.name, str) or not isinstance(self.description, str):
+            raise ValueError("Schema name and description must be strings")
+        if not isinstance(self.fields, dict) or not all(isinstance(v, dict) for v in self.fields.values()):
+            raise ValueError(f"Schema '{self.name}': fields must map field names to definitions")
+        if not isinstance(self.required, list) or not all(isinstance(v, str) for v in self.required):
+            raise ValueError(f"Schema '{self.name}': required must be a list of field names")
+        for attr in ('category_field', 'subdirectory'):
+            if getattr(self, attr) is not None and not isinstance(getattr(self, attr), str):
+                raise ValueError(f"Schema '{self.name}': {attr} must be a string")
+
+# Strings accepted as booleans, matching Pydantic's lax mode
+TRUE_STRINGS = {'1', 'on', 't', 'true', 'y', 'yes'}
+FALSE_STRINGS = {'0', 'off', 'f', 'false', 'n', 'no'}
+
+# Pydantic reads whole numbers as 64-bit integers before checking them further
+INT64_LIMIT = 2**63
+
+# Type checkers used by compiled schemas. Each returns None when the value is
+# acceptable, or a list of (location suffix, message) pairs describing the errors.
+# The messages follow the wording of the Pydantic validators they replace.
+
+def _check_string(value: Any) -> Optional[List[Tuple[str, str]]]:
+    if isinstance(value, str):
+        return None
+    return [('', 'Input should be a valid string')]
+
+def _check_number(value: Any) -> Optional[List[Tuple[str, str]]]:
+    if isinstance(value, (int, float)):
+        return None
+    if isinstance(value, str):
+        if value.isascii():
+            try:
+                float(value)
+                return None
+            except ValueError:
+                pass
+        return [('', 'Input should be a valid number, unable to parse string as a number')]
+    return [('', 'Input should be a valid number')]
+
+def _check_integer(value: Any) -> Optional[List[Tuple[str, str]]]:
+    if isinstance(value, int):
+        return None
+    if isinstance(value, float):
+        if math.isinf(value) or math.isnan(value):
+            return [('', 'Input should be a finite number')]
+        if not -INT64_LIMIT < value < INT64_LIMIT:
+            return [('', 'Unable to parse input string as an integer, exceeded maximum size')]
+        if value.is_integer():
+            return None
+        return [('', 'Input should be a valid integer, got a number with a fractional part')]
+    if isinstance(value, str):
+        if value.isascii():
+            # Like Pydantic, accept a decimal point followed only by zeros ("1.0")
+            whole, point, fraction = value.strip().partition('.')
+            if point and fraction and not fraction.strip('0'):
+                value = whole
+            try:
+                int(value)
+                return None
+            except ValueError:
+                pass
+        return [('', 'Input should be a valid integer, unable to parse string as an integer')]
+    return [('', 'Input should be a valid integer')]
+
+def _check_boolean(value: Any) -> Optional[List[Tuple[str, str]]]:
+    if isinstance(value, bool) or value in (0, 1):
+        return None
+    if isinstance(value, str):
+        if value.lower() in TRUE_STRINGS or value.lower() in FALSE_STRINGS:
+            return None
+        return [('', 'Input should be a valid boolean, unable to interpret input')]
+    # Whole numbers that fit in 64 bits are read as numbers, then rejected
+    if isinstance(value, int) and -INT64_LIMIT <= value < INT64_LIMIT:
+        return [('', 'Input should be a valid boolean, unable to interpret input')]
+    if isinstance(value, float) and value.is_integer() and -INT64_LIMIT < value < INT64_LIMIT:
+        return [('', 'Input should be a valid boolean, unable to interpret input')]
+    return [('', 'Input should be a valid boolean')]
+
+def _check_array(value: Any) -> Optional[List[Tuple[str, str]]]:
+    if not isinstance(value, (list, tuple)):
+        return [('', 'Input should be a valid list')]
+    errors = [(f'.{index}', 'Input should be a valid string') for index, item in enumerate(value) if not isinstance(item, str)]
+    return errors or None
+
+def _check_object(value: Any) -> Optional[List[Tuple[str, str]]]:
+    if not isinstance(value, dict):
+        return [('', 'Input should be a valid dictionary')]
+    errors = [(f'.{key}.[key]', 'Input should be a valid string') for key in value if not isinstance(key, str)]
+    return errors or None
+
+# Pydantic reads numbers as Unix timestamps: seconds, or milliseconds above
+# this magnitude. Only timestamps at midnight UTC are exact dates.
+MS_TIMESTAMP_THRESHOLD = 2e10
+MAX_TIMESTAMP = 253402300799  # 9999-12-31T23:59:59Z
+MIN_TIMESTAMP = -62167219200  # 0000-01-01T00:00:00Z
+NUMBER_STRING_REGEX = re.compile(r'[+-]?([0-9]+(\.[0-9]*)?|\.[0-9]+)')
+TIME_REGEX = re.compile(r'(\d\d):(\d\d)(?::(\d\d)(?:[.,](\d+))?)?(?:[Zz]|[+-](\d\d)(?::?\d\d)?)?')
+
+ZERO_TIME_ERROR = [('', 'Datetimes provided to dates should have zero time - e.g. be exact dates')]
+
+def _date_error(reason: str) -> List[Tuple[str, str]]:
+    return [('', f'Input should be a valid date or datetime, {reason}')]
+
+def _check_date_timestamp(value: Union[int, float]) -> Optional[List[Tuple[str, str]]]:
+    if value != value:
+        return _date_error('NaN values not permitted')
+    if abs(value) > MS_TIMESTAMP_THRESHOLD:
+        value /= 1000
+    if value > MAX_TIMESTAMP:
+        return _date_error('dates after 9999 are not supported as unix timestamps')
+    if value < MIN_TIMESTAMP:
+        return _date_error('dates before 0000 are not supported as unix timestamps')
+    return None if value % 86400 == 0 else ZERO_TIME_ERROR
+
+def _check_date_string(value: str) -> Optional[List[Tuple[str, str]]]:
+    """Check a date or datetime string the way Pydantic parses it, with its error wording."""
+    if NUMBER_STRING_REGEX.fullmatch(value):
+        return _check_date_timestamp(float(value))
+    if len(value) < 10:
+        return _date_error('input is too short')
+    for positions, part in (((0, 1, 2, 3), 'year'), ((5, 6), 'month'), ((8, 9), 'day')):
+        for position in positions:
+            if not '0' <= value[position] <= '9':
+                return _date_error(f'invalid character in {part}')
+        if part != 'day' and value[position + 1:position + 2] not in ('-', ''):
+            return _date_error('invalid date separator, expected `-`')
+    year, month, day = int(value[:4]), int(value[5:7]), int(value[8:10])
+    if not 1 <= month <= 12:
+        return _date_error('month value is outside expected range of 1-12')
+    if year == 0:
+        return [('', 'Input should be a valid date in the format YYYY-MM-DD, year 0 is out of range')]
+    try:
+        datetime.date(year, month, day)
+    except ValueError:
+        return _date_error('day value is outside expected range')
+    if len(value) == 10:
+        return None
+
+    if value[10] not in 'Tt_ ':
+        return _date_error('invalid datetime separator, expected `T`, `t`, `_` or space')
+    time = value[11:]
+    match = TIME_REGEX.fullmatch(time)
+    if match is None:
+        if len(time) < 5:
+            return _date_error('input is too short')
+        if not time[:2].isdigit():
+            return _date_error('invalid character in hour')
+        return _date_error('unexpected extra characters at the end of the input')
+    hour, minute, second, fraction, offset_hours = match.groups()
+    if int(hour) > 23:
+        return _date_error('hour value is outside expected range of 0-23')
+    if int(minute) > 59:
+        return _date_error('minute value is outside expected range of 0-59')
+    if second is not None and int(second) > 59:
+        return _date_error('second value is outside expected range of 0-59')
+    if offset_hours is not None and int(offset_hours) >= 24:
+        return _date_error('timezone offset must be less than 24 hours')
+    if hour == minute == '00' and second in (None, '00') and not (fraction or '').strip('0'):
+        return None
+    return ZERO_TIME_ERROR
+
+def _check_date(value: Any) -> Optional[List[Tuple[str, str]]]:
+    if isinstance(value, datetime.datetime):
+        return None if value.time() == datetime.time() else ZERO_TIME_ERROR
+    if isinstance(value, datetime.date):
+        return None
+    if isinstance(value, str):
+        return _check_date_string(value)
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return _check_date_timestamp(value)
+    return [('', 'Input should be a valid date')]
+
+TYPE_CHECKERS: Dict[str, Callable[[Any], Optional[List[Tuple[str, str]]]]] = {
+    'string': _check_string,
+    'number': _check_number,
+    'integer': _check_integer,
+    'boolean': _check_boolean,
+    'array': _check_array,
+    'object': _check_object,
+    'date': _check_date,
+}
+
+# Exact Python types that are always valid for a schema type, used to skip the
+# full type checker on the common path. Arrays also need every item, and
+# objects every key, to be a str.
+FAST_PATH_TYPES: Dict[str, type] = {
+    'string': str,
+    'number': float,
+    'integer': int,
+    'boolean': bool,
+    'array': list,
+    'object': dict,
+    'date': datetime.date,
+}
+
+class CompiledSchema:
+    """A schema definition compiled into a single-pass frontmatter validator.
+    
+    Required fields, unknown fields, types and enums are all checked while
+    walking the frontmatter once. Unknown types are checked as strings.
+    """
+    def __init__(self, schema: SchemaDefinition):
+        self.required = tuple(schema.required)
+        self.required_set = frozenset(schema.required)
+        self.fields: Dict[str, Tuple[type, Optional[type], Callable[[Any], Optional[List[Tuple[str, str]]]], Optional[frozenset]]] = {}
+        
+        for field_name, field_def in schema.fields.items():
+            type_name = field_def.get('type', 'string')
+            if type_name not in TYPE_CHECKERS:
+                type_name = 'string'
+            # Iterating a dict yields its keys, so one check covers array items and object keys
+            item_type = str if type_name in ('array', 'object') else None
+            enum = field_def.get('enum')
+            self.fields[field_name] = (
+                FAST_PATH_TYPES[type_name],
+                item_type,
+                TYPE_CHECKERS[type_name],
+                tuple(enum) if enum is not None else None,
+            )
+    
+    def validate(self, data: Dict[str, Any], result: 'ValidationResult') -> None:
+        """Record the errors and warnings for a frontmatter dict on a result."""
+        fields = self.fields
+        required_set = self.required_set
+        field_errors = []
+        required_seen = 0
+        
+        for field, value in data.items():
+            spec = fields.get(field)
+            if spec is None:
+                result.warnings.append(f"Unknown field: '{field}'")
+                continue
+            if field in required_set:
+                required_seen += 1
+            
+            fast_type, item_type, checker, enum = spec
+            valid = value.__class__ is fast_type
+            if valid and item_type is not None:
+                for item in value:
+                    if item.__class__ is not item_type:
+                        valid = False
+                        break
+            
+            # Only values off the fast path go through the full (coercing) checker
+            if not valid:
+                errors = checker(value)
+                if errors:
+                    for suffix, message in errors:
+                        field_errors.append(f"Field '{field}{suffix}': {message}")
+                    continue
+            
+            if enum is not None and value not in enum:
+                field_errors.append(f"Field '{field}': Input should be {_describe_enum(enum)}")
+        
+        if required_seen < len(self.required):
+            for field in self.required:
+                if field not in data:
+                    result.errors.append(f"Missing required field: '{field}'")
+        result.errors.extend(field_errors)
+
+def _describe_enum(enum: tuple) -> str:
+    """Describe the allowed values of an enum, e.g. "'a', 'b' or 'c'"."""
+    values = [repr(value) for value in enum]
+    if len(values) == 1:
+        return values[0]
+    return f"{', '.join(values[:-1])} or {values[-1]}"
+
+def _normalize_crlf(chunk: bytes, f: BinaryIO) -> bytes:
+    """Convert CRLF line endings in a chunk read from ``f`` to LF, reading one more byte if the chunk splits a pair."""
+    if chunk.endswith(b'\r'):
+        chunk += f.read(1)
+    return chunk.replace(b'\r\n', b'\n')
+
+class MarkdownDocument:
+    """A Markdown file's frontmatter, read and parsed once.
+    
+    Only the start of the file is read: ``head`` holds the text up to and
+    including the closing delimiter, and ``content_hash`` is its SHA-256.
+    The body isn't needed for validation, so it is read from the file when
+    ``content`` or ``body`` is first used.
+    """
+    def __init__(self, file_path: str, head: str = ''):
+        self.file_path = file_path
+        self.head = head
+        self.frontmatter: Optional[str] = None
+        self.data: Optional[Dict[str, Any]] = None
+        self.error: Optional[str] = None
+        self.content_hash: Optional[str] = None
+    
+    @property
+    def content(self) -> str:
+        """The whole file (with newlines normalized), read from disk."""
+        with open(self.file_path, 'r', encoding='utf-8') as f:
+            return f.read()
+    
+    @property
+    def body(self) -> str:
+        """The Markdown after the frontmatter, read from disk."""
+        content = self.content
+        return content[len(self.head):] if self.frontmatter is not None else content
 
 class ValidationResult:
     """Represents the result of validating a Markdown file."""
-    def __init__(self, file_path: str, schema_name: str):
+    def __init__(self, file_path: str, schema_name: str, document: Optional[MarkdownDocument] = None):
         self.file_path = file_path
         self.schema_name = schema_name
+        self.document = document
+        self.content_hash = document.content_hash if document else None
+        self.cached = False
         self.errors: List[str] = []
         self.warnings: List[str] = []
     
@@ -46,15 +393,75 @@ class ValidationResult:
     def is_valid(self) -> bool:
         return len(self.errors) == 0
 
+class ValidationCache:
+    """On-disk cache of validation results keyed by file content hash and schema hash."""
+    # Bump whenever the validation rules or the content hash change so stale results are discarded
+    VERSION = 4
+    
+    def __init__(self, path: str, schema_hash: str):
+        self.path = path
+        self.schema_hash = schema_hash
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self.load()
+    
+    def load(self) -> None:
+        """Load cached entries, discarding them all if the schema has changed."""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        
+        if data.get('version') == self.VERSION and data.get('schema_hash') == self.schema_hash:
+            self.entries = data.get('entries', {})
+    
+    def get(self, file_path: str, content_hash: str) -> Optional[ValidationResult]:
+        """Return the cached result for a file if its content is unchanged."""
+        entry = self.entries.get(os.path.abspath(file_path))
+        if not entry or entry['hash'] != content_hash:
+            return None
+        
+        result = ValidationResult(file_path, entry['schema'])
+        result.content_hash = content_hash
+        result.cached = True
+        result.errors = list(entry['errors'])
+        result.warnings = list(entry['warnings'])
+        return result
+    
+    def store(self, result: ValidationResult) -> None:
+        """Record a validation result."""
+        if result.content_hash:
+            self.entries[os.path.abspath(result.file_path)] = {
+                'hash': result.content_hash,
+                'schema': result.schema_name,
+                'errors': result.errors,
+                'warnings': result.warnings,
+            }
+    
+    def save(self) -> None:
+        """Write the cache to disk, evicting entries for files that no longer exist."""
+        self.entries = {path: entry for path, entry in self.entries.items() if os.path.exists(path)}
+        data = {'version': self.VERSION, 'schema_hash': self.schema_hash, 'entries': self.entries}
+        
+        # Write to a temporary file first so an interrupted run can't corrupt the cache
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+        os.replace(tmp_path, self.path)
+
 class MdDataLint:
     """Main class for the Markdown data linter."""
     
-    def __init__(self, schema_path: str):
-        """Initialize the linter with a schema file."""
+    def __init__(self, schema_path: str, cache_path: Optional[str] = None):
+        """Initialize the linter with a schema file and an optional result cache."""
         self.schemas: Dict[str, SchemaDefinition] = {}
         self.load_schema(schema_path)
-        self.validation_models: Dict[str, Any] = {}
-        self._create_validation_models()
+        self.compiled_schemas: Dict[str, CompiledSchema] = {}
+        self._compile_schemas()
+        self._build_dispatch_tables()
+        self.cache: Optional[ValidationCache] = None
+        if cache_path:
+            self.cache = ValidationCache(cache_path, self.schema_hash())
     
     def load_schema(self, schema_path: str) -> None:
         """Load schema definitions from a JSON file."""
@@ -64,7 +471,7 @@ class MdDataLint:
             
             # Parse schemas
             for schema_def in schema_data.get('schemas', []):
-                schema = SchemaDefinition(**schema_def)
+                schema = SchemaDefinition.from_dict(schema_def)
                 self.schemas[schema.name] = schema
                 
             console.print(f"Loaded {len(self.schemas)} schema definitions from {schema_path}")
@@ -72,103 +479,65 @@ class MdDataLint:
             console.print(f"[bold red]Error loading schema:[/bold red] {str(e)}")
             raise
     
-    def _create_validation_models(self) -> None:
-        """Create Pydantic models for validating frontmatter against schemas."""
+    def schema_hash(self) -> str:
+        """Return a stable hash of the loaded schema definitions."""
+        schema_data = {name: dataclasses.asdict(schema) for name, schema in self.schemas.items()}
+        return hashlib.sha256(json.dumps(schema_data, sort_keys=True).encode('utf-8')).hexdigest()
+    
+    def _compile_schemas(self) -> None:
+        """Compile each schema definition into a single-pass validator."""
         for name, schema in self.schemas.items():
-            field_definitions = {}
-            
-            for field_name, field_def in schema.fields.items():
-                field_type = self._get_python_type(field_def.get('type', 'string'))
-                
-                # Set up field parameters
-                field_params = {}
-                if field_name in schema.required:
-                    field_params['default'] = ...  # This makes the field required
-                else:
-                    field_params['default'] = None
-                
-                # Add description if available
-                if 'description' in field_def:
-                    field_params['description'] = field_def['description']
-                
-                # Add other validations based on field_def
-                if 'enum' in field_def:
-                    field_params['enum'] = field_def['enum']
-                
-                # Create the field
-                field_definitions[field_name] = (field_type, Field(**field_params))
-            
-            # Create the dynamic model for this schema
-            self.validation_models[name] = create_model(
-                f"{name}Model",
-                **field_definitions
-            )
+            self.compiled_schemas[name] = CompiledSchema(schema)
     
-    def _get_python_type(self, type_name: str) -> Any:
-        """Convert schema type to Python type."""
-        type_mapping = {
-            'string': str,
-            'number': float,
-            'integer': int,
-            'boolean': bool,
-            'array': List[str],
-            'object': Dict[str, Any],
-            'date': datetime.date
-        }
-        
-        if type_name in type_mapping:
-            return type_mapping[type_name]
+    def _build_dispatch_tables(self) -> None:
+        """Index the schemas by subdirectory and by category value, so choosing one doesn't scan them all.
         
-        # Default to string for unknown types
-        return str
+        Both tables map to ``(definition order, schema name)``: when a file
+        matches several schemas, the one defined first is used.
+        """
+        self.subdirectory_schemas: Dict[str, Tuple[int, str]] = {}
+        self.category_schemas: Dict[Tuple[str, str], Tuple[int, str]] = {}
+        category_fields: Dict[str, None] = {}
+        for order, (name, schema) in enumerate(self.schemas.items()):
+            if schema.subdirectory:
+                self.subdirectory_schemas.setdefault(schema.subdirectory, (order, name))
+            if schema.category_field:
+                # A file belongs to the schema whose name is the value of its category field
+                self.category_schemas.setdefault((schema.category_field, name), (order, name))
+                category_fields[schema.category_field] = None
+        self.category_fields = tuple(category_fields)
+        self.default_schema = next(iter(self.schemas)) if len(self.schemas) == 1 else None
     
     def validate_file(self, file_path: str) -> Optional[ValidationResult]:
         """Validate a single Markdown file against appropriate schema."""
         try:
+            document = self.read_frontmatter(file_path)
+            
+            # Files with unchanged frontmatter are served from the cache without parsing them
+            if self.cache is not None and document.content_hash:
+                cached = self.cache.get(file_path, document.content_hash)
+                if cached:
+                    return cached
+            
+            document = self.parse_file(file_path, document)
+            
             # Determine which schema to use
-            schema_name = self._determine_schema_for_file(file_path)
+            schema_name = self._determine_schema_for_file(file_path, document)
             if not schema_name:
                 return None
             
-            result = ValidationResult(file_path, schema_name)
+            result = ValidationResult(file_path, schema_name, document)
             
-            # Extract frontmatter
-            frontmatter = self._extract_frontmatter(file_path)
-            if not frontmatter:
+            if not document.frontmatter:
                 result.errors.append("No frontmatter found")
                 return result
             
-            # Parse frontmatter as YAML
-            try:
-                data = yaml.safe_load(frontmatter)
-                if not isinstance(data, dict):
-                    result.errors.append("Frontmatter is not a valid YAML object")
-                    return result
-            except yaml.YAMLError as e:
-                result.errors.append(f"YAML parsing error: {str(e)}")
+            if document.error:
+                result.errors.append(document.error)
                 return result
             
             # Validate against schema
-            schema = self.schemas[schema_name]
-            
-            # Check for required fields
-            for field in schema.required:
-                if field not in data:
-                    result.errors.append(f"Missing required field: '{field}'")
-            
-            # Check for unknown fields
-            known_fields = set(schema.fields.keys())
-            for field in data.keys():
-                if field not in known_fields:
-                    result.warnings.append(f"Unknown field: '{field}'")
-            
-            # Validate with Pydantic model
-            try:
-                self.validation_models[schema_name](**data)
-            except ValidationError as e:
-                for error in e.errors():
-                    field = ".".join(str(loc) for loc in error["loc"])
-                    result.errors.append(f"Field '{field}': {error['msg']}")
+            self.compiled_schemas[schema_name].validate(document.data, result)
             
             return result
         
@@ -176,107 +545,204 @@ class MdDataLint:
             console.print(f"[bold red]Error validating {file_path}:[/bold red] {str(e)}")
             raise
     
-    def _determine_schema_for_file(self, file_path: str) -> Optional[str]:
+    def _determine_schema_for_file(self, file_path: str, document: MarkdownDocument) -> Optional[str]:
         """Determine which schema should be used for a file based on its path."""
         # First check subdirectory-based schemas
-        rel_path = os.path.normpath(file_path)
-        for name, schema in self.schemas.items():
-            if schema.subdirectory:
-                if schema.subdirectory in rel_path.split(os.sep):
-                    return name
+        if self.subdirectory_schemas:
+            matches = [
+                self.subdirectory_schemas[part]
+                for part in os.path.normpath(file_path).split(os.sep)
+                if part in self.subdirectory_schemas
+            ]
+            if matches:
+                return min(matches)[1]
         
-        # If no subdirectory match, check frontmatter for a type/category field
-        frontmatter = self._extract_frontmatter(file_path)
-        if frontmatter:
-            try:
-                data = yaml.safe_load(frontmatter)
-                if isinstance(data, dict):
-                    # Check if any schema's category_field matches
-                    for name, schema in self.schemas.items():
-                        if schema.category_field and schema.category_field in data:
-                            if data[schema.category_field] == name:
-                                return name
-            except yaml.YAMLError:
-                pass
+        # If no subdirectory match, check the already parsed frontmatter for a type/category field
+        data = document.data
+        if data and self.category_fields:
+            matches = []
+            for field in self.category_fields:
+                value = data.get(field)
+                if isinstance(value, str) and (field, value) in self.category_schemas:
+                    matches.append(self.category_schemas[field, value])
+            if matches:
+                return min(matches)[1]
         
         # If only one schema is defined, use that
-        if len(self.schemas) == 1:
-            return next(iter(self.schemas.keys()))
-        
-        return None
+        return self.default_schema
     
-    def _extract_frontmatter(self, file_path: str) -> Optional[str]:
-        """Extract frontmatter from a Markdown file."""
+    def read_frontmatter(self, file_path: str) -> MarkdownDocument:
+        """Read a Markdown file up to the end of its frontmatter, without parsing it.
+        
+        The file is read a buffer at a time until the closing delimiter has
+        been found, so the cost doesn't depend on the length of the body. A
+        file that doesn't start with a delimiter line isn't read further.
+        """
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
+            with open(file_path, 'rb') as f:
+                data = f.read(READ_SIZE)
+                first_end = data.find(b'\n') + 1
+                crlf = False
+                cr = data.find(b'\r', 0, first_end or len(data))
+                if cr >= 0:
+                    # Normalize line endings as text mode would
+                    if cr == first_end - 2:
+                        crlf = True
+                        data = _normalize_crlf(data, f)
+                    else:  # Old Mac (\r only) line endings
+                        data = (data + f.read()).replace(b'\r\n', b'\n').replace(b'\r', b'\n')
+                    first_end = data.find(b'\n') + 1
+                
+                close = None
+                # The opening delimiter line has to be within the first read
+                if first_end and data[:first_end].rstrip() == FRONTMATTER_DELIMITER:
+                    start = first_end - 1
+                    while True:
+                        close = CLOSING_DELIMITER_REGEX.search(data, start)
+                        if close:
+                            break
+                        more = f.read(len(data))
+                        if not more:
+                            break
+                        if crlf:
+                            more = _normalize_crlf(more, f)
+                        # A closing line may start in the part already searched
+                        start = data.rfind(b'\n', start)
+                        data += more
+                    head_end = close.end() if close else len(data)
+                else:
+                    head_end = first_end or len(data)
             
-            match = FRONTMATTER_REGEX.search(content)
-            if match:
-                return match.group(1)
-            return None
-        except Exception as e:
+            head = memoryview(data)[:head_end]
+            text = str(head, 'utf-8')
+        except (OSError, UnicodeDecodeError) as e:
             console.print(f"[bold red]Error reading {file_path}:[/bold red] {str(e)}")
-            return None
+            return MarkdownDocument(file_path)
+        
+        document = MarkdownDocument(file_path, text)
+        document.content_hash = hashlib.sha256(head).hexdigest()
+        if close and close.start() >= first_end:
+            # The delimiter lines are ASCII, so byte offsets into them are character offsets
+            document.frontmatter = text[first_end:len(text) - (close.end() - close.start() - 1)]
+        return document
+    
+    def parse_file(self, file_path: str, document: Optional[MarkdownDocument] = None) -> MarkdownDocument:
+        """Read a Markdown file's frontmatter (unless ``document`` already holds it) and parse it as YAML."""
+        if document is None:
+            document = self.read_frontmatter(file_path)
+        if not document.frontmatter:
+            return document
+        
+        # Parse frontmatter as YAML
+        import yaml
+        try:
+            data = yaml.safe_load(document.frontmatter)
+        except yaml.YAMLError as e:
+            document.error = f"YAML parsing error: {str(e)}"
+            return document
+        
+        if isinstance(data, dict):
+            document.data = data
+        else:
+            document.error = "Frontmatter is not a valid YAML object"
+        return document
     
-    def validate_directory(self, directory: str, patterns: List[str] = None) -> List[ValidationResult]:
+    def validate_directory(self, directory: str, patterns: List[str] = None, jobs: int = 1) -> List[ValidationResult]:
         """Validate all Markdown files in a directory."""
+        return list(self.iter_validate(directory, patterns, jobs=jobs))
+    
+    def validate_files(self, file_paths: Iterable[str], jobs: int = 1) -> List[ValidationResult]:
+        """Validate the given Markdown files."""
+        return list(self.iter_validate_files(file_paths, jobs=jobs))
+    
+    def iter_validate(self, directory: str, patterns: List[str] = None, jobs: int = 1) -> Iterator[ValidationResult]:
+        """Yield validation results for the Markdown files in a directory as they are produced."""
         if patterns is None:
             patterns = ['**/*.md']
         
-        results = []
         file_paths = set()
         
         for pattern in patterns:
             glob_pattern = os.path.join(directory, pattern)
-            matching_files = glob.glob(glob_pattern, recursive=True)
-            file_paths.update(matching_files)
+            file_paths.update(glob.iglob(glob_pattern, recursive=True))
+        
+        return self.iter_validate_files(file_paths, jobs=jobs)
+    
+    def iter_validate_files(self, file_paths: Iterable[str], jobs: int = 1) -> Iterator[ValidationResult]:
+        """Yield validation results for the given Markdown files as they are produced.
         
-        for file_path in sorted(file_paths):
-            result = self.validate_file(file_path)
-            if result:
-                results.append(result)
+        With ``jobs`` greater than 1 the files are spread across a pool of
+        worker processes; ``jobs=0`` uses one worker per CPU. Results are
+        yielded in sorted path order either way, and only a bounded number of
+        them is held in memory at any time.
+        """
+        file_paths = sorted(set(file_paths))
+        if jobs < 1:
+            jobs = os.cpu_count() or 1
         
-        return results
+        if jobs == 1 or len(file_paths) < 2:
+            results = (self.validate_file(file_path) for file_path in file_paths)
+        else:
+            results = self._iter_validate_parallel(file_paths, jobs)
+        
+        try:
+            for result in results:
+                if result:
+                    # Workers only hold a read-only copy of the cache, so record results here
+                    if self.cache is not None:
+                        self.cache.store(result)
+                    yield result
+        finally:
+            if self.cache is not None:
+                self.cache.save()
     
-    def print_summary(self, results: List[ValidationResult]) -> None:
+    def _iter_validate_parallel(self, file_paths: List[str], jobs: int) -> Iterator[Optional[ValidationResult]]:
+        """Validate files in a process pool, keeping a bounded window of chunks in flight."""
+        # Hand out a few chunks per worker to balance uneven file sizes
+        chunksize = max(1, min(MAX_CHUNK_SIZE, len(file_paths) // (jobs * 4)))
+        chunks = (file_paths[i:i + chunksize] for i in range(0, len(file_paths), chunksize))
+        
+        with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker, initargs=(self,)) as executor:
+            pending = deque()
+            for chunk in chunks:
+                pending.append(executor.submit(_validate_chunk_in_worker, chunk))
+                if len(pending) >= jobs * 2:
+                    yield from pending.popleft().result()
+            while pending:
+                yield from pending.popleft().result()
+    
+    def print_summary(self, results: Union[Iterable[ValidationResult], 'ValidationSummary']) -> None:
         """Print a summary of validation results."""
-        valid_count = sum(1 for r in results if r.is_valid)
-        invalid_count = len(results) - valid_count
+        if isinstance(results, ValidationSummary):
+            summary = results
+        else:
+            summary = ValidationSummary()
+            for result in results:
+                summary.add(result)
         
         console.print()
         console.print(f"[bold]Validation Summary:[/bold]")
-        console.print(f"- Total files: {len(results)}")
-        console.print(f"- Valid files: [green]{valid_count}[/green]")
+        console.print(f"- Total files: {summary.total}")
+        console.print(f"- Valid files: [green]{summary.valid_count}[/green]")
         
-        if invalid_count > 0:
-            console.print(f"- Invalid files: [red]{invalid_count}[/red]")
+        if summary.invalid_count > 0:
+            console.print(f"- Invalid files: [red]{summary.invalid_count}[/red]")
         else:
-            console.print(f"- Invalid files: {invalid_count}")
+            console.print(f"- Invalid files: {summary.invalid_count}")
         
         # Print per-schema statistics
-        schema_stats = {}
-        for result in results:
-            schema_name = result.schema_name
-            if schema_name not in schema_stats:
-                schema_stats[schema_name] = {'total': 0, 'valid': 0, 'invalid': 0}
-            
-            schema_stats[schema_name]['total'] += 1
-            if result.is_valid:
-                schema_stats[schema_name]['valid'] += 1
-            else:
-                schema_stats[schema_name]['invalid'] += 1
-        
         console.print()
         console.print("[bold]Results by Schema:[/bold]")
         
+        from rich import box
+        from rich.table import Table
         table = Table(show_header=True, header_style="bold", box=box.SIMPLE)
         table.add_column("Schema")
         table.add_column("Total", justify="right")
         table.add_column("Valid", justify="right")
         table.add_column("Invalid", justify="right")
         
-        for schema_name, stats in schema_stats.items():
+        for schema_name, stats in summary.schema_stats.items():
             table.add_row(
                 schema_name,
                 str(stats['total']),
@@ -287,45 +753,92 @@ class MdDataLint:
         console.print(table)
         
         # Print errors and warnings
-        if invalid_count > 0:
+        if summary.errors:
             console.print()
             console.print("[bold red]Errors:[/bold red]")
             
-            for result in results:
-                if not result.is_valid:
-                    rel_path = os.path.relpath(result.file_path)
-                    console.print(f"[bold]{rel_path}[/bold] (schema: {result.schema_name}):")
-                    for error in result.errors:
-                        console.print(f"  - {error}")
+            for file_path, schema_name, errors in summary.errors:
+                rel_path = os.path.relpath(file_path)
+                console.print(f"[bold]{rel_path}[/bold] (schema: {schema_name}):")
+                for error in errors:
+                    console.print(f"  - {error}")
         
         # Print warnings
-        warning_results = [r for r in results if r.warnings]
-        if warning_results:
+        if summary.warnings:
             console.print()
             console.print("[bold yellow]Warnings:[/bold yellow]")
             
-            for result in warning_results:
-                rel_path = os.path.relpath(result.file_path)
-                console.print(f"[bold]{rel_path}[/bold] (schema: {result.schema_name}):")
-                for warning in result.warnings:
+            for file_path, schema_name, warnings in summary.warnings:
+                rel_path = os.path.relpath(file_path)
+                console.print(f"[bold]{rel_path}[/bold] (schema: {schema_name}):")
+                for warning in warnings:
                     console.print(f"  - {warning}")
 
+class ValidationSummary:
+    """Running totals over a stream of validation results.
+    
+    Only the messages of files with errors or warnings are retained, so the
+    summary stays small however many valid files pass through it.
+    """
+    def __init__(self):
+        self.total = 0
+        self.valid_count = 0
+        self.schema_stats: Dict[str, Dict[str, int]] = {}
+        self.errors: List[Tuple[str, str, List[str]]] = []
+        self.warnings: List[Tuple[str, str, List[str]]] = []
+    
+    @property
+    def invalid_count(self) -> int:
+        return self.total - self.valid_count
+    
+    def add(self, result: ValidationResult) -> None:
+        """Fold a single validation result into the totals."""
+        self.total += 1
+        stats = self.schema_stats.setdefault(result.schema_name, {'total': 0, 'valid': 0, 'invalid': 0})
+        stats['total'] += 1
+        if result.is_valid:
+            self.valid_count += 1
+            stats['valid'] += 1
+        else:
+            stats['invalid'] += 1
+            self.errors.append((result.file_path, result.schema_name, result.errors))
+        
+        if result.warnings:
+            self.warnings.append((result.file_path, result.schema_name, result.warnings))
+
+# Linter instance owned by each worker process of a parallel run
+_worker_linter: Optional[MdDataLint] = None
+
+def _init_worker(linter: MdDataLint) -> None:
+    """Install the linter shipped to this worker process."""
+    global _worker_linter
+    _worker_linter = linter
+
+def _validate_chunk_in_worker(file_paths: List[str]) -> List[Optional[ValidationResult]]:
+    """Validate a chunk of files inside a worker process."""
+    return [_worker_linter.validate_file(file_path) for file_path in file_paths]
+
 def main():
     """Main entry point for the script."""
     parser = argparse.ArgumentParser(description='Lint Markdown files against a schema')
     parser.add_argument('directory', help='Directory containing Markdown files')
     parser.add_argument('--schema', '-s', required=True, help='Path to schema definition file (JSON)')
     parser.add_argument('--pattern', '-p', action='append', help='Glob patterns for matching files (e.g., "**/*.md")')
+    parser.add_argument('--jobs', '-j', type=int, default=1, help='Number of worker processes (0 = one per CPU)')
+    parser.add_argument('--cache', default=DEFAULT_CACHE_PATH, help=f'Path to the validation cache (default: {DEFAULT_CACHE_PATH})')
+    parser.add_argument('--no-cache', action='store_true', help='Ignore the validation cache and check every file')
     
     args = parser.parse_args()
     
     try:
-        linter = MdDataLint(args.schema)
-        results = linter.validate_directory(args.directory, args.pattern)
-        linter.print_summary(results)
+        linter = MdDataLint(args.schema, cache_path=None if args.no_cache else args.cache)
+        summary = ValidationSummary()
+        for result in linter.iter_validate(args.directory, args.pattern, jobs=args.jobs):
+            summary.add(result)
+        linter.print_summary(summary)
         
         # Exit with non-zero status if any files are invalid
-        if any(not result.is_valid for result in results):
+        if summary.invalid_count > 0:
             exit(1)
     
     except Exception as e:
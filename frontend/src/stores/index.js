@@ -4,17 +4,62 @@ import api from '../services/axiosInstance';
 
 export const useMainStore = defineStore('main', () => {
   const models = ref([]);
+  const nextPage = ref(null);
   const userProfile = ref(null);
+  let latestRequest = 0;
 
-  async function fetchModels() {
+  // The API returns absolute `next` links; keep only the path so requests go through the api base URL.
+  const toRelative = (url) => {
+    if (!url) return null;
+    const parsed = new URL(url);
+    return parsed.pathname + parsed.search;
+  };
+
+  // Fetch the first page of models matching the given filters (name, organization, use_cases, practices, severity, q).
+  // Without filters the whole catalog is loaded from the pre-compressed snapshot instead.
+  async function fetchModels(filters = {}) {
+    const requestId = ++latestRequest;
+    const params = Object.fromEntries(Object.entries(filters).filter(([, value]) => value));
+    if (!Object.keys(params).length) {
+      return fetchCatalog(requestId);
+    }
     try {
-      const response = await api.get('/api/models/');
-      models.value = response.data;
+      const response = await api.get('/api/models/', { params });
+      // Ignore responses to searches that have since been superseded
+      if (requestId !== latestRequest) return;
+      models.value = response.data.results;
+      nextPage.value = toRelative(response.data.next);
     } catch (error) {
       console.error('Failed to fetch models:', error);
     }
   }
 
+  // Load every model from the catalog snapshot, which is served without touching the database.
+  async function fetchCatalog(requestId = ++latestRequest) {
+    try {
+      const response = await api.get('/api/catalog/');
+      if (requestId !== latestRequest) return;
+      models.value = response.data.results;
+      nextPage.value = null;
+    } catch (error) {
+      console.error('Failed to fetch catalog:', error);
+    }
+  }
+
+  // Append the next page of the current search.
+  async function fetchMoreModels() {
+    if (!nextPage.value) return;
+    const requestId = latestRequest;
+    try {
+      const response = await api.get(nextPage.value);
+      if (requestId !== latestRequest) return;
+      models.value = models.value.concat(response.data.results);
+      nextPage.value = toRelative(response.data.next);
+    } catch (error) {
+      console.error('Failed to fetch more models:', error);
+    }
+  }
+
   async function fetchUserProfile() {
     try {
       const response = await api.get('/api/profile/');
@@ -24,10 +69,21 @@ export const useMainStore = defineStore('main', () => {
     }
   }
 
+  // Create or update many preferences in one request. Each item is { model_id, preference }.
+  async function savePreferences(preferences) {
+    const response = await api.post('/api/preferences/bulk/', { preferences });
+    await fetchUserProfile();
+    return response.data;
+  }
+
   return {
     models,
+    nextPage,
     userProfile,
     fetchModels,
+    fetchCatalog,
+    fetchMoreModels,
     fetchUserProfile,
+    savePreferences,
   };
-});
\ No newline at end of file
+});